@@ -10,6 +10,7 @@ from api.v1.routes import hub_routes as hub
 from api.v1.routes import investor_routes as investor
 from api.v1.routes import reward_routes as rewards
 from api.v1.routes import topwallet_routes as topwallet
+from api.v1.routes import system_routes as system
 
 
 router = APIRouter()
@@ -24,3 +25,4 @@ router.include_router(community.router, prefix="/community", tags=["community"])
 router.include_router(hub.router, prefix="/hub", tags=["hubs"])
 router.include_router(investor.router, prefix="/investor", tags=["investor"])
 router.include_router(rewards.router, prefix="/reward", tags=["reward"])
+router.include_router(system.router, prefix="/system", tags=["system"])
@@ -3,7 +3,7 @@ from sqlalchemy.future import select
 from typing import List
 from models.activation_history_models import ActivationHistory
 from models.reward_models import Reward
-from models.member_models import Member
+from models.member_models import Member, MemberDetails
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -22,3 +22,31 @@ class ActivationRepo:
         result = await db.execute(query)
         return result.scalars().unique().all()
 
+    @staticmethod
+    def export_activation_history_query():
+        """
+        Flat activation history rows (with the activated member's name) for
+        CSV/NDJSON export.
+        """
+        return (
+            select(
+                ActivationHistory.id,
+                ActivationHistory.member_id,
+                Member.mobile_number,
+                MemberDetails.first_name,
+                MemberDetails.middle_name,
+                MemberDetails.last_name,
+                MemberDetails.suffix_name,
+                ActivationHistory.activated_by,
+                ActivationHistory.activated_by_role,
+                ActivationHistory.amount,
+                ActivationHistory.currency,
+                ActivationHistory.status,
+                ActivationHistory.reference_id,
+                ActivationHistory.created_at,
+                ActivationHistory.updated_at
+            )
+            .join(Member, Member.member_id == ActivationHistory.member_id)
+            .outerjoin(MemberDetails, MemberDetails.member_id == ActivationHistory.member_id)
+            .order_by(ActivationHistory.created_at.desc(), ActivationHistory.id.desc())
+        )
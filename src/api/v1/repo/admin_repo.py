@@ -7,7 +7,7 @@ from models.admin_models import AdminAccount
 from api.v1.schemas.admin_schemas import AdminAccountCreate
 
 from api.v1.repo.member_repo import MemberRepo
-from core.security import hash_password
+from core.security import hash_password_async
 
 from fastapi import HTTPException
 
@@ -17,11 +17,6 @@ import logging
 import traceback
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler()  # or configure a FileHandler as needed
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
 
 
@@ -60,7 +55,7 @@ class AdminRepo:
                 id=admin_id,
                 mobile_number=admin_data.mobile_number,
                 username=admin_data.username,
-                password=hash_password(admin_data.password),
+                password=await hash_password_async(admin_data.password),
                 account_type=admin_data.account_type,
                 account_url=account_url
             )
@@ -1,4 +1,3 @@
-import traceback
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from models.member_models import Member
@@ -6,15 +5,24 @@ from models.merchant_models import Merchant
 from models.community_models import Community
 from models.hub_models import Hub
 
-from utils.otp import generate_otp, create_otp_token, send_otp, verify_otp_token
+from utils.otp import (
+    generate_otp,
+    send_otp,
+    issue_otp,
+    check_otp,
+    is_otp_verified,
+    consume_otp_verification,
+    OTP_MISSING,
+    OTP_INCORRECT,
+    OTP_LOCKED
+)
 from sqlalchemy.future import select
 import logging
-from core.security import sign_jwt, verify_password
+from core.security import sign_jwt, verify_password_async
+from core.rate_limit import check_mpin_lockout, record_mpin_failure, clear_mpin_failures
 from utils.responses import json_response
-import redis.asyncio as redis
 
 logger = logging.getLogger(__name__)
-redis_client = redis.Redis(host="localhost", port=6379, decode_responses=True)
 
 class AuthRepo:
 
@@ -40,7 +48,7 @@ class AuthRepo:
 
             otp = generate_otp()
             # Store OTP in Redis
-            await redis_client.setex(f"otp:{mobile_number}", 120, otp)
+            await issue_otp(mobile_number, otp)
 
             send_otp(mobile_number, otp)
 
@@ -52,27 +60,23 @@ class AuthRepo:
 
         except Exception as e:
             logger.error("Error in initiate_login: %s", e, exc_info=True)
-            traceback.print_exc()
             raise HTTPException(status_code=500, detail=f"{str(e)}")
 
     @staticmethod
     async def verify_otp(mobile_number: str, input_otp: str):
         try:
-            # Retrieve the stored OTP from Redis
-            stored_otp = await redis_client.get(f"otp:{mobile_number}")
+            # Check the OTP and, if it matches, consume it and mark the
+            # number verified, all in one round trip
+            outcome = await check_otp(mobile_number, input_otp)
 
-            if not stored_otp:
+            if outcome == OTP_MISSING:
                 raise HTTPException(status_code=404, detail="Invalid or expired OTP. Please request a new one.")
             
-            # Check if input OTP matches the stored OTP
-            if stored_otp != input_otp:
+            if outcome == OTP_INCORRECT:
                 raise HTTPException(status_code=400, detail="Incorrect OTP. Please try again.")
 
-            # Mark OTP as verified
-            await redis_client.setex(f"otp_verified:{mobile_number}", 120, "true")  # 2-minute expiry
-
-            # Delete the OTP since it's no longer needed
-            await redis_client.delete(f"otp:{mobile_number}")
+            if outcome == OTP_LOCKED:
+                raise HTTPException(status_code=400, detail="Too many incorrect attempts. Please request a new OTP.")
 
             return {
                 "status": "success",
@@ -88,10 +92,11 @@ class AuthRepo:
     @staticmethod
     async def verify_mpin(db: AsyncSession, mobile_number: str, input_mpin: str, role: str):
         try:
-            # Check if OTP verification flag exists
-            otp_verified = await redis_client.get(f"otp_verified:{mobile_number}")
+            # Refuse locked-out numbers before touching the DB or bcrypt
+            await check_mpin_lockout(mobile_number)
 
-            if not otp_verified:
+            # Check if OTP verification flag exists
+            if not await is_otp_verified(mobile_number):
                 raise HTTPException(status_code=401, detail="OTP verification required before MPIN verification.")
 
             # Validate the role and fetch the account
@@ -125,21 +130,27 @@ class AuthRepo:
                 member_account = member_result.scalar_one_or_none()
                 member_user_id = member_account.member_id
 
-                if not member_account or not verify_password(input_mpin, member_account.mpin):
+                if not member_account or not await verify_password_async(input_mpin, member_account.mpin):
+                    await record_mpin_failure(mobile_number)
                     raise HTTPException(status_code=401, detail="Incorrect MPIN.")
             
             else:
                 # Validate MPIN for MEMBER role
-                if not verify_password(input_mpin, account.mpin):
+                if not await verify_password_async(input_mpin, account.mpin):
+                    await record_mpin_failure(mobile_number)
                     raise HTTPException(status_code=401, detail="Incorrect MPIN.")
 
+            # Remove OTP verification flag to prevent reuse; a concurrent
+            # login that already used it wins
+            if not await consume_otp_verification(mobile_number):
+                raise HTTPException(status_code=401, detail="OTP verification required before MPIN verification.")
+
+            await clear_mpin_failures(mobile_number)
+
             # Generate JWT token
             user_id = str(getattr(account, user_id_field))
             token = sign_jwt(user_id, role, member_user_id)
 
-            # Remove OTP verification flag to prevent reuse
-            await redis_client.delete(f"otp_verified:{mobile_number}")
-
             return {"message": "Login successful", "access_token": token, "role": role, "member_user_id": member_user_id}
 
         except HTTPException as http_err:
@@ -164,16 +175,14 @@ class AuthRepo:
             if not member:
                 raise HTTPException(status_code=404, detail="Member not found.")
 
-            # Generate a new OTP
+            # Generate a new OTP and store it, replacing the previous one
             new_otp = generate_otp()
-
-            # Create a new OTP token
-            new_otp_token = create_otp_token(mobile_number, new_otp)
+            await issue_otp(mobile_number, new_otp)
 
             # Send the new OTP to the user
             send_otp(mobile_number, new_otp)
 
-            return {"otp_token": new_otp_token, "otp": new_otp, "message": "New OTP has been sent."}
+            return {"otp": new_otp, "message": "New OTP has been sent."}
 
         except Exception as e:
             logger.error("Error in resend_otp: %s", e, exc_info=True)
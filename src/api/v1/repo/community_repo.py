@@ -3,6 +3,7 @@ from sqlalchemy.orm import selectinload, joinedload, aliased, outerjoin
 from sqlalchemy.future import select
 from sqlalchemy import func
 from models.community_models import Community
+from core.database import execute_concurrently
 
 
 from models.member_models import Member, MemberDetails, MemberAddress
@@ -13,6 +14,7 @@ from fastapi import HTTPException
 
 from api.v1.schemas.community_schemas import CreateCommunity
 from api.v1.repo.member_repo import MemberRepo
+from api.v1.repo.rollup_repo import RollupRepo
 
 from uuid import uuid4
 from sqlalchemy import or_
@@ -21,11 +23,6 @@ import logging
 import traceback
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler()  # or configure a FileHandler as needed
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
 
 class CommunityRepo:
@@ -73,6 +70,7 @@ class CommunityRepo:
             db.add(member)
             
             db.add(new_community)
+            await RollupRepo.record(db, communities_created=1)
             await db.commit()
             await db.refresh(new_community)
 
@@ -159,50 +157,41 @@ class CommunityRepo:
 
     @staticmethod
     async def get_community(db: AsyncSession, community_id: str):
-        # Fetch the community
-        community_query = select(Community).where(Community.community_id == community_id)
-        community_result = await db.execute(community_query)
+        # The community, its leader and its members are independent reads, so
+        # they run at once on separate pooled connections
+        member_columns = (
+            Member.member_id.label("user_id"),
+            Member.mobile_number,
+            Member.account_type,
+            MemberDetails.first_name,
+            MemberDetails.middle_name,
+            MemberDetails.last_name,
+            MemberDetails.suffix_name,
+            Member.is_activated,
+            Member.is_kyc_verified
+        )
+
+        community_result, leader_result, members_result = await execute_concurrently(
+            db,
+            # Fetch the community
+            select(Community).where(Community.community_id == community_id),
+            # Fetch the leader details
+            select(*member_columns)
+            .join(MemberDetails, Member.member_id == MemberDetails.member_id)
+            .join(Community, Community.community_leader == Member.mobile_number)
+            .where(Community.community_id == community_id),
+            # Fetch all members of the community
+            select(*member_columns)
+            .join(MemberDetails, Member.member_id == MemberDetails.member_id)
+            .where(Member.community_id == community_id)
+        )
+
         community = community_result.scalar()
 
         if not community:
             return None
 
-        # Fetch the leader details
-        leader_query = (
-            select(
-                Member.member_id.label("user_id"),
-                Member.mobile_number,
-                Member.account_type,
-                MemberDetails.first_name,
-                MemberDetails.middle_name,
-                MemberDetails.last_name,
-                MemberDetails.suffix_name,
-                Member.is_activated,
-                Member.is_kyc_verified
-            )
-            .join(MemberDetails, Member.member_id == MemberDetails.member_id)
-            .where(Member.mobile_number == community.community_leader)
-        )
-        leader_result = await db.execute(leader_query)
         leader = leader_result.first()
-
-        # Fetch all members of the community
-        members_query = (
-            select(
-                Member.member_id.label("user_id"),
-                Member.mobile_number,
-                Member.account_type,
-                MemberDetails.first_name,
-                MemberDetails.middle_name,
-                MemberDetails.last_name,
-                MemberDetails.suffix_name,
-                Member.is_activated,
-                Member.is_kyc_verified
-            )
-            .join(MemberDetails, Member.member_id == MemberDetails.member_id)
-            .where(Member.community_id == community_id)
-        )
-        members_result = await db.execute(members_query)
         members = members_result.all()
 
         return {
@@ -1,116 +1,95 @@
 
+from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.admin_models import AdminAccount
 from models.member_models import Member, MemberDetails
-from models.merchant_models import Merchant
-from models.community_models import Community
 from api.v1.schemas.investor_schemas import InvestorDashboardResponse
 from sqlalchemy.future import select
+from core.database import execute_concurrently
 
-from sqlalchemy import func, extract
-from api.v1.repo.member_repo import MemberRepo
-from datetime import date
+from sqlalchemy import func
+from api.v1.repo.rollup_repo import RollupRepo, ACTIVATION_REWARDS, ACTIVATOR_EARNING, ACTIVATOR_EARNING_AMOUNT
 
 from models.activation_history_models import ActivationHistory
 
-from sqlalchemy.sql import case
 from sqlalchemy.orm import aliased
 
 
 class InvestorRepo:
     @staticmethod
     async def get_dashboard_data(db: AsyncSession, member_id: str):
-        # Get member details
-        member = await MemberRepo.get_member_by_id(db, member_id)
-        mobile_number = member.mobile_number
+        # Define the alias for MemberDetails
+        details_alias = aliased(MemberDetails)
 
-        # Get investor's total reward points
-        result = await db.execute(
-            select(AdminAccount.reward_points).where(AdminAccount.mobile_number == mobile_number)
+        # The queries are independent reads, so they run at once on separate
+        # pooled connections (before `db` takes one of its own). All-time
+        # counters and the activation breakdown come from the rollup tables
+        # and do not grow with history.
+        (
+            member_result,
+            totals_result,
+            activation_result,
+            monthly_result,
+            today_activations_result
+        ) = await execute_concurrently(
+            db,
+            # The member and the investor's reward points, matched by mobile number
+            select(Member.member_id, AdminAccount.reward_points)
+            .outerjoin(AdminAccount, AdminAccount.mobile_number == Member.mobile_number)
+            .where(Member.member_id == member_id),
+            RollupRepo.totals_query(),
+            # Get total activations by amount and activated_by_role
+            RollupRepo.activation_breakdown_query(),
+            # Monthly accumulated activation amounts of the current year
+            RollupRepo.current_year_months_query(),
+            select(
+                ActivationHistory.amount,
+                details_alias.first_name,
+                details_alias.middle_name,
+                details_alias.last_name,
+                details_alias.suffix_name,
+                Member.mobile_number,
+                Member.member_id
+            )
+            .join(Member, ActivationHistory.member_id == Member.member_id)
+            .join(details_alias, details_alias.member_id == Member.member_id)
+            # Range filter so the created_at index is used
+            .where(ActivationHistory.created_at >= func.current_date())
         )
-        reward_points = sum(result.scalars().all())
 
-        # Get total members
-        total_members = await db.scalar(select(func.count(Member.member_id)))
+        member_rows = member_result.all()
+        if not member_rows:
+            raise HTTPException(status_code=404, detail="Member not found.")
 
-        # Get activated members
-        activated_members = await db.scalar(
-            select(func.count(Member.member_id)).where(Member.is_activated == True)
-        )
+        # Get investor's total reward points
+        reward_points = sum(row.reward_points or 0 for row in member_rows)
+
+        totals = totals_result.one()._mapping
+        total_members = totals["members_created"]
+        activated_members = totals["members_activated"]
 
         # Get not activated members
         not_activated_members = total_members - activated_members
 
-        # Get total merchants
-        total_merchants = await db.scalar(select(func.count(Merchant.merchant_id)))
-
-        # Get total communities
-        total_communities = await db.scalar(select(func.count(Community.community_id)))
+        total_merchants = totals["merchants_created"]
+        total_communities = totals["communities_created"]
 
-        # Get total activations by amount and activated_by_role
-        activation_data = await db.execute(
-            select(
-                ActivationHistory.activated_by_role,
-                ActivationHistory.amount,
-                func.count(ActivationHistory.id)
-            )
-            .group_by(ActivationHistory.activated_by_role, ActivationHistory.amount)
-        )
-
-        activation_counts = activation_data.all()
+        activation_counts = activation_result.all()
 
         # Calculate total distributed rewards
         total_rewards = sum(
-            (count * 55) for _, amount, count in activation_counts if amount == 150
-        ) + sum(
-            (count * 55) for _, amount, count in activation_counts if amount == 175
+            (count * ACTIVATION_REWARDS) for _, amount, count in activation_counts if amount in (150, 175)
         )
 
         # Calculate total earnings for activators (for activations worth ₱175)
         total_activator_earnings = sum(
-            (count * 25) for _, amount, count in activation_counts if amount == 175
+            (count * ACTIVATOR_EARNING) for _, amount, count in activation_counts if amount == ACTIVATOR_EARNING_AMOUNT
         )
 
         # Calculate total accumulated activation amount
-        total_accumulated_activation_amount = sum(
-            (count * amount) for _, amount, count in activation_counts
-        ) - (total_rewards + total_activator_earnings)
+        total_accumulated_activation_amount = totals["activation_amount"] - (total_rewards + total_activator_earnings)
 
-        # Fetch monthly accumulated activation amounts
-        monthly_activation_data = await db.execute(
-            select(
-                extract("month", ActivationHistory.created_at).label("month"),
-                func.sum(
-                    ActivationHistory.amount 
-                    - 55  # Base deduction
-                    - case((ActivationHistory.amount == 175, 25), else_=0)  # Conditional deduction
-                ).label("total_accumulated_amount")
-            )
-            .group_by("month")
-            .order_by("month")
-        )
-
-
-
-        today = date.today()
-
-        # Define the alias for MemberDetails
-        details_alias = aliased(MemberDetails)
-
-        today_activations_result = await db.execute(
-            select(
-                ActivationHistory.amount,
-                details_alias.first_name,
-                details_alias.middle_name,
-                details_alias.last_name,
-                details_alias.suffix_name,
-                Member.mobile_number,
-                Member.member_id
-            )
-            .join(Member, ActivationHistory.member_id == Member.member_id)
-            .join(details_alias, details_alias.member_id == Member.member_id)
-            .where(func.date(ActivationHistory.created_at) == today)
-        )
+        monthly_rollups = monthly_result.scalars().all()
 
         today_activations = [
             {
@@ -132,7 +111,7 @@ class InvestorRepo:
 
         # Format monthly data for the frontend graph
         monthly_accumulated_activation = [
-            (int(row.month), float(row.total_accumulated_amount)) for row in monthly_activation_data
+            (row.month, row.activation_net_amount) for row in monthly_rollups
         ]
 
         return InvestorDashboardResponse(
@@ -155,14 +134,9 @@ class InvestorRepo:
     
     @staticmethod
     async def get_monthly_activation_data(db: AsyncSession):
-        result = await db.execute(
-            select(
-                extract("month", ActivationHistory.created_at).label("month"),
-                func.sum(ActivationHistory.amount).label("total")
-            ).group_by("month").order_by("month")
-        )
+        monthly_rollups = await RollupRepo.get_current_year_months(db)
 
-        return [{"month": int(row.month), "total": float(row.total)} for row in result]
+        return [{"month": row.month, "total": row.activation_amount} for row in monthly_rollups]
 
 
 
@@ -4,7 +4,7 @@ from sqlalchemy.orm import selectinload, joinedload
 
 from models.member_models import Member, MemberDetails, MemberAddress, MemberWallet, MemberWalletExtension
 from models.wallet_models import Wallet
-from models.referral_models import Referral
+from models.referral_models import Referral, ReferralClosure, MemberDownlineStats
 from models.community_models import Community
 from models.merchant_models import Merchant, MerchantDetails, MerchantPurchaseHistory
 
@@ -12,18 +12,26 @@ from api.v1.schemas.member_schemas import MemberCreateSchema
 from sqlalchemy.sql import text
 
 from api.v1.repo.wallet_repo import WalletRepository
+from api.v1.repo.rollup_repo import RollupRepo
 from fastapi import HTTPException
 
 from api.v1.services.TopWallet import TopWallet
 from utils.responses import json_response
 
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy import event, insert, literal, union_all, and_, or_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import Session
 from typing import Optional
 
 
 
-from core.security import hash_password
+from core.security import hash_password_async
+from core.cache import TwoTierCache
+from core.config import settings
+from core.database import AppSession
 
+import asyncio
 import os
 from dotenv import load_dotenv
 load_dotenv()
@@ -31,17 +39,107 @@ load_dotenv()
 #ADMIN_STAGING = os.getenv("ADMIN_STAGING")
 ADMIN_STAGING = '53593d0e-93f8-45b3-9786-55137c4747a8'
 
+# Unilevel key names, ordered from the direct referrer upwards
+UNILEVEL_3 = ["first_level", "second_level", "third_level"]
+UNILEVEL_5 = UNILEVEL_3 + ["forth_level", "fifth_level"]
+
+# `fields` groups accepted by /member/all -> the columns each one selects
+MEMBER_LIST_FIELDS = {
+    "user_id": [Member.member_id.label("user_id")],
+    "mobile_number": [Member.mobile_number],
+    "status": [Member.is_activated.label("status")],
+    "is_activated": [Member.is_activated],
+    "is_kyc_verified": [Member.is_kyc_verified],
+    "community_id": [Member.community_id],
+    "community_name": [Community.community_name],
+    "created_at": [Member.created_at],
+    "updated_at": [Member.updated_at],
+    "user_details": [
+        MemberDetails.first_name,
+        MemberDetails.middle_name,
+        MemberDetails.last_name,
+        MemberDetails.suffix_name,
+    ],
+    "user_address": [
+        MemberAddress.house_number,
+        MemberAddress.street_name,
+        MemberAddress.barangay,
+        MemberAddress.city,
+        MemberAddress.province,
+        MemberAddress.region,
+    ],
+    "wallet": [Wallet.wallet_balance, Wallet.reward_points],
+}
+
 from uuid import uuid4
-import traceback
 import logging
-import traceback
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler()  # or configure a FileHandler as needed
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+
+
+# The member -> TopWallet external_id mapping is fixed after onboarding, so
+# it is cached in-process with Redis behind it. Keyed by member_id and by
+# mobile_number (the latter stores [member_id, external_id]).
+external_id_cache = TwoTierCache(
+    "member:external_id",
+    maxsize=settings.WALLET_ID_CACHE_SIZE,
+    local_ttl=settings.WALLET_ID_CACHE_LOCAL_TTL,
+    redis_ttl=settings.WALLET_ID_CACHE_REDIS_TTL,
+)
+mobile_wallet_cache = TwoTierCache(
+    "member:mobile_wallet",
+    maxsize=settings.WALLET_ID_CACHE_SIZE,
+    local_ttl=settings.WALLET_ID_CACHE_LOCAL_TTL,
+    redis_ttl=settings.WALLET_ID_CACHE_REDIS_TTL,
+)
+
+_pending_cache_tasks = set()
+
+
+@event.listens_for(MemberWalletExtension, "after_update")
+@event.listens_for(MemberWalletExtension, "after_delete")
+def _collect_wallet_cache_evictions(mapper, connection, target):
+    """Remember which cached members a wallet extension change affects."""
+    rows = connection.execute(
+        select(Member.member_id, Member.mobile_number)
+        .join(MemberWallet, MemberWallet.member_id == Member.member_id)
+        .where(MemberWallet.wallet_id == target.wallet_id)
+    ).all()
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("wallet_cache_evictions", set()).update(
+            (row.member_id, row.mobile_number) for row in rows
+        )
+
+
+@event.listens_for(AppSession, "after_commit")
+def _evict_wallet_cache(session):
+    evictions = session.info.pop("wallet_cache_evictions", None)
+    if not evictions:
+        return
+
+    member_ids = [member_id for member_id, _ in evictions]
+    mobile_numbers = [mobile_number for _, mobile_number in evictions]
+    external_id_cache.local.delete(*member_ids)
+    mobile_wallet_cache.local.delete(*mobile_numbers)
+
+    # Commit hooks are synchronous; the Redis deletes run as a task. The
+    # data is already committed, so a missing loop must not raise here.
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.warning("No event loop to evict wallet cache entries from Redis: %s", member_ids)
+        return
+
+    task = loop.create_task(MemberRepo.invalidate_wallet_identity(member_ids, mobile_numbers))
+    _pending_cache_tasks.add(task)
+    task.add_done_callback(_pending_cache_tasks.discard)
+
+
+@event.listens_for(AppSession, "after_rollback")
+def _discard_wallet_cache_evictions(session):
+    session.info.pop("wallet_cache_evictions", None)
+
 
 class MemberRepo:
 
@@ -73,7 +171,7 @@ class MemberRepo:
             new_member = Member(
                 member_id=str(uuid4()),
                 mobile_number=member_data.mobile_number,
-                mpin = hash_password('1234'),
+                mpin = await hash_password_async('1234'),
                 account_type=member_data.account_type,
                 is_kyc_verified = True,
                 referral_id=str(uuid4())[:12],
@@ -143,10 +241,19 @@ class MemberRepo:
             db.add(member_wallet_extension)
             db.add(refferal)
 
+            # Extend the referral closure in the same transaction
+            await db.flush()
+            await MemberRepo.add_to_referral_closure(db, new_member.member_id, referrer.member_id)
+            await MemberRepo.increment_downline_stats(db, new_member.member_id, total=1)
+            await RollupRepo.record(db, members_created=1)
+
             # Commit transaction
             await db.commit()
             logger.info("Member creation transaction committed for member ID: %s", new_member.member_id)
 
+            if external_id:
+                await MemberRepo.cache_wallet_identity(new_member.member_id, new_member.mobile_number, external_id)
+
             # Attempt to refresh new_member from the database.
             try:
                 await db.refresh(new_member)
@@ -159,7 +266,6 @@ class MemberRepo:
 
         except Exception as e:
             logger.error("Error occurred during member creation: %s", e, exc_info=True)
-            traceback.print_exc()  # Prints the full error details
             raise HTTPException(detail=str(e), status_code=500)
         
 
@@ -220,7 +326,6 @@ class MemberRepo:
         
         except Exception as e:
             logger.error("Error occurred during member creation: %s", e, exc_info=True)
-            traceback.print_exc()  # Prints the full error details
             raise HTTPException(detail=str(e), status_code=500)
         
     async def get_member_by_mobile_number(db: AsyncSession, mobile_number: str):
@@ -237,7 +342,6 @@ class MemberRepo:
 
         except Exception as e:
             logger.error("Error occurred getting member: %s", e, exc_info=True)
-            traceback.print_exc()  # Prints the full error details
             raise HTTPException(detail=str(e), status_code=500)
         
     async def get_member_by_id(db: AsyncSession, member_id: str):
@@ -254,11 +358,14 @@ class MemberRepo:
 
         except Exception as e:
             logger.error("Error occurred getting member: %s", e, exc_info=True)
-            traceback.print_exc()  # Prints the full error details
             raise HTTPException(detail=str(e), status_code=500)
         
 
     async def get_external_id(db: AsyncSession, member_id: str):
+        external_id = await external_id_cache.get(member_id)
+        if external_id:
+            return external_id
+
         query = (
             select(MemberWalletExtension.external_id)
             .join(MemberWallet, MemberWalletExtension.wallet_id == MemberWallet.wallet_id)
@@ -269,9 +376,46 @@ class MemberRepo:
         
         if not external_id:
             raise HTTPException(status_code=404, detail="External ID not found")
-        
+
+        await external_id_cache.set(member_id, external_id)
         return external_id
 
+    @staticmethod
+    async def get_wallet_identity_by_mobile_number(db: AsyncSession, mobile_number: str):
+        """
+        Resolve a mobile number to (member_id, external_id) in at most one query.
+        Returns None if no member with a TopWallet wallet uses that number.
+        """
+        cached = await mobile_wallet_cache.get(mobile_number)
+        if cached:
+            return tuple(cached)
+
+        query = (
+            select(Member.member_id, MemberWalletExtension.external_id)
+            .join(MemberWallet, MemberWallet.member_id == Member.member_id)
+            .join(MemberWalletExtension, MemberWalletExtension.wallet_id == MemberWallet.wallet_id)
+            .where(Member.mobile_number == mobile_number)
+        )
+        result = await db.execute(query)
+        row = result.first()
+
+        if not row or not row.external_id:
+            return None
+
+        await MemberRepo.cache_wallet_identity(row.member_id, mobile_number, row.external_id)
+        return row.member_id, row.external_id
+
+    @staticmethod
+    async def cache_wallet_identity(member_id: str, mobile_number: str, external_id: str):
+        """Warm both lookup caches, e.g. right after onboarding."""
+        await external_id_cache.set(member_id, external_id)
+        await mobile_wallet_cache.set(mobile_number, [member_id, external_id])
+
+    @staticmethod
+    async def invalidate_wallet_identity(member_ids: list[str], mobile_numbers: list[str]):
+        await external_id_cache.delete(*member_ids)
+        await mobile_wallet_cache.delete(*mobile_numbers)
+
 
     @staticmethod
     async def get_reward_points(db: AsyncSession, member_id: str):
@@ -282,45 +426,87 @@ class MemberRepo:
         return reward_points if reward_points is not None else 0.0
     
     @staticmethod
-    async def get_all_members(db: AsyncSession, is_activated: Optional[bool] = None):
-        query = (
-            select(
-                Member.member_id.label("user_id"),
-                Member.mobile_number,
-                Member.is_activated.label("status"),
-                Member.created_at,
-                Member.updated_at,
-                Member.is_activated,
-                Member.is_kyc_verified,
-                Member.community_id,
-                MemberDetails.first_name,
-                MemberDetails.middle_name,
-                MemberDetails.last_name,
-                MemberDetails.suffix_name,
-                MemberAddress.house_number,
-                MemberAddress.street_name,
-                MemberAddress.barangay,
-                MemberAddress.city,
-                MemberAddress.province,
-                MemberAddress.region,
-                Wallet.wallet_balance,
-                Wallet.reward_points,
-                Community.community_name
-            )
-            .join(MemberDetails, Member.member_id == MemberDetails.member_id, isouter=True)
-            .join(MemberAddress, Member.member_id == MemberAddress.member_id, isouter=True)
-            .join(MemberWallet, Member.member_id == MemberWallet.member_id, isouter=True)
-            .join(Wallet, MemberWallet.wallet_id == Wallet.wallet_id, isouter=True)
-            .join(Community, Member.community_id == Community.community_id, isouter=True)  # Added join to Community
-        )
-
-        # Apply filtering if is_activated is provided
+    def member_list_query(
+        fields,
+        community_id: Optional[str] = None,
+        is_activated: Optional[bool] = None,
+        is_kyc_verified: Optional[bool] = None
+    ):
+        """
+        Member list SELECT, newest first by (created_at, member_id), with only
+        the columns and joins for the requested `fields` groups (see
+        MEMBER_LIST_FIELDS). Every row also carries `cursor_created_at` /
+        `cursor_member_id` for keyset pagination.
+        """
+        columns = [Member.created_at.label("cursor_created_at"), Member.member_id.label("cursor_member_id")]
+        for field in MEMBER_LIST_FIELDS:
+            if field in fields:
+                columns.extend(MEMBER_LIST_FIELDS[field])
+
+        query = select(*columns)
+
+        if "user_details" in fields:
+            query = query.join(MemberDetails, Member.member_id == MemberDetails.member_id, isouter=True)
+        if "user_address" in fields:
+            query = query.join(MemberAddress, Member.member_id == MemberAddress.member_id, isouter=True)
+        if "wallet" in fields:
+            query = query.join(MemberWallet, Member.member_id == MemberWallet.member_id, isouter=True)
+            query = query.join(Wallet, MemberWallet.wallet_id == Wallet.wallet_id, isouter=True)
+        if "community_name" in fields:
+            query = query.join(Community, Member.community_id == Community.community_id, isouter=True)
+
+        if community_id is not None:
+            query = query.where(Member.community_id == community_id)
         if is_activated is not None:
             query = query.where(Member.is_activated == is_activated)
+        if is_kyc_verified is not None:
+            query = query.where(Member.is_kyc_verified == is_kyc_verified)
 
-        result = await db.execute(query)
-        members = result.all()
-        return members
+        return query.order_by(Member.created_at.desc(), Member.member_id.desc())
+
+    @staticmethod
+    async def get_all_members(
+        db: AsyncSession,
+        fields: set[str],
+        limit: int,
+        after: Optional[tuple] = None,
+        community_id: Optional[str] = None,
+        is_activated: Optional[bool] = None,
+        is_kyc_verified: Optional[bool] = None
+    ):
+        """
+        One keyset page of `member_list_query`.
+
+        :param after: (created_at, member_id) of the last row of the previous page
+        """
+        query = MemberRepo.member_list_query(fields, community_id, is_activated, is_kyc_verified)
+
+        if after is not None:
+            created_at, member_id = after
+            query = query.where(
+                or_(
+                    Member.created_at < created_at,
+                    and_(Member.created_at == created_at, Member.member_id < member_id)
+                )
+            )
+
+        result = await db.execute(query.limit(limit))
+        return result.all()
+
+    @staticmethod
+    def export_members_query(
+        community_id: Optional[str] = None,
+        is_activated: Optional[bool] = None,
+        is_kyc_verified: Optional[bool] = None
+    ):
+        """
+        Flat member rows for CSV/NDJSON export: every MEMBER_LIST_FIELDS column.
+        """
+        query = MemberRepo.member_list_query(MEMBER_LIST_FIELDS, community_id, is_activated, is_kyc_verified)
+        return query.with_only_columns(
+            *(column for columns in MEMBER_LIST_FIELDS.values() for column in columns),
+            maintain_column_froms=True
+        )
 
 
     # REFERALLS
@@ -335,148 +521,149 @@ class MemberRepo:
 
 
     @staticmethod
-    async def get_member_unilevel(db: AsyncSession, member_id: str):
-        try:
-            query = text("""
-                WITH RECURSIVE unilevel AS (
-                    SELECT referred_by, referred_member, 1 AS level
-                    FROM referrals
-                    WHERE referred_member = :member_id
-                    UNION ALL
-                    SELECT r.referred_by, r.referred_member, u.level + 1
-                    FROM referrals r
-                    JOIN unilevel u ON r.referred_member = u.referred_by
-                    WHERE u.level < 3  -- Limit to 3 levels
-                )
-                SELECT referred_by, level FROM unilevel ORDER BY level
-            """)
-            result = await db.execute(query, {"member_id": member_id})
-            rows = result.fetchall()
-
-            # Default values
-            levels = {
-                "first_level": ADMIN_STAGING,
-                "second_level": ADMIN_STAGING,
-                "third_level": ADMIN_STAGING
-            }
+    async def add_to_referral_closure(db: AsyncSession, member_id: str, referrer_id: str):
+        """
+        Insert the closure rows for a newly referred member: its own depth-0 row,
+        the direct referrer at depth 1 and every ancestor of the referrer one
+        level deeper. Does not commit.
+        """
+        ancestors = select(
+            ReferralClosure.ancestor,
+            literal(member_id),
+            ReferralClosure.depth + 1
+        ).where(
+            ReferralClosure.descendant == referrer_id,
+            ReferralClosure.depth >= 1
+        )
 
-            # Assign fetched values
-            for row in rows:
-                if row.level == 1:
-                    levels["first_level"] = row.referred_by
-                elif row.level == 2:
-                    levels["second_level"] = row.referred_by
-                elif row.level == 3:
-                    levels["third_level"] = row.referred_by
+        rows = union_all(
+            select(literal(member_id), literal(member_id), literal(0)),
+            select(literal(referrer_id), literal(member_id), literal(1)),
+            ancestors
+        )
 
-            return levels
+        await db.execute(
+            insert(ReferralClosure).from_select(["ancestor", "descendant", "depth"], rows)
+        )
 
-        except Exception as e:
-            logger.error("Error occurred getting member unilevel: %s", e, exc_info=True)
-            traceback.print_exc()
-            raise HTTPException(detail=str(e), status_code=500)
-    
+    @staticmethod
+    async def increment_downline_stats(db: AsyncSession, member_id: str, total: int = 0, activated: int = 0):
+        """
+        Add `total` / `activated` to the downline counters of every upline of
+        `member_id`, at the depth the member sits below each of them.
+        Requires the member's closure rows to exist. Does not commit.
+        """
+        stmt = mysql_insert(MemberDownlineStats).from_select(
+            ["member_id", "level", "total_count", "activated_count"],
+            select(
+                ReferralClosure.ancestor,
+                ReferralClosure.depth,
+                literal(total),
+                literal(activated)
+            ).where(
+                ReferralClosure.descendant == member_id,
+                ReferralClosure.depth >= 1
+            )
+        )
+        await db.execute(
+            stmt.on_duplicate_key_update(
+                total_count=MemberDownlineStats.total_count + total,
+                activated_count=MemberDownlineStats.activated_count + activated
+            )
+        )
 
     @staticmethod
-    async def get_member_unilevel_5(db: AsyncSession, member_id: str):
-        try:
-            query = text("""
-                WITH RECURSIVE unilevel AS (
-                    SELECT referred_by, referred_member, 1 AS level
-                    FROM referrals
-                    WHERE referred_member = :member_id
-                    UNION ALL
-                    SELECT r.referred_by, r.referred_member, u.level + 1
-                    FROM referrals r
-                    JOIN unilevel u ON r.referred_member = u.referred_by
-                    WHERE u.level < 5  -- Limit to 5 levels
-                )
-                SELECT referred_by, level FROM unilevel ORDER BY level
-            """)
-            result = await db.execute(query, {"member_id": member_id})
-            rows = result.fetchall()
-
-            # Default values
-            levels = {
-                "first_level": ADMIN_STAGING,
-                "second_level": ADMIN_STAGING,
-                "third_level": ADMIN_STAGING,
-                "forth_level": ADMIN_STAGING,
-                "fifth_level": ADMIN_STAGING
-            }
+    async def get_downline_stats(db: AsyncSession, member_id: str, max_level: Optional[int] = None):
+        """
+        Return the member's per-level downline counters, shallowest level first.
+        """
+        query = (
+            select(
+                MemberDownlineStats.level,
+                MemberDownlineStats.total_count,
+                MemberDownlineStats.activated_count
+            )
+            .where(MemberDownlineStats.member_id == member_id)
+            .order_by(MemberDownlineStats.level)
+        )
+        if max_level is not None:
+            query = query.where(MemberDownlineStats.level <= max_level)
 
-            # Assign fetched values
-            for row in rows:
-                if row.level == 1:
-                    levels["first_level"] = row.referred_by
-                elif row.level == 2:
-                    levels["second_level"] = row.referred_by
-                elif row.level == 3:
-                    levels["third_level"] = row.referred_by
-                elif row.level == 4:
-                    levels["forth_level"] = row.referred_by
-                elif row.level == 5:
-                    levels["fifth_level"] = row.referred_by
-
-            return levels
+        result = await db.execute(query)
+        return result.all()
 
-        except Exception as e:
-            logger.error("Error occurred getting member unilevel: %s", e, exc_info=True)
-            traceback.print_exc()
-            raise HTTPException(detail=str(e), status_code=500)
+    @staticmethod
+    async def get_upline(db: AsyncSession, member_id: str, levels: int) -> dict:
+        """
+        Return {depth: ancestor_id} for depths 1..levels in one indexed lookup.
+        """
+        uplines = await MemberRepo.get_uplines(db, [member_id], levels)
+        return uplines[member_id]
 
+    @staticmethod
+    async def get_uplines(db: AsyncSession, member_ids: list[str], levels: int) -> dict:
+        """
+        Batch form of `get_upline`: {member_id: {depth: ancestor_id}} for
+        every given member, in one query.
+        """
+        uplines = {member_id: {} for member_id in member_ids}
+        if not uplines:
+            return uplines
+
+        result = await db.execute(
+            select(ReferralClosure.descendant, ReferralClosure.ancestor, ReferralClosure.depth)
+            .where(
+                ReferralClosure.descendant.in_(uplines),
+                ReferralClosure.depth.between(1, levels)
+            )
+        )
+        for row in result:
+            uplines[row.descendant][row.depth] = row.ancestor
+        return uplines
 
+    @staticmethod
+    async def get_community_ids(db: AsyncSession, member_ids: list[str]) -> dict:
+        """
+        Return {member_id: community_id} for the given members.
+        """
+        if not member_ids:
+            return {}
 
+        result = await db.execute(
+            select(Member.member_id, Member.community_id).where(Member.member_id.in_(member_ids))
+        )
+        return {row.member_id: row.community_id for row in result}
 
     @staticmethod
-    async def get_member_unilevel_main(db: AsyncSession, member_id: str):
+    async def _unilevel(db: AsyncSession, member_id: str, level_names: list):
         try:
-            first_level = await MemberRepo.get_member_referrer(db, member_id) or ADMIN_STAGING
-            second_level = await MemberRepo.get_member_referrer(db, first_level) or ADMIN_STAGING
-            third_level = await MemberRepo.get_member_referrer(db, second_level) or ADMIN_STAGING
+            upline = await MemberRepo.get_upline(db, member_id, len(level_names))
 
+            # Missing levels default to the admin staging account
             return {
-                "first_level": first_level,
-                "second_level": second_level,
-                "third_level": third_level,
+                name: upline.get(depth, ADMIN_STAGING)
+                for depth, name in enumerate(level_names, start=1)
             }
 
         except Exception as e:
             logger.error("Error occurred getting member unilevel: %s", e, exc_info=True)
-            traceback.print_exc()
             raise HTTPException(detail=str(e), status_code=500)
 
+    @staticmethod
+    async def get_member_unilevel(db: AsyncSession, member_id: str):
+        return await MemberRepo._unilevel(db, member_id, UNILEVEL_3)
 
     @staticmethod
-    async def get_member_unilevel_5_main(db: AsyncSession, member_id: str):
-        try:
-            first_level = await MemberRepo.get_member_referrer(db, member_id)
-            if not first_level:
-                return {
-                    "first_level": ADMIN_STAGING, 
-                    "second_level": ADMIN_STAGING, 
-                    "third_level": ADMIN_STAGING,
-                    "forth_level": ADMIN_STAGING,
-                    "fifth_level": ADMIN_STAGING
-                }
-
-            second_level = await MemberRepo.get_member_referrer(db, first_level) or ADMIN_STAGING
-            third_level = await MemberRepo.get_member_referrer(db, second_level) or ADMIN_STAGING
-            forth_level = await MemberRepo.get_member_referrer(db, third_level) or ADMIN_STAGING
-            fifth_level = await MemberRepo.get_member_referrer(db, forth_level) or ADMIN_STAGING
+    async def get_member_unilevel_5(db: AsyncSession, member_id: str):
+        return await MemberRepo._unilevel(db, member_id, UNILEVEL_5)
 
-            return {
-                "first_level": first_level,
-                "second_level": second_level,
-                "third_level": third_level,
-                "forth_level": forth_level,
-                "fifth_level": fifth_level
-            }
+    @staticmethod
+    async def get_member_unilevel_main(db: AsyncSession, member_id: str):
+        return await MemberRepo._unilevel(db, member_id, UNILEVEL_3)
 
-        except Exception as e:
-            logger.error("Error occurred getting member: %s", e, exc_info=True)
-            traceback.print_exc()
-            raise HTTPException(detail=str(e), status_code=500)
+    @staticmethod
+    async def get_member_unilevel_5_main(db: AsyncSession, member_id: str):
+        return await MemberRepo._unilevel(db, member_id, UNILEVEL_5)
 
 
 
@@ -4,25 +4,22 @@ from api.v1.schemas.merchant_schemas import MerchantCreate, MerchantPurchaseCrea
 from uuid import uuid4
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from sqlalchemy.future import select
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import joinedload, selectinload, aliased
+from sqlalchemy import update, func
 from api.v1.repo.member_repo import MemberRepo
+from api.v1.repo.rollup_repo import RollupRepo
 
 from models.member_models import Member, MemberDetails
 
 from fastapi import HTTPException
 
 from models.member_models import Member
-from models.referral_models import Referral
+from models.referral_models import Referral, ReferralClosure
 
 
 import logging
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler()
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
 class MerchantRepo:
     @staticmethod
@@ -99,7 +96,8 @@ class MerchantRepo:
             )
             db.add(merchant_referral)
 
-            
+            await RollupRepo.record(db, merchants_created=1)
+
             # Commit changes
             await db.commit()
             await db.refresh(new_merchant)
@@ -145,6 +143,17 @@ class MerchantRepo:
             }
         
 
+    @staticmethod
+    async def get_wallet_external_id(db: AsyncSession, merchant_id: str):
+        """TopWallet external_id of the member account behind a merchant, or None."""
+        result = await db.execute(select(Merchant.mobile_number).where(Merchant.merchant_id == merchant_id))
+        mobile_number = result.scalar_one_or_none()
+        if not mobile_number:
+            return None
+
+        identity = await MemberRepo.get_wallet_identity_by_mobile_number(db, mobile_number)
+        return identity[1] if identity else None
+
     @staticmethod
     async def get_merchant_by_id(db: AsyncSession, merchant_id: str):
         try:
@@ -308,7 +317,7 @@ class MerchantRepo:
             result = await db.execute(query)
             purchases = result.fetchall()
             
-            print("qwe", str(query))
+            logger.debug("Purchase history query: %s", query)
             if not purchases:
                 return [] # this is where the error is
 
@@ -390,3 +399,106 @@ class MerchantRepo:
         )
         return result.scalar()
 
+    @staticmethod
+    def export_merchants_query():
+        """
+        Flat merchant rows (with manager name and location) for CSV/NDJSON export.
+        """
+        return (
+            select(
+                Merchant.merchant_id,
+                Merchant.mobile_number,
+                Merchant.business_name,
+                Merchant.business_type,
+                Merchant.discount,
+                Merchant.merchant_wallet,
+                Merchant.reward_points,
+                MemberDetails.first_name.label("manager_first_name"),
+                MemberDetails.middle_name.label("manager_middle_name"),
+                MemberDetails.last_name.label("manager_last_name"),
+                MemberDetails.suffix_name.label("manager_suffix_name"),
+                MerchantDetails.latitude,
+                MerchantDetails.longitude,
+                MerchantDetails.region,
+                MerchantDetails.province,
+                MerchantDetails.municipality_city,
+                MerchantDetails.barangay,
+                MerchantDetails.street,
+                Merchant.created_at,
+                Merchant.updated_at
+            )
+            .outerjoin(MerchantDetails, MerchantDetails.merchant_id == Merchant.merchant_id)
+            .outerjoin(Member, Member.mobile_number == Merchant.mobile_number)
+            .outerjoin(MemberDetails, MemberDetails.member_id == Member.member_id)
+            .order_by(Merchant.created_at.desc(), Merchant.merchant_id.desc())
+        )
+
+    @staticmethod
+    async def get_merchant_reward_recipients(db: AsyncSession, merchant_ids: list[str]) -> dict:
+        """
+        Resolve the merchant-side reward recipients for several merchants in
+        one query: {merchant_id: {"referrer_of_merchant": member_id | None,
+        "merchant_direct_referrer": member_id | None}}.
+
+        The referrer of the merchant comes from MerchantReferral; the direct
+        referrer is the member who referred the merchant owner.
+        """
+        if not merchant_ids:
+            return {}
+
+        merchant_referrer = aliased(Member)
+        owner = aliased(Member)
+
+        result = await db.execute(
+            select(
+                Merchant.merchant_id,
+                merchant_referrer.member_id.label("referrer_of_merchant"),
+                ReferralClosure.ancestor.label("merchant_direct_referrer")
+            )
+            .outerjoin(MerchantReferral, MerchantReferral.referred_merchant == Merchant.merchant_id)
+            .outerjoin(merchant_referrer, merchant_referrer.referral_id == MerchantReferral.referred_by)
+            .outerjoin(owner, owner.mobile_number == Merchant.mobile_number)
+            .outerjoin(ReferralClosure, (ReferralClosure.descendant == owner.member_id) & (ReferralClosure.depth == 1))
+            .where(Merchant.merchant_id.in_(merchant_ids))
+        )
+        return {
+            row.merchant_id: {
+                "referrer_of_merchant": row.referrer_of_merchant,
+                "merchant_direct_referrer": row.merchant_direct_referrer
+            }
+            for row in result
+        }
+
+    @staticmethod
+    async def get_unsettled_purchases(db: AsyncSession, limit: int):
+        """
+        Lock and return up to `limit` successful purchases whose rewards have
+        not been distributed, with the merchant's discount. Rows locked by a
+        concurrent settlement run are skipped.
+        """
+        result = await db.execute(
+            select(MerchantPurchaseHistory, Merchant.discount)
+            .join(Merchant, Merchant.merchant_id == MerchantPurchaseHistory.merchant_id)
+            .where(
+                MerchantPurchaseHistory.status == "success",
+                MerchantPurchaseHistory.rewards_settled_at.is_(None)
+            )
+            .order_by(MerchantPurchaseHistory.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True, of=MerchantPurchaseHistory)
+        )
+        return result.all()
+
+    @staticmethod
+    async def mark_purchases_settled(db: AsyncSession, purchase_ids: list[str]):
+        """
+        Flag purchases as having had their rewards distributed. Does not commit.
+        """
+        if not purchase_ids:
+            return
+
+        await db.execute(
+            update(MerchantPurchaseHistory)
+            .where(MerchantPurchaseHistory.purchase_id.in_(purchase_ids))
+            .values(rewards_settled_at=func.now())
+        )
@@ -7,8 +7,6 @@ import traceback
 import logging
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler()  # or configure a FileHandler as needed
 
 
 
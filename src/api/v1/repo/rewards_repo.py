@@ -1,32 +1,186 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy.orm import selectinload, joinedload, aliased
 from sqlalchemy.sql import text
+from sqlalchemy import insert, func, update, case
 
 
 
-from models.reward_models import Reward
+from models.reward_models import Reward, RewardLedger, RewardBalanceSnapshot
 from models.member_models import MemberDetails, Member
+from core.database import execute_concurrently
 
 from api.v1.repo.member_repo import MemberRepo
+from api.v1.repo.wallet_repo import WalletRepository
 from api.v1.schemas.reward_schemas import RewardSchema, RewardListSchema
 from fastapi import HTTPException
 from utils.extra import format_name
 
+from uuid import uuid4
 import traceback
 import logging
 import traceback
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler()  # or configure a FileHandler as needed
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+
+# Reward columns written by credit_rewards; timestamps come from the server
+REWARD_INSERT_FIELDS = (
+    "id",
+    "reward_source_type",
+    "reward_points",
+    "reward_from",
+    "receiver",
+    "title",
+    "description",
+    "status",
+    "reference_id",
+)
 
 
 class RewardRepo:
-    
+
+    @staticmethod
+    async def credit_rewards(db: AsyncSession, rewards: list[Reward]) -> list[dict]:
+        """
+        Credit a batch of rewards from one event: inserts the `rewards` rows
+        and their ledger entries as two multi-row INSERTs and applies all
+        wallet credits with one set-based UPDATE. The Reward objects are only
+        used as values (they are not added to the session). Does not commit,
+        so the caller's transaction covers the whole event.
+
+        :return: one entry per receiver with the points credited, the new
+            reward point balance and whether a wallet was found.
+        """
+        credits = {}
+        for reward in rewards:
+            credits[reward.receiver] = credits.get(reward.receiver, 0) + reward.reward_points
+
+        balances = await WalletRepository.credit_reward_points(db, credits)
+
+        if rewards:
+            for reward in rewards:
+                reward.id = reward.id or str(uuid4())
+            await db.execute(
+                insert(Reward),
+                [{field: getattr(reward, field) for field in REWARD_INSERT_FIELDS} for reward in rewards]
+            )
+        await RewardRepo.append_to_ledger(db, rewards)
+
+        results = []
+        for receiver, points in credits.items():
+            credited = receiver in balances
+            if not credited:
+                logger.warning("No wallet found for reward receiver %s; %s points not credited", receiver, points)
+            results.append({
+                "receiver": receiver,
+                "points": points,
+                "reward_points": balances.get(receiver),
+                "credited": credited
+            })
+
+        return results
+
+    @staticmethod
+    async def credit_account_points(db: AsyncSession, key_column, credits: dict[str, float]):
+        """
+        Atomically add reward points to non-member accounts (hubs, communities,
+        investor admin accounts) in one UPDATE keyed by `key_column`, e.g.
+        `Hub.id`. Does not commit.
+        """
+        if not credits:
+            return
+
+        model = key_column.class_
+        await db.execute(
+            update(model)
+            .where(key_column.in_(list(credits)))
+            .values(reward_points=model.reward_points + case(credits, value=key_column, else_=0))
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def get_existing_ids(db: AsyncSession, key_column, ids, *criteria) -> set:
+        """
+        Return the subset of `ids` present in `key_column`'s table.
+        """
+        ids = {i for i in ids if i}
+        if not ids:
+            return set()
+
+        result = await db.execute(select(key_column).where(key_column.in_(ids), *criteria))
+        return set(result.scalars().all())
+
+    @staticmethod
+    async def append_to_ledger(db: AsyncSession, rewards: list[Reward]):
+        """
+        Append one ledger entry per inserted reward row, as one multi-row
+        INSERT. Does not commit.
+        """
+        if not rewards:
+            return
+
+        await db.execute(
+            insert(RewardLedger),
+            [
+                {"member_id": reward.receiver, "reward_id": reward.id, "points": reward.reward_points}
+                for reward in rewards
+            ]
+        )
+
+    @staticmethod
+    def reward_balance_query(member_id: str):
+        """
+        A member's reward balance: the latest snapshot plus the ledger entries
+        after it, in one query. Compaction keeps the tail short.
+        """
+        snapshot = (
+            select(RewardBalanceSnapshot.last_seq, RewardBalanceSnapshot.balance)
+            .where(RewardBalanceSnapshot.member_id == member_id)
+            .order_by(RewardBalanceSnapshot.last_seq.desc())
+            .limit(1)
+            .subquery()
+        )
+        tail = (
+            select(func.sum(RewardLedger.points))
+            .where(
+                RewardLedger.member_id == member_id,
+                RewardLedger.seq > func.coalesce(select(snapshot.c.last_seq).scalar_subquery(), 0)
+            )
+            .scalar_subquery()
+        )
+
+        return select(func.coalesce(select(snapshot.c.balance).scalar_subquery(), 0) + func.coalesce(tail, 0))
+
+    @staticmethod
+    def export_rewards_query():
+        """
+        Flat reward rows (with giver and receiver names) for CSV/NDJSON export.
+        """
+        giver = aliased(MemberDetails)
+        recipient = aliased(MemberDetails)
+        return (
+            select(
+                Reward.id,
+                Reward.reward_source_type,
+                Reward.reward_points,
+                Reward.reward_from,
+                giver.first_name.label("reward_from_first_name"),
+                giver.last_name.label("reward_from_last_name"),
+                Reward.receiver,
+                recipient.first_name.label("receiver_first_name"),
+                recipient.last_name.label("receiver_last_name"),
+                Reward.title,
+                Reward.description,
+                Reward.status,
+                Reward.reference_id,
+                Reward.created_at,
+                Reward.updated_at
+            )
+            .outerjoin(giver, giver.member_id == Reward.reward_from)
+            .outerjoin(recipient, recipient.member_id == Reward.receiver)
+            .order_by(Reward.created_at.desc(), Reward.id.desc())
+        )
+
     @staticmethod
     async def get_member_rewards(db: AsyncSession, member_id: str):
         try:
@@ -40,11 +194,11 @@ class RewardRepo:
                 .where(Reward.receiver == member_id)
             )
 
-            result = await db.execute(stmt)
+            # The reward list and the balance are independent reads
+            result, balance_result = await execute_concurrently(db, stmt, RewardRepo.reward_balance_query(member_id))
             rewards = result.scalars().all()
 
             reward_list = []
-            total_rewards = 0
 
             for reward in rewards:
                 giver_details = reward.giver.details if reward.giver else None
@@ -66,11 +220,9 @@ class RewardRepo:
                     "updated_at": reward.updated_at,
                 })
 
-                total_rewards += reward.reward_points
-
             return {
                 "receiver": member_id,
-                "total_rewards": total_rewards,
+                "total_rewards": balance_result.scalar(),
                 "rewards": reward_list
             }
 
@@ -0,0 +1,101 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func, extract
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+from models.rollup_models import DailyRollup, MonthlyRollup, ActivationRollup
+
+
+# Per-activation deductions from the activation amount
+ACTIVATION_REWARDS = 55  # unilevel rewards (40 + 10 + 5)
+ACTIVATOR_EARNING = 25  # only paid on ₱175 activations
+ACTIVATOR_EARNING_AMOUNT = 175
+
+ROLLUP_COUNTERS = (
+    "members_created",
+    "members_activated",
+    "merchants_created",
+    "communities_created",
+    "activations",
+    "activation_amount",
+    "activation_net_amount",
+)
+
+
+def activation_net_amount(amount: float) -> float:
+    """What is left of an activation after rewards and activator earnings."""
+    return amount - ACTIVATION_REWARDS - (ACTIVATOR_EARNING if amount == ACTIVATOR_EARNING_AMOUNT else 0)
+
+
+class RollupRepo:
+    @staticmethod
+    async def record(db: AsyncSession, **counts):
+        """
+        Add `counts` (any of ROLLUP_COUNTERS) to today's daily and monthly
+        rollup rows, creating them if needed. "Today" is the database's
+        CURRENT_DATE, the same clock that fills `created_at`. Does not commit.
+        """
+        unknown = set(counts) - set(ROLLUP_COUNTERS)
+        if unknown:
+            raise ValueError(f"Unknown rollup counters: {', '.join(sorted(unknown))}")
+
+        today = func.current_date()
+        periods = (
+            (DailyRollup, {"day": today}),
+            (MonthlyRollup, {"year": extract("year", today), "month": extract("month", today)}),
+        )
+
+        for model, key in periods:
+            stmt = mysql_insert(model).values(**key, **{name: counts.get(name, 0) for name in ROLLUP_COUNTERS})
+            await db.execute(
+                stmt.on_duplicate_key_update(
+                    {name: getattr(model, name) + value for name, value in counts.items()}
+                )
+            )
+
+    @staticmethod
+    async def record_activation(db: AsyncSession, activated_by_role: str, amount: float, member_activated: bool):
+        """
+        Count one activation in the rollups. `member_activated` is False when
+        the member was already activated, so the activated-member total does
+        not double count. Does not commit.
+        """
+        await RollupRepo.record(
+            db,
+            activations=1,
+            activation_amount=amount,
+            activation_net_amount=activation_net_amount(amount),
+            members_activated=int(member_activated)
+        )
+
+        stmt = mysql_insert(ActivationRollup).values(activated_by_role=activated_by_role, amount=amount, count=1)
+        await db.execute(stmt.on_duplicate_key_update(count=ActivationRollup.count + 1))
+
+    @staticmethod
+    def totals_query():
+        """All-time counters: the sum of the monthly rollups."""
+        return select(
+            *(func.coalesce(func.sum(getattr(MonthlyRollup, name)), 0).label(name) for name in ROLLUP_COUNTERS)
+        )
+
+    @staticmethod
+    def activation_breakdown_query():
+        """(activated_by_role, amount, count) for every role and amount seen."""
+        return (
+            select(ActivationRollup.activated_by_role, ActivationRollup.amount, ActivationRollup.count)
+            .order_by(ActivationRollup.activated_by_role, ActivationRollup.amount)
+        )
+
+    @staticmethod
+    def current_year_months_query():
+        """The monthly rollups of the database's current year, January first."""
+        return (
+            select(MonthlyRollup)
+            .where(MonthlyRollup.year == extract("year", func.current_date()))
+            .order_by(MonthlyRollup.month)
+        )
+
+    @staticmethod
+    async def get_current_year_months(db: AsyncSession):
+        result = await db.execute(RollupRepo.current_year_months_query())
+        return result.scalars().all()
@@ -4,7 +4,7 @@ from sqlalchemy.future import select
 from models.wallet_models import Wallet, WalletExtensions
 from models.member_models import MemberWallet
 
-from sqlalchemy import update
+from sqlalchemy import update, case
 
 
 class WalletRepository:
@@ -32,4 +32,40 @@ class WalletRepository:
             update(Wallet)
             .where(Wallet.wallet_id == wallet_id_subquery)
             .values(reward_points=reward_points)
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    async def credit_reward_points(db: AsyncSession, credits: dict[str, float]) -> dict[str, float]:
+        """
+        Atomically add reward points to several members' wallets in a single
+        UPDATE (reward_points = reward_points + CASE member_id ...), so
+        concurrent credits to the same wallet cannot overwrite each other.
+
+        :param credits: member_id -> points to add
+        :return: member_id -> reward points after the credit, for every member
+            that has a wallet. Does not commit.
+        """
+        if not credits:
+            return {}
+
+        member_ids = list(credits)
+
+        await db.execute(
+            update(Wallet)
+            .where(
+                Wallet.wallet_id == MemberWallet.wallet_id,
+                MemberWallet.member_id.in_(member_ids)
+            )
+            .values(
+                reward_points=Wallet.reward_points + case(credits, value=MemberWallet.member_id, else_=0)
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        # The updated rows stay locked until commit, so this reads our own write
+        result = await db.execute(
+            select(MemberWallet.member_id, Wallet.reward_points)
+            .join(Wallet, Wallet.wallet_id == MemberWallet.wallet_id)
+            .where(MemberWallet.member_id.in_(member_ids))
+        )
+        return {row.member_id: row.reward_points for row in result}
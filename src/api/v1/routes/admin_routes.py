@@ -6,13 +6,16 @@ from api.v1.services.admin_services import AdminService
 from fastapi import status
 from typing import List
 
-from core.security import JWTBearer, require_role
+from core.security import jwt_bearer, require_role
 from utils.responses import json_response
 
 
 from fastapi import Response
+import logging
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -44,18 +47,18 @@ async def get_all_accounts(db: AsyncSession = Depends(get_db)):
     return await AdminService.get_all_accounts(db)
 
 @router.post("/initiate-member-activation", status_code=status.HTTP_200_OK, dependencies=[Depends(require_role("ADMIN", "CUSTOMER_SUPPORT", "LEADER"))])
-async def initiate_member_activation(db: AsyncSession = Depends(get_db), token: str = Depends(JWTBearer())):
+async def initiate_member_activation(db: AsyncSession = Depends(get_db), token: str = Depends(jwt_bearer)):
     activated_by = token['member_user_id']
-    print("activated_by_external_id", activated_by)
+    logger.debug("Activation initiated by: %s", activated_by)
     return await AdminService.initiate_member_activation(db, activated_by)
 
 @router.post("/process-member-activation", status_code=status.HTTP_200_OK, dependencies=[Depends(require_role("ADMIN", "CUSTOMER_SUPPORT", "LEADER"))])
 async def process_member_activation(
     activation_data: ProcessActivation,
     db: AsyncSession = Depends(get_db),
-    token: str = Depends(JWTBearer())
+    token: str = Depends(jwt_bearer)
 ):
     activated_by = token['member_user_id']
-    print("qwerty", activation_data)
+    logger.debug("Process activation: %s", activation_data)
     return await AdminService.process_member_activation(db, activation_data, activated_by)
 
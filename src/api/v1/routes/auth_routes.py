@@ -4,26 +4,31 @@ from api.v1.services.auth_services import AuthService  # Import service layer
 from core.database import get_db  # Import DB session
 from api.v1.repo.member_repo import MemberRepo
 
-from core.security import hash_password
+from core.security import hash_password_async
+from core.rate_limit import RateLimit
+from core.config import settings
 from fastapi import Response
 
+# Login and resend both send an SMS, so they share one budget
+otp_send_limit = RateLimit("otp_send", settings.RATE_LIMIT_OTP_SEND, settings.RATE_LIMIT_OTP_SEND_IP)
+
 router = APIRouter()
 
-@router.post("/login")
+@router.post("/login", dependencies=[Depends(otp_send_limit)])
 async def login(mobile_number: str, role: str, db: AsyncSession = Depends(get_db)):
     """
     API endpoint to initiate login by sending OTP.
     """
     return await AuthService.login(db, mobile_number, role)
 
-@router.post("/verify-otp")
+@router.post("/verify-otp", dependencies=[Depends(RateLimit("verify_otp", settings.RATE_LIMIT_VERIFY_OTP, settings.RATE_LIMIT_VERIFY_OTP_IP))])
 async def verify_otp(mobile_number: str, input_otp: str):
     """
     API endpoint to verify OTP.
     """
     return await AuthService.verify_otp(mobile_number, input_otp)
 
-@router.post("/verify-mpin")
+@router.post("/verify-mpin", dependencies=[Depends(RateLimit("verify_mpin", settings.RATE_LIMIT_VERIFY_MPIN, settings.RATE_LIMIT_VERIFY_MPIN_IP))])
 async def verify_mpin(
     mobile_number: str, 
     input_mpin: str, 
@@ -53,7 +58,7 @@ async def verify_mpin(
     }
 
 
-@router.post("/resend-otp")
+@router.post("/resend-otp", dependencies=[Depends(otp_send_limit)])
 async def resend_otp(mobile_number: str, db: AsyncSession = Depends(get_db)):
     """
     API endpoint to resend OTP.
@@ -66,7 +71,7 @@ async def resend_otp(mobile_number: str, db: AsyncSession = Depends(get_db)):
 async def set_mpin(mobile_number: str, mpin: str, db: AsyncSession = Depends(get_db)):
     member = await MemberRepo.get_member_by_mobile_number(db, mobile_number)
 
-    hashed_mpin = hash_password(mpin)
+    hashed_mpin = await hash_password_async(mpin)
     member.mpin = hashed_mpin
 
     db.add(member)  # Add the member object (optional if it's already tracked)
@@ -1,10 +1,10 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db
+from core.database import get_db, get_read_db
 from api.v1.schemas.community_schemas import CreateCommunity, CommunityResponse, CommunityListResponse, CommunityDetailsResponse
 from api.v1.services.community_services import CommunityService
-from core.security import require_role, JWTBearer
+from core.security import require_role, jwt_bearer
 
 
 from typing import List
@@ -22,15 +22,15 @@ async def create_community(
 
 
 @router.get("/all", response_model=List[CommunityListResponse], dependencies=[Depends(require_role("ADMIN", "INVESTOR", "CUSTOMER_SUPPORT"))])
-async def get_all_communities_endpoint(db: AsyncSession = Depends(get_db)):
+async def get_all_communities_endpoint(db: AsyncSession = Depends(get_read_db)):
     return await CommunityService.get_all_communities(db)
 
 
 @router.get("/{community_id}", response_model=CommunityDetailsResponse, dependencies=[Depends(require_role("ADMIN", "INVESTOR", "CUSTOMER_SUPPORT"))])
-async def get_community(community_id: str, db: AsyncSession = Depends(get_db)):
+async def get_community(community_id: str, db: AsyncSession = Depends(get_read_db)):
     return await CommunityService.get_community(db, community_id)
 
 
 @router.get("/", summary="Get own community details", dependencies=[Depends(require_role("LEADER"))], response_model=CommunityDetailsResponse)
-async def get_own_community(db: AsyncSession = Depends(get_db), token: str = Depends(JWTBearer())):
+async def get_own_community(db: AsyncSession = Depends(get_read_db), token: str = Depends(jwt_bearer)):
     return await CommunityService.get_community(db, token['user_id'])
\ No newline at end of file
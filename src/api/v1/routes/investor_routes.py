@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Query, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
-from core.database import get_db
+from core.database import get_db, get_read_db
 from api.v1.schemas.investor_schemas import InvestorDashboardResponse
 from api.v1.services.investor_services import InvestorService
+from api.v1.services.activation_feed import ActivationFeed
 
-from core.security import JWTBearer, require_role
+from core.security import jwt_bearer, require_role
 
 
 router = APIRouter()
@@ -13,14 +16,29 @@ router = APIRouter()
 
 @router.get("/investor-dashboard", response_model=InvestorDashboardResponse)
 async def get_investor_dashboard(
-    db: AsyncSession = Depends(get_db),
-    token = Depends(JWTBearer()),
+    token = Depends(jwt_bearer),
+    db: AsyncSession = Depends(get_read_db),
 ):
     member_id = token['member_user_id']
-    print("member_idq", member_id)
     return await InvestorService.get_dashboard_data(db, member_id)
 
 
 @router.get("/activation-history")
-async def get_activation_history(db: AsyncSession = Depends(get_db)):
-    return await InvestorService.get_monthly_activation_data(db)
\ No newline at end of file
+async def get_activation_history(db: AsyncSession = Depends(get_read_db)):
+    return await InvestorService.get_monthly_activation_data(db)
+
+@router.get("/activation-feed", dependencies=[Depends(require_role("ADMIN", "INVESTOR"))])
+async def get_activation_feed(
+    request: Request,
+    last_event_id: Optional[str] = Query(None, description="Resume after this event ID (e.g. the dashboard's activation_feed_cursor)"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Server-Sent Events stream of member activations. Browsers resume
+    automatically with the Last-Event-ID header after a reconnect.
+    """
+    return StreamingResponse(
+        ActivationFeed.events(request, last_event_id_header or last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
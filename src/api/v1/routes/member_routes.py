@@ -1,22 +1,27 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db
+from core.database import get_db, get_read_db
 
 from api.v1.schemas.member_schemas import MemberCreateSchema, MemberReadSchema, MemberListResponse, MemberInfoSchema, PurchaseHistorySchema
 from api.v1.schemas.reward_schemas import RewardListSchema
 from api.v1.services.member_services import MemberService
 from api.v1.repo.member_repo import MemberRepo
 from api.v1.services.reward_services import RewardService
-from core.security import JWTBearer, decode_jwt, require_role, get_jwt_identity
+from core.security import jwt_bearer, decode_jwt, require_role, get_jwt_identity
+from core.config import settings
+from utils.export import ExportFormat, export_response
 
 
 from fastapi.encoders import jsonable_encoder
 from typing import List, Optional
 
 from fastapi import HTTPException
+import logging
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 @router.post("/create/{referral_id}", response_model=MemberReadSchema)
@@ -25,7 +30,7 @@ async def create_member(referral_id: str, member_data: MemberCreateSchema, db: A
     Create a new member, including details, address, and wallet.
     """
     new_member = await MemberService.create_member(db, member_data, referral_id)
-    print("new member", new_member)
+    logger.debug("New member: %s", new_member)
     return new_member
 
 @router.get("/{member_id}/info", response_model=List[MemberInfoSchema])
@@ -34,16 +39,36 @@ async def get_member(db: AsyncSession = Depends(get_db), member_id: str = None):
 
 
 @router.get("", response_model=List[MemberInfoSchema], summary="Get member details", dependencies=[Depends(require_role("MEMBER"))])
-async def get_member(db: AsyncSession = Depends(get_db), token: str = Depends(JWTBearer())):
+async def get_member(db: AsyncSession = Depends(get_db), token: str = Depends(jwt_bearer)):
     member_user_id = token['user_id']
     return await MemberService.get_member(db, member_user_id)
 
-@router.get("/all", response_model=List[MemberListResponse])
+@router.get("/all", summary="List members, newest first (cursor paginated)")
 async def get_all_members(
-    db: AsyncSession = Depends(get_db),
-    is_activated: Optional[bool] = Query(None)  # Accepts is_activated as a query parameter
+    db: AsyncSession = Depends(get_read_db),
+    cursor: Optional[str] = Query(None, description="`next_cursor` from the previous page"),
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. user_id,mobile_number,wallet"),
+    community_id: Optional[str] = Query(None),
+    is_activated: Optional[bool] = Query(None),
+    is_kyc_verified: Optional[bool] = Query(None)
+):
+    return await MemberService.get_all_members(
+        db, cursor, limit, fields,
+        community_id=community_id,
+        is_activated=is_activated,
+        is_kyc_verified=is_kyc_verified
+    )
+
+@router.get("/export", summary="Export members as NDJSON or CSV", dependencies=[Depends(require_role("ADMIN", "INVESTOR"))])
+async def export_members(
+    format: ExportFormat = Query("ndjson"),
+    community_id: Optional[str] = Query(None),
+    is_activated: Optional[bool] = Query(None),
+    is_kyc_verified: Optional[bool] = Query(None)
 ):
-    return await MemberService.get_all_members(db, is_activated)
+    query = MemberRepo.export_members_query(community_id, is_activated, is_kyc_verified)
+    return export_response(query, format, "members")
 
 @router.get('/{member_id}')
 async def get_member_balance(db: AsyncSession = Depends(get_db), member_id: str = None):
@@ -60,8 +85,16 @@ async def get_member_unilevel(db: AsyncSession = Depends(get_db), member_id: str
 async def get_member_unilevel(db: AsyncSession = Depends(get_db), member_id: str = None):
     return await MemberRepo.get_member_unilevel_5(db, member_id)
 
+@router.get('/{member_id}/team', summary="Get member downline counts per level", dependencies=[Depends(require_role("MEMBER", "LEADER", "ADMIN", "CUSTOMER_SUPPORT", "INVESTOR"))])
+async def get_member_team(
+    member_id: str,
+    db: AsyncSession = Depends(get_read_db),
+    max_level: Optional[int] = Query(None, ge=1)
+):
+    return await MemberService.get_member_team(db, member_id, max_level)
+
 @router.get("/rewards/all", response_model=RewardListSchema, summary="Get member rewards", dependencies=[Depends(require_role("MEMBER", "ADMIN", "CUSTOMER_SUPPORT"))])
-async def get_member_rewards(db: AsyncSession = Depends(get_db), token: dict = Depends(JWTBearer())):
+async def get_member_rewards(db: AsyncSession = Depends(get_read_db), token: dict = Depends(jwt_bearer)):
     try:
         member_id = token.get("user_id")
         if not member_id:
@@ -72,7 +105,7 @@ async def get_member_rewards(db: AsyncSession = Depends(get_db), token: dict = D
         raise HTTPException(status_code=500, detail=str(e))
     
 @router.get("/rewards/{member_id}", response_model=RewardListSchema, summary="Get member rewards", dependencies=[Depends(require_role("ADMIN", "MEMBER", "INVESTOR"))])
-async def get_member_rewards(member_id: str, db: AsyncSession = Depends(get_db)):
+async def get_member_rewards(member_id: str, db: AsyncSession = Depends(get_read_db)):
     try:
 
         return await RewardService.get_member_rewards(db, member_id)
@@ -81,8 +114,8 @@ async def get_member_rewards(member_id: str, db: AsyncSession = Depends(get_db))
     
 @router.get("/merchant-purchase/history", response_model=List[PurchaseHistorySchema], dependencies=[Depends(require_role("MEMBER", "ADMIN", "INVESTOR"))])
 async def get_member_purchase_history(
-    db: AsyncSession = Depends(get_db),
-    token: dict = Depends(JWTBearer())
+    db: AsyncSession = Depends(get_read_db),
+    token: dict = Depends(jwt_bearer)
 ):
     member_id = token.get('user_id')
     purchases = await MemberService.get_member_purchase_history(db, member_id)
@@ -93,7 +126,7 @@ async def get_member_purchase_history(
 @router.get("/merchant-purchase/history/{member_id}", response_model=List[PurchaseHistorySchema], dependencies=[Depends(require_role("MEMBER", "ADMIN", "INVESTOR"))])
 async def get_member_purchase_history(
     member_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     purchases = await MemberService.get_member_purchase_history(db, member_id)
     if not purchases:
@@ -1,27 +1,33 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db
+from core.database import get_db, get_read_db
 
 from api.v1.schemas.merchant_schemas import MerchantResponse, MerchantCreate, MerchantPurchaseHistoryListResponse, PayQR, ProcessPay
 from api.v1.services.merchant_services import MerchantService
 from fastapi import HTTPException
-from core.security import JWTBearer, decode_jwt, require_role, get_jwt_identity
+from core.security import jwt_bearer, decode_jwt, require_role, get_jwt_identity
+from api.v1.repo.merchant_repo import MerchantRepo
+from utils.export import ExportFormat, export_response
 
 from typing import List
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
 @router.get("s/", summary="Get all merchants with details")
-async def get_all_merchants(db: AsyncSession = Depends(get_db)):
+async def get_all_merchants(db: AsyncSession = Depends(get_read_db)):
     return await MerchantService.get_all_merchants(db)
 
 
+@router.get("/export", summary="Export merchants as NDJSON or CSV", dependencies=[Depends(require_role("ADMIN", "INVESTOR"))])
+async def export_merchants(format: ExportFormat = Query("ndjson")):
+    return export_response(MerchantRepo.export_merchants_query(), format, "merchants")
+
+
 @router.post("/create/{referral_id}", response_model=MerchantResponse, summary="Register a new merchant")
 async def create_merchant(referral_id: str, merchant_data: MerchantCreate, db: AsyncSession = Depends(get_db)):
     return await MerchantService.create_merchant(db, merchant_data, referral_id)
@@ -32,7 +38,7 @@ async def create_merchant(referral_id: str, merchant_data: MerchantCreate, db: A
 async def get_merchant(
     merchant_id: str = None,
     db: AsyncSession = Depends(get_db),
-    token: str = Depends(JWTBearer()),
+    token: str = Depends(jwt_bearer),
 ):
     # Decode the token to get merchant_id
     token_merchant_id = token['user_id']
@@ -49,7 +55,7 @@ async def get_merchant(
 @router.get("/", summary="Get own merchant details", dependencies=[Depends(require_role("MERCHANT"))])
 async def get_own_merchant(
     db: AsyncSession = Depends(get_db),
-    token: str = Depends(JWTBearer()),
+    token: str = Depends(jwt_bearer),
 ):
     
     merchant_id = token['user_id']
@@ -60,8 +66,8 @@ async def get_own_merchant(
 
 @router.get("/purchase/history", response_model=List[MerchantPurchaseHistoryListResponse],dependencies=[Depends(require_role("MERCHANT"))])
 async def get_merchant_purchase_history(
-    db: AsyncSession = Depends(get_db),
-    token_payload: dict = Depends(JWTBearer()),
+    db: AsyncSession = Depends(get_read_db),
+    token_payload: dict = Depends(jwt_bearer),
 ):
     merchant_id = token_payload['user_id']
     return await MerchantService.get_merchant_purchase_history(db, merchant_id)
@@ -69,7 +75,7 @@ async def get_merchant_purchase_history(
 @router.get("/purchase/history/{merchant_id}", response_model=List[MerchantPurchaseHistoryListResponse],dependencies=[Depends(require_role("ADMIN", "INVESTOR"))])
 async def get_merchant_purchase_history(
     merchant_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     return await MerchantService.get_merchant_purchase_history(db, merchant_id)
 
@@ -78,7 +84,7 @@ async def get_merchant_purchase_history(
 async def pay_qr(
     qr_data: PayQR,
     db: AsyncSession = Depends(get_db),
-    token_payload: dict = Depends(JWTBearer())
+    token_payload: dict = Depends(jwt_bearer)
 ):
     member_id = token_payload["user_id"]
     return await MerchantService.pay_qr(db, qr_data, member_id)
@@ -91,7 +97,7 @@ async def initiate_pay_merchant(
     merchant_id: str,
     data: PayQR,  # Extract amount from request body
     db: AsyncSession = Depends(get_db),
-    token: dict = Depends(JWTBearer())
+    token: dict = Depends(jwt_bearer)
 ):
     member_id = token['user_id']
     return await MerchantService.initiate_pay_merchant(db, merchant_id, member_id, data)
@@ -102,7 +108,7 @@ async def process_pay_merchant(
     merchant_id: str,
     data: ProcessPay,
     db: AsyncSession = Depends(get_db),
-    token: dict = Depends(JWTBearer())
+    token: dict = Depends(jwt_bearer)
 ):
     member_id = token['user_id']
 
@@ -1,27 +1,45 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from api.v1.services.reward_services import RewardService
 
-from core.database import get_db
+from core.database import get_db, get_read_db
 from api.v1.schemas.activation_schema import ActivationHistorySchema
 from api.v1.services.activation_services import ActivationService
 
 from typing import List
 
+from api.v1.repo.rewards_repo import RewardRepo
+from api.v1.repo.activation_repo import ActivationRepo
+from core.security import require_role
+from utils.export import ExportFormat, export_response
+from utils.responses import JSONResponseClass
+
 router = APIRouter()
 
 
 
 
 @router.get("/", summary="Get all rewards")
-async def get_rewards(db: AsyncSession = Depends(get_db)):
-    return await RewardService.fetch_all_rewards(db)
+async def get_rewards(db: AsyncSession = Depends(get_read_db)):
+    # Encoded directly by the app's JSON backend (datetimes included),
+    # skipping FastAPI's jsonable_encoder pass over every row
+    return JSONResponseClass(await RewardService.fetch_all_rewards(db))
     
 
 @router.get("/activation-history", response_model=List[ActivationHistorySchema])
-async def get_activation_history(db: AsyncSession = Depends(get_db)):
+async def get_activation_history(db: AsyncSession = Depends(get_read_db)):
     """
     Get the activation history with the activated member's name.
     """
     activation_history = await ActivationService.get_activation_history_with_member_name(db)
-    return activation_history
\ No newline at end of file
+    return activation_history
+
+
+@router.get("/export", summary="Export rewards as NDJSON or CSV", dependencies=[Depends(require_role("ADMIN", "INVESTOR"))])
+async def export_rewards(format: ExportFormat = Query("ndjson")):
+    return export_response(RewardRepo.export_rewards_query(), format, "rewards")
+
+
+@router.get("/activation-history/export", summary="Export activation history as NDJSON or CSV", dependencies=[Depends(require_role("ADMIN", "INVESTOR"))])
+async def export_activation_history(format: ExportFormat = Query("ndjson")):
+    return export_response(ActivationRepo.export_activation_history_query(), format, "activation-history")
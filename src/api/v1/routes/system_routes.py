@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends
+
+from api.v1.services.topwallet_transport import transport
+from core.security import require_role, hashing_pool
+from core.database import get_pool_stats
+
+
+router = APIRouter()
+
+
+@router.get("/topwallet", summary="TopWallet transport metrics", dependencies=[Depends(require_role("ADMIN"))])
+async def get_topwallet_metrics():
+    """
+    Circuit breaker state and per-endpoint call, failure, retry and coalescing counters
+    for the TopWallet transport on this worker.
+    """
+    return transport.stats()
+
+
+@router.get("/password-hashing", summary="bcrypt pool metrics", dependencies=[Depends(require_role("ADMIN"))])
+async def get_password_hashing_metrics():
+    """
+    Size, queue depth, wait times and rejections of this worker's bcrypt thread pool.
+    """
+    return hashing_pool.stats()
+
+
+@router.get("/db-pool", summary="Database connection pool metrics", dependencies=[Depends(require_role("ADMIN"))])
+async def get_db_pool_metrics():
+    """
+    Checked-out and overflow connections, checkout wait times, how long connections
+    are held, and connection lifetimes for this worker's primary and replica
+    (null when not configured) engines.
+    """
+    return get_pool_stats()
@@ -5,7 +5,7 @@ from api.v1.repo.member_repo import MemberRepo
 from api.v1.schemas.topwallet_schemas import P2PprocessRequest, P2PTransferRequest, TWP2PTransferRequest
 
 from core.database import get_db
-from core.security import JWTBearer, require_role
+from core.security import jwt_bearer, require_role
 
 
 router = APIRouter()
@@ -20,7 +20,7 @@ async def get_banks_list():
 @router.post("/cashin_by_bank_id", dependencies=[Depends(require_role("MEMBER"))])
 async def cashin_by_bank_id(
     db: AsyncSession = Depends(get_db),
-    token: dict = Depends(JWTBearer())
+    token: dict = Depends(jwt_bearer)
 ):
     member_id = token.get("user_id")
     member_id = await MemberRepo.get_external_id(db, member_id)
@@ -29,7 +29,7 @@ async def cashin_by_bank_id(
 @router.post("/get_profile", dependencies=[Depends(require_role("MEMBER"))])
 async def get_profile(
     db: AsyncSession = Depends(get_db),
-    token: dict = Depends(JWTBearer())
+    token: dict = Depends(jwt_bearer)
 ):
     member_id = token.get("user_id")
 
@@ -39,7 +39,7 @@ async def get_profile(
 @router.post("/generate/qrph", dependencies=[Depends(require_role("MEMBER"))])
 async def generate_qr(
     db: AsyncSession = Depends(get_db),
-    token: dict = Depends(JWTBearer())
+    token: dict = Depends(jwt_bearer)
 ):
     member_id = token.get("user_id")
 
@@ -51,7 +51,7 @@ async def generate_qr(
 async def initiate_p2ptransfer(
     data: TWP2PTransferRequest,
     db: AsyncSession = Depends(get_db),
-    token: dict = Depends(JWTBearer())
+    token: dict = Depends(jwt_bearer)
 ):
     member_id = token.get("user_id")
     return await TopWallet.p2p_transfer(db, data, member_id)
@@ -60,5 +60,11 @@ async def initiate_p2ptransfer(
 @router.post("process_p2ptransfer", dependencies=[Depends(require_role("MEMBER"))])
 async def process_p2ptransfer(
     data: P2PprocessRequest,
+    db: AsyncSession = Depends(get_db),
+    token: dict = Depends(jwt_bearer)
 ):
-    return await TopWallet.process_transfer_p2p(data)
\ No newline at end of file
+    # Drop the cached balances of the sender and of the recipient remembered
+    # when the transfer was initiated
+    external_id = await MemberRepo.get_external_id(db, token.get("user_id"))
+    recipient_external_id = await TopWallet.get_p2p_recipient(data.Transaction_id)
+    return await TopWallet.process_transfer_p2p(data, [external_id, recipient_external_id])
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Tuple, Literal, Dict
+from typing import List, Tuple, Literal, Dict, Optional
 
 class InvestorDashboardResponse(BaseModel):
     reward_points: float
@@ -14,3 +14,4 @@ class InvestorDashboardResponse(BaseModel):
     total_accumulated_activation_amount: float
     monthly_accumulated_activation: List[Tuple[int, float]]  # (month, total accumulated activation amount)
     today_activations: List[Dict[str, str | int]]  # ✅ (full_name, amount)
+    activation_feed_cursor: Optional[str] = None  # Last-Event-ID to resume /investor/activation-feed from
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from enum import Enum
 from datetime import datetime
 
@@ -77,6 +77,7 @@ class MemberReadSchema(BaseModel):
 class WalletResponse(BaseModel):
     wallet_balance: float
     reward_points: Optional[float] = 0.0
+    balance_cached: Optional[bool] = None  # True when wallet_balance came from the balance cache
 
 class MemberListResponse(BaseModel):
     user_id: str
@@ -121,3 +122,16 @@ class PurchaseHistorySchema(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class DownlineLevelSchema(BaseModel):
+    level: int
+    total_count: int
+    activated_count: int
+
+
+class MemberTeamSchema(BaseModel):
+    member_id: str
+    total_count: int
+    activated_count: int
+    levels: List[DownlineLevelSchema]
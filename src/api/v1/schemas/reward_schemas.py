@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
 from typing import List, Optional
+from decimal import Decimal
 
 class RewardSchema(BaseModel):
     id: str
@@ -25,3 +26,13 @@ class RewardListSchema(BaseModel):
     rewards: List[RewardSchema]
 
     model_config = {"from_attributes": True}
+
+
+class PurchaseRewardInput(BaseModel):
+    reward_pool: Decimal  # pesos to distribute for this purchase
+    member_id: str  # buyer
+    merchant_id: str
+    reference_id: str
+    investor_id: Optional[str] = None  # AdminAccount id of the investor
+    hub_id: Optional[str] = None
+    purchase_id: Optional[str] = None
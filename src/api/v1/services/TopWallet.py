@@ -1,11 +1,15 @@
 import os
 import aiohttp
 import logging
+from redis.exceptions import RedisError
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from utils.responses import json_response
 from api.v1.schemas.admin_schemas import ProcessActivation
 from api.v1.schemas.topwallet_schemas import P2PTransferRequest, P2PprocessRequest, TWP2PTransferRequest
+from api.v1.services.topwallet_transport import transport
+from core.config import settings
+from core.redis import redis_client
 
 
 from dotenv import load_dotenv
@@ -13,7 +17,6 @@ load_dotenv()
 
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
 # Retrieve configuration from environment variables
 TW_API_URL = os.getenv('TW_API_URL')
@@ -21,20 +24,77 @@ TW_API_KEY = os.getenv("TW_API_KEY")
 TW_SECRET_KEY = os.getenv("TW_SECRET_KEY")
 MOTHERWALLET = os.getenv("TW_MOTHERWALLET")
 
+# Shared HTTP session for the worker, created on app startup so every call
+# reuses pooled keep-alive connections instead of a fresh TCP+TLS handshake.
+_session: aiohttp.ClientSession | None = None
 
 
+def _balance_key(external_id: str) -> str:
+    return f"topwallet:balance:{external_id}"
+
+
+def _p2p_recipient_key(transaction_id: str) -> str:
+    return f"topwallet:p2p_recipient:{transaction_id}"
+
+
+def _transaction_id(response) -> str | None:
+    """The Transaction_id of an initiate_p2ptransfer response, at the top level or under "data"."""
+    for container in (response, response.get("data") if isinstance(response, dict) else None):
+        if isinstance(container, dict):
+            for key in ("Transaction_id", "transaction_id"):
+                if container.get(key):
+                    return str(container[key])
+    return None
+
 
 class TopWallet:
+    @staticmethod
+    async def start_session() -> aiohttp.ClientSession:
+        """
+        Create the shared TopWallet HTTP session with a tuned connector.
+        Safe to call more than once; an open session is reused.
+        """
+        global _session
+        if _session is None or _session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.TW_CONNECTION_LIMIT,
+                limit_per_host=settings.TW_CONNECTION_LIMIT_PER_HOST,
+                keepalive_timeout=settings.TW_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=settings.TW_DNS_CACHE_TTL,
+            )
+            _session = aiohttp.ClientSession(connector=connector)
+            logger.info("TopWallet HTTP session started.")
+        return _session
+
+    @staticmethod
+    async def close_session():
+        """Close the shared TopWallet HTTP session and its pooled connections."""
+        global _session
+        if _session is not None and not _session.closed:
+            await _session.close()
+            logger.info("TopWallet HTTP session closed.")
+        _session = None
+
+    @staticmethod
+    async def get_session() -> aiohttp.ClientSession:
+        """Return the shared session, starting it lazily outside the app (e.g. scripts)."""
+        if _session is None or _session.closed:
+            return await TopWallet.start_session()
+        return _session
+
     @staticmethod
     async def call_topwallet_api(endpoint: str, payload: dict, method: str = "POST") -> dict:
         """
         Reusable function to call TopWallet API using aiohttp.
+        Deadlines, retries of idempotent calls and the circuit breaker are
+        handled by the transport layer (see topwallet_transport).
 
         :param endpoint: API endpoint to call, e.g., "b2bapi/user_on_board"
         :param payload: JSON payload to send
         :param method: HTTP method to use ("post" or "get")
         :return: Parsed JSON response from TopWallet API
-        :raises HTTPException: if the API call fails or returns a non-200 status code.
+        :raises HTTPException: if the API call fails or returns a non-200 status code,
+            times out (504), cannot connect (502) or the circuit is open (503).
         """
         if not TW_API_URL or not TW_API_KEY or not TW_SECRET_KEY:
             logger.error("TopWallet configuration is missing.")
@@ -46,43 +106,9 @@ class TopWallet:
             "secretkey": TW_SECRET_KEY,
         }
         
-        async with aiohttp.ClientSession() as session:
-            if method.lower() == "post":
-                async with session.post(url, json=payload, headers=headers) as response:
-                    status = response.status
-                    response_text = await response.text()
-                    if status != 200:
-                        logger.error("TopWallet API request failed with status %s: %s", status, response_text)
-                        raise HTTPException(status_code=status, detail=response_text)
-                        #try:
-                        #    response_data = await response.json()
-                        #except Exception:
-                        #    response_data = {}
-                        #raise HTTPException(status_code=status, detail=response_data)
-                    try:
-                        return await response.json()
-                    except Exception as e:
-                        logger.error("Error parsing TopWallet API response: %s", e, exc_info=True)
-                        raise HTTPException(status_code=500, detail="Error parsing TopWallet API response")
-            elif method.lower() == "get":
-                async with session.get(url, params=payload, headers=headers) as response:
-                    status = response.status
-                    response_text = await response.text()
-                    if status != 200:
-                        logger.error("TopWallet API request failed with status %s: %s", status, response_text)
-                        try:
-                            response_data = await response.json()
-                        except Exception:
-                            response_data = {}
-                        raise HTTPException(status_code=status, detail=response_data)
-                    try:
-                        return await response.json()
-                    except Exception as e:
-                        logger.error("Error parsing TopWallet API response: %s", e, exc_info=True)
-                        raise HTTPException(status_code=500, detail="Error parsing TopWallet API response")
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-            
+        session = await TopWallet.get_session()
+        return await transport.send(session, method, endpoint, url, payload, headers)
+
 
 
     # Example usage in your FastAPI endpoint or service:
@@ -104,7 +130,7 @@ class TopWallet:
             },
         }
 
-        print("Payloaad", payload)
+        logger.debug("Onboarding payload: %s", payload)
         try:
             response_data = await TopWallet.call_topwallet_api("b2bapi/user_on_board", payload, method="POST")
 
@@ -160,32 +186,74 @@ class TopWallet:
         return await TopWallet.call_topwallet_api("b2bapi/initiate_p2ptransfer", payload, "POST")
 
     @staticmethod
-    async def process_p2p_transfer(request: P2PprocessRequest) -> dict:
+    async def process_p2p_transfer(request: P2PprocessRequest, external_ids: list[str] = ()) -> dict:
         """
         Process a peer-to-peer (P2P) transfer using the TopWallet API.
 
         :param request: P2PTransferRequest schema containing transfer details
+        :param external_ids: TopWallet user ids whose cached balances must be dropped on success
         :return: Parsed JSON response from TopWallet API
         :raises HTTPException: if the API call fails or returns a non-200 status code.
         """
         payload = request.model_dump()
         
-        return await TopWallet.call_topwallet_api("b2bapi/process_p2ptransfer", payload, "POST")
+        response_data = await TopWallet.call_topwallet_api("b2bapi/process_p2ptransfer", payload, "POST")
+        await TopWallet.invalidate_balance(*external_ids)
+        return response_data
+
+
+    @staticmethod
+    async def get_cached_balance(external_id: str) -> str | None:
+        """Return the cached peso balance for a TopWallet user, or None on a miss."""
+        try:
+            return await redis_client.get(_balance_key(external_id))
+        except RedisError as e:
+            logger.warning("Balance cache read failed for %s: %s", external_id, e)
+            return None
+
+    @staticmethod
+    async def cache_balance(external_id: str, peso) -> None:
+        try:
+            await redis_client.set(_balance_key(external_id), str(peso), ex=settings.TW_BALANCE_CACHE_TTL)
+        except RedisError as e:
+            logger.warning("Balance cache write failed for %s: %s", external_id, e)
+
+    @staticmethod
+    async def invalidate_balance(*external_ids: str) -> None:
+        """Drop cached balances after money has moved for these TopWallet users."""
+        keys = [_balance_key(external_id) for external_id in external_ids if external_id]
+        if not keys:
+            return
+        try:
+            await redis_client.delete(*keys)
+        except RedisError as e:
+            logger.warning("Balance cache invalidation failed for %s: %s", external_ids, e)
 
 
     @staticmethod
     async def get_user_balance(db: AsyncSession, member_id: str):
+        """
+        Peso balance of a member as {"peso": ..., "cached": bool}, served from
+        the short-TTL Redis cache when possible.
+        """
         from api.v1.repo.member_repo import MemberRepo
 
         try:
             external_id = await MemberRepo.get_external_id(db, member_id)
+
+            cached = await TopWallet.get_cached_balance(external_id)
+            if cached is not None:
+                return {"peso": cached, "cached": True}
+
             payload = {
                 "userid": external_id
             }
-            print("tw_external_id", external_id)
+            logger.debug("TopWallet external_id: %s", external_id)
             response_data = await TopWallet.call_topwallet_api(f"b2bapi/get_profile/", payload, method="POST")
-            print("response_data_tww", response_data)
-            return response_data.get("Balances", {}).get("peso", "0")
+            logger.debug("TopWallet balance response: %s", response_data)
+            peso = response_data.get("Balances", {}).get("peso", "0")
+            await TopWallet.cache_balance(external_id, peso)
+            return {"peso": peso, "cached": False}
         
         except HTTPException as e:
             raise HTTPException(status_code=e.status_code, detail=f"Failed to get user balance: {str(e.detail)}")
@@ -201,14 +269,14 @@ class TopWallet:
 
         try:
             external_id = await MemberRepo.get_external_id(db, activated_by)
-            print("test_external_id", external_id)
+            logger.debug("Activator external_id: %s", external_id)
             wallet = await TopWallet.get_balance_by_userid(db, activated_by)
             wallet_balance = wallet['peso']
-            print("Wallet chuchu", wallet_balance)
+            logger.debug("Activator wallet balance: %s", wallet_balance)
 
             activation_amount = 10
 
-            print("motherwallet", MOTHERWALLET)
+            logger.debug("Mother wallet: %s", MOTHERWALLET)
 
             if float(wallet_balance) < activation_amount:
                 return json_response(
@@ -238,24 +306,26 @@ class TopWallet:
 
 
     @staticmethod
-    async def process_member_activation(activation_data: ProcessActivation):
+    async def process_member_activation(activation_data: ProcessActivation, external_ids: list[str] = ()):
         try:
 
-            print("test_t_id", activation_data.Transaction_id)
-            print("test_member_id", activation_data.member_id)
+            logger.debug("Activation transaction_id: %s", activation_data.Transaction_id)
+            logger.debug("Activation member_id: %s", activation_data.member_id)
 
             payload = {
                 "Transaction_id": activation_data.Transaction_id,
                 "otp": activation_data.otp_code
             }
 
-            print("payload_test", payload)
+            logger.debug("Activation payload: %s", payload)
 
             response_data = await TopWallet.call_topwallet_api(
                 f"b2bapi/process_p2ptransfer", payload, method="POST"
             )
             
-            print("response_dataa", response_data)
+            logger.debug("Activation response: %s", response_data)
+
+            await TopWallet.invalidate_balance(*external_ids)
             
             return response_data
 
@@ -297,16 +367,27 @@ class TopWallet:
     
     @staticmethod
     async def get_balance_by_userid(db: AsyncSession, member_id: str):
+        """
+        Peso balance of a member as {"peso": ..., "cached": bool}, the same
+        shape as get_user_balance whether or not the cache was hit.
+        """
         from api.v1.repo.member_repo import MemberRepo
 
         try:
             external_id = await MemberRepo.get_external_id(db, member_id)
 
+            cached = await TopWallet.get_cached_balance(external_id)
+            if cached is not None:
+                return {"peso": cached, "cached": True}
+
             payload = {
                 "userid": external_id
             }
 
-            return await TopWallet.call_topwallet_api('b2bapi/get_balance_by_userid', payload, "POST")
+            response_data = await TopWallet.call_topwallet_api('b2bapi/get_balance_by_userid', payload, "POST")
+            peso = response_data.get("peso", "0")
+            await TopWallet.cache_balance(external_id, peso)
+            return {"peso": peso, "cached": False}
 
         except Exception as e:
             raise e
@@ -318,12 +399,12 @@ class TopWallet:
         from api.v1.repo.member_repo import MemberRepo
 
         member_external_id = await MemberRepo.get_external_id(db, member_id)
-        to_user = await MemberRepo.get_member_by_mobile_number(db, data.to_user)
+        to_user = await MemberRepo.get_wallet_identity_by_mobile_number(db, data.to_user)
 
         if not to_user:
             raise ValueError("Recipient not found.")
 
-        to_user_external_id = await MemberRepo.get_external_id(db, to_user.member_id)
+        _, to_user_external_id = to_user
 
         payload = {
             "from_user": member_external_id,
@@ -332,9 +413,35 @@ class TopWallet:
             "coin": data.coin
         }
 
-        return await TopWallet.call_topwallet_api("b2bapi/initiate_p2ptransfer", payload, "POST")
-    
+        response = await TopWallet.call_topwallet_api("b2bapi/initiate_p2ptransfer", payload, "POST")
+
+        # The process step only carries the transaction id and OTP; remember
+        # the recipient per transaction so its cached balance can be dropped
+        # too, even when the sender has several transfers pending
+        transaction_id = _transaction_id(response)
+        if transaction_id is None:
+            logger.warning("No Transaction_id in P2P initiate response for %s", member_external_id)
+            return response
+
+        try:
+            await redis_client.set(
+                _p2p_recipient_key(transaction_id), to_user_external_id, ex=settings.TW_P2P_PENDING_TTL
+            )
+        except RedisError as e:
+            logger.warning("Could not remember P2P recipient of transaction %s: %s", transaction_id, e)
+
+        return response
+
+    @staticmethod
+    async def get_p2p_recipient(transaction_id: str) -> str | None:
+        """Recipient external_id of an initiated P2P transfer, if still pending."""
+        try:
+            return await redis_client.get(_p2p_recipient_key(transaction_id))
+        except RedisError as e:
+            logger.warning("P2P recipient lookup failed for transaction %s: %s", transaction_id, e)
+            return None
+
 
     @staticmethod
-    async def process_transfer_p2p(data: P2PprocessRequest):
-        return await TopWallet.process_p2p_transfer(data)
+    async def process_transfer_p2p(data: P2PprocessRequest, external_ids: list[str] = ()):
+        return await TopWallet.process_p2p_transfer(data, external_ids)
@@ -0,0 +1,137 @@
+import json
+import logging
+import re
+from typing import AsyncIterator, Optional
+
+from fastapi import Request
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from core.config import settings
+from core.redis import redis_client
+from models.activation_history_models import ActivationHistory
+from models.member_models import MemberDetails
+from utils.extra import format_name
+from utils.responses import json_default
+
+
+logger = logging.getLogger(__name__)
+
+# Capped stream of the events, and the channel that wakes every worker's
+# open connections to read what was added to it
+STREAM_KEY = "activation_feed:events"
+CHANNEL = "activation_feed:live"
+
+_EVENT_ID = re.compile(r"^\d+-\d+$")
+
+
+def _sse(event_id: str, data: str) -> str:
+    return f"id: {event_id}\nevent: activation\ndata: {data}\n\n"
+
+
+class ActivationFeed:
+    @staticmethod
+    async def publish(event: dict):
+        """
+        Append an event to the capped stream and announce it on the live
+        channel. The stream entry ID is the SSE event ID. Redis errors are
+        logged, never raised: the feed must not fail an activation.
+        """
+        data = json.dumps(event, default=json_default)
+        try:
+            event_id = await redis_client.xadd(
+                STREAM_KEY, {"data": data}, maxlen=settings.ACTIVATION_FEED_MAXLEN, approximate=True
+            )
+            await redis_client.publish(CHANNEL, event_id)
+        except RedisError as e:
+            logger.warning("Activation feed publish failed: %s", e)
+
+    @staticmethod
+    async def publish_activation(db: AsyncSession, activation: ActivationHistory, mobile_number: str):
+        """
+        Publish a committed activation in the shape of the dashboard's
+        `today_activations` items.
+        """
+        try:
+            result = await db.execute(select(MemberDetails).where(MemberDetails.member_id == activation.member_id))
+            details = result.scalars().first()
+        except Exception as e:
+            logger.warning("Activation feed could not load member %s: %s", activation.member_id, e)
+            details = None
+
+        await ActivationFeed.publish({
+            "full_name": format_name(details),
+            "amount": activation.amount,
+            "mobile_number": mobile_number,
+            "member_id": activation.member_id,
+            "activated_by": activation.activated_by,
+            "activated_by_role": activation.activated_by_role,
+            "created_at": activation.created_at
+        })
+
+    @staticmethod
+    async def latest_event_id() -> Optional[str]:
+        """ID of the newest event, for clients to resume from after a snapshot."""
+        try:
+            entries = await redis_client.xrevrange(STREAM_KEY, count=1)
+        except RedisError as e:
+            logger.warning("Activation feed lookup failed: %s", e)
+            return None
+        return entries[0][0] if entries else None
+
+    @staticmethod
+    async def events(request: Request, last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        SSE stream of activations. Events after `last_event_id` still in the
+        stream are sent first, then new events as they are published.
+        A comment line is sent after each quiet heartbeat interval so proxies
+        keep the connection open.
+
+        Events are always read from the stream after the last one sent, in
+        stream ID order; channel messages only say that there is something
+        to read. Two workers may publish out of ID order, so delivering the
+        pushed events themselves could skip one. If Redis fails, an `error` event is sent
+        before the stream closes, and the client reconnects with its
+        Last-Event-ID after the retry interval.
+        """
+        pubsub = redis_client.pubsub()
+        # Subscribe before replaying so nothing published in between is lost
+        await pubsub.subscribe(CHANNEL)
+
+        try:
+            yield f"retry: {settings.ACTIVATION_FEED_RETRY_MS}\n\n"
+
+            if last_event_id and _EVENT_ID.match(last_event_id):
+                last = last_event_id
+            else:
+                # New clients only get events published from now on
+                latest = await redis_client.xrevrange(STREAM_KEY, count=1)
+                last = latest[0][0] if latest else "0-0"
+
+            while True:
+                entries = await redis_client.xrange(STREAM_KEY, min=f"({last}")
+                for event_id, fields in entries:
+                    yield _sse(event_id, fields["data"])
+                    last = event_id
+
+                if await request.is_disconnected():
+                    break
+
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=settings.ACTIVATION_FEED_HEARTBEAT_SECONDS
+                )
+                if message is None:
+                    yield ": heartbeat\n\n"
+        except RedisError as e:
+            logger.error("Activation feed stream failed: %s", e, exc_info=True)
+            yield (
+                f"retry: {settings.ACTIVATION_FEED_RETRY_MS}\n"
+                f"event: error\ndata: {json.dumps({'detail': 'Feed unavailable, reconnecting'})}\n\n"
+            )
+        finally:
+            try:
+                await pubsub.unsubscribe(CHANNEL)
+            except RedisError:
+                pass
+            await pubsub.aclose()
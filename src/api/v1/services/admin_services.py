@@ -6,9 +6,10 @@ from utils.responses import json_response
 
 from fastapi import HTTPException, Response
 from api.v1.repo.admin_repo import AdminRepo
-from core.security import verify_password, sign_jwt
+from core.security import verify_password_async, sign_jwt
 
 from api.v1.services.TopWallet import TopWallet
+from api.v1.services.activation_feed import ActivationFeed
 from models.activation_history_models import ActivationHistory
 from models.reward_models import Reward
 from models.wallet_models import Wallet
@@ -19,14 +20,11 @@ from sqlalchemy.future import select
 
 from api.v1.repo.member_repo import MemberRepo
 from api.v1.repo.wallet_repo import WalletRepository
+from api.v1.repo.rewards_repo import RewardRepo
+from api.v1.repo.rollup_repo import RollupRepo
 
 import logging
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler()  # or configure a FileHandler as needed
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
 
 
@@ -70,7 +68,7 @@ class AdminService:
                     "status_code": 401
                 }
 
-            if not verify_password(login_data.password, account.password):
+            if not await verify_password_async(login_data.password, account.password):
                 return {
                     "message": "Invalid username or password",
                     "status_code": 401
@@ -160,11 +158,12 @@ class AdminService:
     async def process_member_activation(db: AsyncSession, activation_data: dict, activated_by: str):
 
         try:
-            response_data = await TopWallet.process_member_activation(activation_data)
+            activator_external_id = await MemberRepo.get_external_id(db, activated_by)
+            response_data = await TopWallet.process_member_activation(activation_data, [activator_external_id])
             # Fetch unilevel referrers
             unilevels = await MemberRepo.get_member_unilevel(db, activation_data.member_id)
 
-            print("response_dataaa", response_data)
+            logger.debug("TopWallet activation response: %s", response_data)
             activation_history = ActivationHistory(
                 member_id=activation_data.member_id,
                 activated_by=activated_by,
@@ -189,14 +188,6 @@ class AdminService:
                 if upline_id:
                     reward_points = unilevel_rewards[level]
 
-                    # Get the upline's current reward points
-                    current_points = await MemberRepo.get_reward_points(db, upline_id)
-                    new_total_points = current_points + reward_points
-
-                    # Update the upline's wallet reward points
-                    await WalletRepository.update_wallet_points(db, upline_id, new_total_points)
-
-
                     # Add reward entry
                     reward_entries.append(Reward(
                         reward_source_type="Member Activation",
@@ -215,14 +206,6 @@ class AdminService:
             # Process activator reward
             activator_reward_points = 25  # Activator gets 25 reward points
 
-            # Get the activator's current reward points
-            activator_current_points = await MemberRepo.get_reward_points(db, activated_by)
-            activator_new_total = activator_current_points + activator_reward_points
-
-            # Update the activator's wallet reward points
-            await WalletRepository.update_wallet_points(db, activated_by, activator_new_total)
-
-
             # Create activator reward entry
             activator_reward = Reward(
                 reward_source_type="Member Activation",
@@ -235,16 +218,28 @@ class AdminService:
                 reference_id=response_data["success"]
             )
 
+            newly_activated = not member.is_activated
+            if newly_activated:
+                await MemberRepo.increment_downline_stats(db, activation_data.member_id, activated=1)
             member.is_activated = True
 
-            # Save all rewards
-            db.add(activator_reward)
-            db.add_all(reward_entries)
+            await RollupRepo.record_activation(
+                db,
+                activation_history.activated_by_role or "CUSTOMER SUPPORT",
+                activation_history.amount,
+                member_activated=newly_activated
+            )
+
+            # Credit all rewards in one batch (wallet points + reward rows)
+            await RewardRepo.credit_rewards(db, [*reward_entries, activator_reward])
+
             db.add(member)
             db.add(activation_history)
             await db.commit()
             await db.refresh(activation_history)
 
+            await ActivationFeed.publish_activation(db, activation_history, member.mobile_number)
+
             return json_response(
                 message="Member activation processed successfully",
                 data=response_data,
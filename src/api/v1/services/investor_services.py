@@ -2,11 +2,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.v1.repo.investor_repo import InvestorRepo
 from api.v1.schemas.investor_schemas import InvestorDashboardResponse
+from api.v1.services.activation_feed import ActivationFeed
 
 class InvestorService:
     @staticmethod
     async def get_dashboard_data(db: AsyncSession, member_id: str) -> InvestorDashboardResponse:
-        return await InvestorRepo.get_dashboard_data(db, member_id)
+        # Read the feed position before the snapshot: resuming the feed from
+        # it may repeat an activation but can never miss one
+        feed_cursor = await ActivationFeed.latest_event_id()
+
+        dashboard = await InvestorRepo.get_dashboard_data(db, member_id)
+        dashboard.activation_feed_cursor = feed_cursor
+        return dashboard
     
     @staticmethod
     async def get_monthly_activation_data(db: AsyncSession) -> list:
@@ -4,10 +4,12 @@ from uuid import uuid4
 from sqlalchemy import select
 
 from typing import Optional
-from api.v1.schemas.member_schemas import MemberCreateSchema, MemberAddressSchema, MemberDetailsSchema, MemberListResponse, WalletResponse, MemberReadSchema, MemberInfoSchema, PurchaseHistorySchema
+from api.v1.schemas.member_schemas import MemberCreateSchema, MemberAddressSchema, MemberDetailsSchema, MemberListResponse, WalletResponse, MemberReadSchema, MemberInfoSchema, PurchaseHistorySchema, DownlineLevelSchema, MemberTeamSchema
 
-from api.v1.repo.member_repo import MemberRepo
+from api.v1.repo.member_repo import MemberRepo, MEMBER_LIST_FIELDS
 from utils.responses import json_response
+from utils.pagination import encode_cursor, decode_cursor, parse_fields
+from core.config import settings
 
 from fastapi import HTTPException
 
@@ -17,11 +19,6 @@ from api.v1.services.TopWallet import TopWallet
 
 import logging
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler() 
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
 
 class MemberService:
@@ -53,7 +50,7 @@ class MemberService:
                 "user_familymember_politician": getattr(member_data.address, "user_familymember_politician", "false"),
             }
             
-            print("address_Dataaa", address_data)
+            logger.debug("Address data: %s", address_data)
             # Call the reusable onboard function
             external_id = await TopWallet.onboard_user_to_topwallet(db, details_data, user_data, address_data)
             if external_id:
@@ -88,63 +85,86 @@ class MemberService:
 
     
     @staticmethod
-    async def get_all_members(db: AsyncSession, is_activated: Optional[bool] = None):
-        # Fetch data from the repository with filtering
-        members = await MemberRepo.get_all_members(db, is_activated)
-
-        if not members:
-            raise HTTPException(status_code=404, detail="No members found")
-
-        formatted_members = [
-            MemberListResponse(
-                user_id=member.user_id,
-                mobile_number=member.mobile_number,
-                status=member.status,
-                is_activated=member.is_activated,
-                is_kyc_verified=member.is_kyc_verified,
-                created_at=member.created_at.isoformat(),
-                updated_at=member.updated_at.isoformat(),
-                community_id = member.community_id,
-                community_name=member.community_name,
-                user_address=MemberAddressSchema(
-                    house_number=member.house_number,
-                    street_name=member.street_name,
-                    barangay=member.barangay,
-                    city=member.city,
-                    province=member.province,
-                    region=member.region
-                ),
-                user_details=MemberDetailsSchema(
-                    first_name=member.first_name,
-                    middle_name=member.middle_name,
-                    last_name=member.last_name,
-                    suffix_name=member.suffix_name
-                ),
-                wallet=WalletResponse(
-                    wallet_balance=member.wallet_balance if member.wallet_balance else 0.0,
-                    reward_points=member.reward_points if member.reward_points else 0.0
-                )
-            )
-            for member in members
-        ]
+    async def get_all_members(
+        db: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        fields: Optional[str] = None,
+        community_id: Optional[str] = None,
+        is_activated: Optional[bool] = None,
+        is_kyc_verified: Optional[bool] = None
+    ):
+        """
+        One page of the member list. Rows are shaped straight into response
+        dicts (no per-row schema objects), keeping only the requested fields.
+        """
+        selected = parse_fields(fields, MEMBER_LIST_FIELDS)
+        after = decode_cursor(cursor) if cursor else None
+
+        # Fetch one extra row to learn whether another page follows
+        rows = await MemberRepo.get_all_members(
+            db, selected, limit + 1, after,
+            community_id=community_id,
+            is_activated=is_activated,
+            is_kyc_verified=is_kyc_verified
+        )
 
-        formatted_members_dict = [member.model_dump() for member in formatted_members]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last.cursor_created_at, last.cursor_member_id)
 
         return json_response(
             message="Members retrieved successfully",
             status_code=200,
-            data=formatted_members_dict
+            data={
+                "members": [MemberService._member_list_item(row, selected) for row in rows],
+                "next_cursor": next_cursor,
+                "limit": limit
+            }
         )
-    
 
+    @staticmethod
+    def _member_list_item(row, fields: set[str]) -> dict:
+        item = {}
+        for field in MEMBER_LIST_FIELDS:
+            if field not in fields:
+                continue
+
+            if field == "user_details":
+                item[field] = {
+                    "first_name": row.first_name,
+                    "middle_name": row.middle_name,
+                    "last_name": row.last_name,
+                    "suffix_name": row.suffix_name
+                }
+            elif field == "user_address":
+                item[field] = {
+                    "house_number": row.house_number,
+                    "street_name": row.street_name,
+                    "barangay": row.barangay,
+                    "city": row.city,
+                    "province": row.province,
+                    "region": row.region
+                }
+            elif field == "wallet":
+                item[field] = {
+                    "wallet_balance": row.wallet_balance if row.wallet_balance else 0.0,
+                    "reward_points": row.reward_points if row.reward_points else 0.0
+                }
+            else:
+                item[field] = getattr(row, field)
+        return item
 
     @staticmethod
     async def get_member_by_id(db: AsyncSession, member_id: str):
         try:
 
             balance = await TopWallet.get_user_balance(db, member_id)
-                    
-            return balance
+
+            # Public response stays the bare peso balance
+            return balance["peso"]
            
         except Exception as e:
             logger.error("Error occurred getting member: %s", e, exc_info=True)
@@ -153,7 +173,7 @@ class MemberService:
     @staticmethod
     async def get_member(db: AsyncSession, member_id: str):
         member_data = await MemberRepo.get_member(db, member_id)
-        print("testtt", member_data)
+        logger.debug("Member data: %s", member_data)
         if not member_data:
             return json_response(
                 message=f"Member with ID {member_id} not found.",
@@ -185,12 +205,13 @@ class MemberService:
                 region=member_data.region
             ) if member_data.house_number else None,
             wallet=WalletResponse(
-                wallet_balance=float(wallet_data),
-                reward_points=member_data.reward_points
+                wallet_balance=float(wallet_data["peso"]),
+                reward_points=member_data.reward_points,
+                balance_cached=wallet_data["cached"]
             ) 
         )
 
-        print("testt", member_schema.dict())
+        logger.debug("Member schema: %s", member_schema)
 
         return json_response(
             message="Member retrieved successfully.",
@@ -215,3 +236,32 @@ class MemberService:
             status=p.status,
             created_at=p.created_at
         ) for p in purchases]
+
+    @staticmethod
+    async def get_member_team(db: AsyncSession, member_id: str, max_level: Optional[int] = None):
+        """
+        Per-level downline and activated-downline counts for a member, read
+        from the incrementally maintained counters.
+        """
+        rows = await MemberRepo.get_downline_stats(db, member_id, max_level)
+
+        levels = [
+            DownlineLevelSchema(
+                level=row.level,
+                total_count=row.total_count,
+                activated_count=row.activated_count
+            ) for row in rows
+        ]
+
+        team = MemberTeamSchema(
+            member_id=member_id,
+            total_count=sum(level.total_count for level in levels),
+            activated_count=sum(level.activated_count for level in levels),
+            levels=levels
+        )
+
+        return json_response(
+            message="Member team retrieved successfully.",
+            status_code=200,
+            data=team.dict()
+        )
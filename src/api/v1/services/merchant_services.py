@@ -23,11 +23,6 @@ load_dotenv()
 
 import logging
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler()  # or configure a FileHandler as needed
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
 MOTHERWALLET = os.getenv("TW_MOTHERWALLET")
 
@@ -139,7 +134,7 @@ class MerchantService:
         try:
             # Fetch customer external ID
             customer = await MemberRepo.get_external_id(db, member_id)
-            print("Customer_external_id", customer)
+            logger.debug("Customer external_id: %s", customer)
 
             # Ensure merchant exists
             await MerchantRepo.get_merchant_by_id(db, merchant_id)
@@ -192,7 +187,13 @@ class MerchantService:
                 otp = data.otp
             )
 
-            response = await TopWallet.process_p2p_transfer(transfer_request)
+            # Money moves between the customer, the mother wallet and the
+            # merchant's account: drop all their cached balances
+            customer_external_id = await MemberRepo.get_external_id(db, member_id)
+            merchant_external_id = await MerchantRepo.get_wallet_external_id(db, merchant_id)
+            response = await TopWallet.process_p2p_transfer(
+                transfer_request, [customer_external_id, MOTHERWALLET, merchant_external_id]
+            )
 
             # save purchase
             purchase_data = MerchantPurchaseCreate(
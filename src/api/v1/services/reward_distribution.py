@@ -0,0 +1,157 @@
+import logging
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.reward_models import Reward
+from models.hub_models import Hub
+from models.community_models import Community
+from models.admin_models import AdminAccount
+
+from api.v1.repo.member_repo import MemberRepo, ADMIN_STAGING
+from api.v1.repo.merchant_repo import MerchantRepo
+from api.v1.repo.rewards_repo import RewardRepo
+from api.v1.schemas.reward_schemas import PurchaseRewardInput
+
+
+logger = logging.getLogger(__name__)
+
+
+BASIS_POINTS = 10_000
+UNILEVEL_DEPTH = 5
+
+# share -> (basis points of the reward pool, recipient kind, reward title)
+SHARES = {
+    "hub": (500, "hub", "Hub Reward"),
+    "community": (500, "community", "Community Reward"),
+    "merchant_direct_referrer": (1500, "member", "Merchant Direct Referrer Reward"),
+    "user": (1000, "member", "Personal Rebate"),
+    "referrer_of_merchant": (1000, "member", "Referrer of Merchant Reward"),
+    "investor": (500, "investor", "Investor Reward"),
+    # Unilevel levels get 80% of 6/5/4/3/2%; the other 20% is the remainder
+    "unilevel_1": (480, "member", "Unilevel Level 1 Reward"),
+    "unilevel_2": (400, "member", "Unilevel Level 2 Reward"),
+    "unilevel_3": (320, "member", "Unilevel Level 3 Reward"),
+    "unilevel_4": (240, "member", "Unilevel Level 4 Reward"),
+    "unilevel_5": (160, "member", "Unilevel Level 5 Reward"),
+    "unilevel_remainder": (400, "member", "Unilevel Remainder"),
+    "admin": (3000, "member", "Admin (Mother Wallet) Share"),
+}
+
+assert sum(bps for bps, _, _ in SHARES.values()) == BASIS_POINTS
+
+
+def to_centavos(amount) -> int:
+    """Round a peso amount to whole centavos (half up)."""
+    return int((Decimal(str(amount)) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def reward_pool_for(amount, discount) -> Decimal:
+    """The reward pool of a purchase: `discount` percent of `amount`."""
+    return Decimal(str(amount)) * Decimal(str(discount or 0)) / 100
+
+
+def split_pool(pool_centavos: int) -> dict[str, int]:
+    """
+    Split a pool into integer centavos per share. Each share is rounded down
+    and the leftover centavos go to the admin share, so the parts always
+    add up to the pool exactly.
+    """
+    parts = {share: pool_centavos * bps // BASIS_POINTS for share, (bps, _, _) in SHARES.items()}
+    parts["admin"] += pool_centavos - sum(parts.values())
+    return parts
+
+
+def _points(centavos: int) -> float:
+    return float(Decimal(centavos) / 100)
+
+
+async def distribute_purchase_rewards(db: AsyncSession, purchases: list[PurchaseRewardInput]) -> list[dict]:
+    """
+    Distribute the reward pools of a batch of purchases.
+
+    Recipients for the whole batch are resolved with a handful of set-based
+    queries; member shares are written as `Reward` rows (with their wallet
+    and ledger credits) and hub, community and investor shares are added to
+    those accounts' reward points. Shares whose recipient cannot be resolved
+    go to the admin staging account. Does not commit, so the caller decides
+    the transaction boundary.
+
+    :return: one summary per purchase with its allocations in pesos.
+    """
+    if not purchases:
+        return []
+
+    member_ids = list({p.member_id for p in purchases})
+    uplines = await MemberRepo.get_uplines(db, member_ids, UNILEVEL_DEPTH)
+    communities = await MemberRepo.get_community_ids(db, member_ids)
+    merchants = await MerchantRepo.get_merchant_reward_recipients(db, list({p.merchant_id for p in purchases}))
+    hubs = await RewardRepo.get_existing_ids(db, Hub.id, {p.hub_id for p in purchases})
+    investors = await RewardRepo.get_existing_ids(
+        db, AdminAccount.id, {p.investor_id for p in purchases}, AdminAccount.account_type == "INVESTOR"
+    )
+
+    rewards = []
+    account_credits = {"hub": defaultdict(int), "community": defaultdict(int), "investor": defaultdict(int)}
+    summaries = []
+
+    for purchase in purchases:
+        merchant = merchants.get(purchase.merchant_id, {})
+        upline = uplines.get(purchase.member_id, {})
+
+        recipients = {
+            "hub": purchase.hub_id if purchase.hub_id in hubs else None,
+            "community": communities.get(purchase.member_id),
+            "merchant_direct_referrer": merchant.get("merchant_direct_referrer"),
+            "user": purchase.member_id,
+            "referrer_of_merchant": merchant.get("referrer_of_merchant"),
+            "investor": purchase.investor_id if purchase.investor_id in investors else None,
+            **{f"unilevel_{depth}": upline.get(depth) for depth in range(1, UNILEVEL_DEPTH + 1)},
+            "unilevel_remainder": ADMIN_STAGING,
+            "admin": ADMIN_STAGING,
+        }
+
+        pool_centavos = to_centavos(purchase.reward_pool)
+        allocations = []
+
+        for share, centavos in split_pool(pool_centavos).items():
+            if not centavos:
+                continue
+
+            _, kind, title = SHARES[share]
+            recipient = recipients[share]
+            if recipient is None:
+                logger.debug("No %s for purchase %s; share goes to admin staging", share, purchase.reference_id)
+                kind, recipient = "member", ADMIN_STAGING
+
+            if kind == "member":
+                rewards.append(Reward(
+                    reward_source_type="Merchant Purchase",
+                    reward_points=_points(centavos),
+                    reward_from=purchase.member_id,
+                    receiver=recipient,
+                    title=title,
+                    description="Reward from a merchant purchase",
+                    status="success",
+                    reference_id=purchase.reference_id
+                ))
+            else:
+                account_credits[kind][recipient] += centavos
+
+            allocations.append({"share": share, "recipient_type": kind, "recipient": recipient, "amount": _points(centavos)})
+
+        summaries.append({
+            "purchase_id": purchase.purchase_id,
+            "reference_id": purchase.reference_id,
+            "reward_pool": _points(pool_centavos),
+            "allocations": allocations
+        })
+
+    await RewardRepo.credit_rewards(db, rewards)
+
+    for kind, key_column in (("hub", Hub.id), ("community", Community.community_id), ("investor", AdminAccount.id)):
+        credits = {recipient: _points(centavos) for recipient, centavos in account_credits[kind].items()}
+        await RewardRepo.credit_account_points(db, key_column, credits)
+
+    return summaries
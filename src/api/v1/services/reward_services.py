@@ -4,8 +4,13 @@ from api.v1.repo.rewards_repo import RewardRepo
 from api.v1.repo.merchant_repo import MerchantRepo
 from api.v1.repo.member_repo import MemberRepo
 
-from api.v1.schemas.reward_schemas import RewardListSchema
-from decimal import Decimal
+from api.v1.schemas.reward_schemas import RewardListSchema, PurchaseRewardInput
+from api.v1.services.reward_distribution import distribute_purchase_rewards
+
+from fastapi import HTTPException
+
+import logging
+logger = logging.getLogger(__name__)
 
 class RewardService:
     @staticmethod
@@ -25,46 +30,35 @@ class RewardService:
 
     @staticmethod
     async def distribute_rewards(db: AsyncSession, reward_pool: float, member_id: str, merchant_id: str, investor_id: str, hub_id: str, reference_id: str):
- 
-
-            get_merchant_referrer_member_id = await MerchantRepo.get_merchant_referrer_member_id(db, merchant_id)
-
-            get_direct_referrer_member_id_of_merchant = await MerchantRepo.get_direct_referrer_member_id_of_merchant(db, merchant_id)
-
-            member = await MemberRepo.get_member_by_id(db, member_id)
-
-            member_id = member.member_id
-            member_community = member.community_id
+        """
+        Distribute one purchase's reward pool and commit it in one transaction.
+        """
+        summaries = await RewardService.distribute_purchase_rewards(db, [
+            PurchaseRewardInput(
+                reward_pool=reward_pool,
+                member_id=member_id,
+                merchant_id=merchant_id,
+                investor_id=investor_id,
+                hub_id=hub_id,
+                reference_id=reference_id
+            )
+        ])
+        return summaries[0]
 
-            unilevel_5 = await MemberRepo.get_member_unilevel_5(db, member_id)
-
-            print("get_direct_referrer_member_id_of_merchant", get_direct_referrer_member_id_of_merchant)
-            print("get_merchant_referrer_member_id", get_merchant_referrer_member_id)
-            print("member_id", member_id)
-            print("member_community", member_community)
-            print("Unilevel 5 levels", unilevel_5)
-
-            print(f"Reward Pooool: {reward_pool}")
-
-            distribution = {
-                "Hub": Decimal(reward_pool) * Decimal('0.05'), 
-                "Community": Decimal(reward_pool) * Decimal('0.05'), 
-
-                # first level of merchant owner
-                "Merchant Direct Referrer": Decimal(reward_pool) * Decimal('0.15'), # direct referrer of user ( first level )
-                "User": Decimal(reward_pool) * Decimal('0.1'), # personal rebate
-                "Referrer of Merchant": Decimal(reward_pool) * Decimal('0.1'), # referrer of the merchant
-                "Investor": Decimal(reward_pool) * Decimal('0.05'),
-                "Unilevel Referral": {
-                    "Level 1": Decimal(reward_pool) * Decimal('0.06') * Decimal('0.8'),
-                    "Level 2": Decimal(reward_pool) * Decimal('0.05') * Decimal('0.8'),
-                    "Level 3": Decimal(reward_pool) * Decimal('0.04') * Decimal('0.8'),
-                    "Level 4": Decimal(reward_pool) * Decimal('0.03') * Decimal('0.8'),
-                    "Level 5": Decimal(reward_pool) * Decimal('0.02') * Decimal('0.8'),
-                },
-                "Unilevel Remainder to MotherWallet": Decimal(reward_pool) * Decimal('0.04'),
-                # change admin_amount to reward_pool
-                "Admin (Mother Wallet)": Decimal(reward_pool) * Decimal('0.3'),
-            }
-
-            print(f"Distribution: {distribution}")
\ No newline at end of file
+    @staticmethod
+    async def distribute_purchase_rewards(db: AsyncSession, purchases: list[PurchaseRewardInput]):
+        """
+        Distribute the reward pools of several purchases in one transaction.
+        """
+        try:
+            summaries = await distribute_purchase_rewards(db, purchases)
+            await db.commit()
+            return summaries
+
+        except HTTPException:
+            await db.rollback()
+            raise
+        except Exception as e:
+            await db.rollback()
+            logger.error("Error distributing merchant purchase rewards: %s", e, exc_info=True)
+            raise HTTPException(status_code=500, detail="Failed to distribute rewards")
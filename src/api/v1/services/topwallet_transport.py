@@ -0,0 +1,321 @@
+import asyncio
+import json
+import random
+import time
+import logging
+from collections import deque, defaultdict
+
+import aiohttp
+from fastapi import HTTPException
+
+from core.config import settings
+from core.metrics import topwallet_request_duration
+
+
+logger = logging.getLogger(__name__)
+
+
+# Read-only TopWallet calls: safe to retry, and identical concurrent calls
+# are coalesced into one upstream request.
+IDEMPOTENT_ENDPOINTS = {
+    "b2bapi/get_profile",
+    "b2bapi/get_balance_by_userid",
+    "b2bapi/get_banks_list",
+}
+
+# Per-endpoint (connect, read) deadlines in seconds; everything else uses
+# TW_CONNECT_TIMEOUT / TW_READ_TIMEOUT from settings.
+ENDPOINT_TIMEOUTS = {
+    "b2bapi/get_profile": (2.0, 5.0),
+    "b2bapi/get_balance_by_userid": (2.0, 5.0),
+    "b2bapi/get_banks_list": (2.0, 5.0),
+    "b2bapi/user_on_board": (3.0, 30.0),
+    "b2bapi/user_kyc_by_id": (3.0, 30.0),
+}
+
+
+def endpoint_name(endpoint: str) -> str:
+    """
+    Normalize an endpoint to its "b2bapi/<action>" name, dropping slashes and
+    path parameters (e.g. "b2bapi/user_kyc_by_id/<id>" -> "b2bapi/user_kyc_by_id").
+    """
+    return "/".join(endpoint.strip("/").split("/")[:2])
+
+
+class _RetryableError(Exception):
+    """
+    Upstream failure that counts against the breaker and may be retried:
+    timeouts, connection errors, 5xx, 429 and unreadable 200 responses.
+    """
+
+    def __init__(self, status_code: int, detail):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls into one in-flight task.
+
+    The shared call runs as its own task, so a caller that is cancelled
+    (e.g. client disconnect) does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[tuple, asyncio.Task] = {}
+
+    async def do(self, key: tuple, fn) -> tuple:
+        """Run `fn()` or join the in-flight call for `key`; returns (result, shared)."""
+        task = self._in_flight.get(key)
+        shared = task is not None
+
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+
+        return await asyncio.shield(task), shared
+
+    def _finish(self, key: tuple, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved even if every waiter went away.
+        if not task.cancelled():
+            task.exception()
+
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker.
+
+    CLOSED: calls flow; once at least `min_calls` outcomes are recorded and the
+    failure rate in the last `window` calls reaches `failure_rate`, it OPENs.
+    OPEN: calls fail fast until `open_seconds` have passed, then HALF_OPEN.
+    HALF_OPEN: a single probe call is allowed; success closes, failure reopens.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, window: int, min_calls: int, failure_rate: float, open_seconds: float):
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._outcomes = deque(maxlen=window)
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                return False
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+
+        return True
+
+    def record_success(self):
+        if self.state == self.HALF_OPEN:
+            logger.info("TopWallet circuit breaker closed after successful probe.")
+            self.state = self.CLOSED
+            self._outcomes.clear()
+            self._probe_in_flight = False
+        self._outcomes.append(True)
+
+    def record_failure(self):
+        if self.state == self.HALF_OPEN:
+            self._open()
+            return
+
+        self._outcomes.append(False)
+        if len(self._outcomes) >= self.min_calls and self.error_rate() >= self.failure_rate:
+            self._open()
+
+    def release_probe(self):
+        """Free the half-open probe slot when a call ends without an outcome (e.g. cancelled)."""
+        self._probe_in_flight = False
+
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def _open(self):
+        logger.warning("TopWallet circuit breaker opened (error rate %.2f).", self.error_rate())
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        self._outcomes.clear()
+        self._probe_in_flight = False
+
+
+class TopWalletTransport:
+    """
+    HTTP transport under `TopWallet.call_topwallet_api`.
+
+    Applies per-endpoint connect/read deadlines, retries idempotent calls with
+    jittered exponential backoff, and fails fast through a circuit breaker
+    while TopWallet's error rate is above threshold.
+    """
+
+    def __init__(self):
+        self.breaker = CircuitBreaker(
+            window=settings.TW_BREAKER_WINDOW,
+            min_calls=settings.TW_BREAKER_MIN_CALLS,
+            failure_rate=settings.TW_BREAKER_FAILURE_RATE,
+            open_seconds=settings.TW_BREAKER_OPEN_SECONDS,
+        )
+        self.calls = defaultdict(int)
+        self.failures = defaultdict(int)
+        self.retries = defaultdict(int)
+        self.short_circuited = defaultdict(int)
+        self.coalesced = defaultdict(int)
+        self.single_flight = SingleFlight()
+
+    @staticmethod
+    def timeout_for(name: str) -> aiohttp.ClientTimeout:
+        connect, read = ENDPOINT_TIMEOUTS.get(name, (settings.TW_CONNECT_TIMEOUT, settings.TW_READ_TIMEOUT))
+        return aiohttp.ClientTimeout(total=None, connect=connect, sock_read=read)
+
+    @staticmethod
+    def backoff(attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt (0-based)."""
+        ceiling = min(settings.TW_RETRY_MAX_DELAY, settings.TW_RETRY_BASE_DELAY * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def send(self, session: aiohttp.ClientSession, method: str, endpoint: str, url: str, payload: dict, headers: dict) -> dict:
+        """
+        Send one logical TopWallet call, retrying only idempotent endpoints.
+        Concurrent identical read-only calls (same endpoint and payload) share
+        a single upstream request and all receive its result.
+
+        :raises HTTPException: 503 when the breaker is open, 504 on timeout,
+            502 on connection errors, or the upstream status on non-200 responses.
+        """
+        name = endpoint_name(endpoint)
+        if name not in IDEMPOTENT_ENDPOINTS:
+            return await self._send(session, method, name, url, payload, headers)
+
+        key = (method.lower(), name, json.dumps(payload, sort_keys=True, default=str))
+        result, shared = await self.single_flight.do(
+            key, lambda: self._send(session, method, name, url, payload, headers)
+        )
+        if shared:
+            self.coalesced[name] += 1
+        return result
+
+    async def _send(self, session: aiohttp.ClientSession, method: str, name: str, url: str, payload: dict, headers: dict) -> dict:
+        method = method.lower()
+        if method == "post":
+            request_kwargs = {"json": payload}
+        elif method == "get":
+            request_kwargs = {"params": payload}
+        else:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+
+        attempts = 1 + settings.TW_MAX_RETRIES if name in IDEMPOTENT_ENDPOINTS else 1
+
+        for attempt in range(attempts):
+            if not self.breaker.allow_request():
+                self.short_circuited[name] += 1
+                logger.warning("TopWallet circuit open; rejecting call to %s", name)
+                raise HTTPException(status_code=503, detail="TopWallet is temporarily unavailable")
+
+            self.calls[name] += 1
+            try:
+                result = await self._send_once(session, method, name, url, headers, request_kwargs)
+            except _RetryableError as e:
+                self.failures[name] += 1
+                self.breaker.record_failure()
+
+                if attempt + 1 < attempts:
+                    self.retries[name] += 1
+                    delay = self.backoff(attempt)
+                    logger.warning("Retrying TopWallet %s in %.2fs after error: %s", name, delay, e.detail)
+                    await asyncio.sleep(delay)
+                    continue
+
+                raise HTTPException(status_code=e.status_code, detail=e.detail)
+            except HTTPException:
+                # Upstream answered with a business (4xx) error: it is healthy.
+                self.breaker.record_success()
+                raise
+            except asyncio.CancelledError:
+                self.breaker.release_probe()
+                raise
+
+            self.breaker.record_success()
+            return result
+
+    async def _send_once(self, session: aiohttp.ClientSession, method: str, name: str, url: str, headers: dict, request_kwargs: dict) -> dict:
+        """One HTTP attempt, timed into topwallet_request_duration_seconds by status."""
+        start = time.perf_counter()
+        outcome = "cancelled"
+        try:
+            result = await self._request(session, method, name, url, headers, request_kwargs)
+            outcome = "200"
+            return result
+        except (_RetryableError, HTTPException) as e:
+            outcome = str(e.status_code)
+            raise
+        finally:
+            topwallet_request_duration.observe(time.perf_counter() - start, endpoint=name, outcome=outcome)
+
+    async def _request(self, session: aiohttp.ClientSession, method: str, name: str, url: str, headers: dict, request_kwargs: dict) -> dict:
+        try:
+            async with session.request(method, url, headers=headers, timeout=self.timeout_for(name), **request_kwargs) as response:
+                status = response.status
+                response_text = await response.text()
+                if status != 200:
+                    logger.error("TopWallet API request failed with status %s: %s", status, response_text)
+                    detail = response_text
+                    if method == "get":
+                        try:
+                            detail = await response.json()
+                        except Exception:
+                            detail = {}
+                    if status >= 500 or status == 429:
+                        raise _RetryableError(status, detail)
+                    raise HTTPException(status_code=status, detail=detail)
+                try:
+                    return await response.json()
+                except Exception as e:
+                    # e.g. a proxy's maintenance page: TopWallet itself did not answer
+                    logger.error("Error parsing TopWallet API response: %s", e, exc_info=True)
+                    raise _RetryableError(500, "Error parsing TopWallet API response")
+
+        except asyncio.TimeoutError:
+            logger.error("TopWallet %s timed out", name)
+            raise _RetryableError(504, "TopWallet request timed out")
+        except aiohttp.ClientError as e:
+            logger.error("TopWallet %s connection error: %s", name, e)
+            raise _RetryableError(502, "TopWallet connection error")
+
+    def stats(self) -> dict:
+        """Breaker state and per-endpoint call/failure/retry counters."""
+        return {
+            "breaker": {
+                "state": self.breaker.state,
+                "error_rate": round(self.breaker.error_rate(), 4),
+                "times_opened": self.breaker.times_opened,
+            },
+            "calls": dict(self.calls),
+            "failures": dict(self.failures),
+            "retries": dict(self.retries),
+            "short_circuited": dict(self.short_circuited),
+            "coalesced": dict(self.coalesced),
+        }
+
+
+transport = TopWalletTransport()
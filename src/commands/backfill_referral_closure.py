@@ -0,0 +1,76 @@
+"""
+One-time backfill of `referral_closure` from the existing `referrals` rows.
+
+Run from the `src` directory after applying the migration:
+
+    python -m commands.backfill_referral_closure
+
+The table is rebuilt from scratch inside a single transaction, so the
+command is safe to re-run.
+"""
+import asyncio
+import logging
+
+from sqlalchemy import delete, insert, select, literal
+
+from core.database import AsyncSessionLocal
+from models import (
+    community_models,
+    member_models,
+    hub_models,
+    investor_models,
+    admin_models,
+    wallet_models,
+    referral_models,
+    merchant_models,
+    activation_history_models,
+    reward_models,
+    rollup_models
+)
+from models.member_models import Member
+from models.referral_models import Referral, ReferralClosure
+
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Guards against a cycle in `referrals` looping forever
+MAX_DEPTH = 1000
+
+
+async def backfill_referral_closure():
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(ReferralClosure))
+
+        # Every member is its own ancestor at depth 0
+        result = await db.execute(
+            insert(ReferralClosure).from_select(
+                ["ancestor", "descendant", "depth"],
+                select(Member.member_id, Member.member_id, literal(0))
+            )
+        )
+        logger.info("depth 0: %s rows", result.rowcount)
+
+        # Extend every path one referral deeper until no new rows appear.
+        # IGNORE skips duplicate referral rows for the same member.
+        depth = 0
+        while depth < MAX_DEPTH:
+            result = await db.execute(
+                insert(ReferralClosure).prefix_with("IGNORE", dialect="mysql").from_select(
+                    ["ancestor", "descendant", "depth"],
+                    select(ReferralClosure.ancestor, Referral.referred_member, ReferralClosure.depth + 1)
+                    .join(Referral, Referral.referred_by == ReferralClosure.descendant)
+                    .where(ReferralClosure.depth == depth)
+                )
+            )
+            depth += 1
+            logger.info("depth %s: %s rows", depth, result.rowcount)
+            if not result.rowcount:
+                break
+
+        await db.commit()
+        logger.info("referral_closure backfill complete (max depth %s).", depth - 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_referral_closure())
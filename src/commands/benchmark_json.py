@@ -0,0 +1,113 @@
+"""
+Benchmark the response encoders on payloads shaped like `/member/all` and
+`/reward/`.
+
+Run from the `src` directory:
+
+    python -m commands.benchmark_json --rows 5000 --repeat 20
+
+For each payload it times the previous path (pre-converting values by hand
+or through FastAPI's `jsonable_encoder`, then Starlette's stdlib
+`JSONResponse`) against `StdJSONResponse` and `ORJSONResponse` on the raw
+values. No database is needed; rows are synthetic.
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from utils.responses import StdJSONResponse, ORJSONResponse, orjson
+
+
+def member_rows(count: int) -> list[dict]:
+    created = datetime(2025, 1, 1)
+    return [
+        {
+            "user_id": str(uuid4()),
+            "mobile_number": f"9{n:09d}",
+            "status": n % 3 != 0,
+            "is_activated": n % 3 != 0,
+            "is_kyc_verified": True,
+            "community_id": str(uuid4()),
+            "community_name": f"Community {n % 50}",
+            "created_at": created + timedelta(minutes=n),
+            "updated_at": created + timedelta(minutes=n, seconds=30),
+            "user_details": {"first_name": "JUAN", "middle_name": "SANTOS", "last_name": f"DELA CRUZ {n}", "suffix_name": None},
+            "user_address": {
+                "house_number": str(n), "street_name": "RIZAL ST", "barangay": "POBLACION",
+                "city": "MAKATI", "province": "METRO MANILA", "region": "NCR",
+            },
+            "wallet": {"wallet_balance": 0.0, "reward_points": round(n * 1.25, 2)},
+        }
+        for n in range(count)
+    ]
+
+
+def reward_rows(count: int) -> list[dict]:
+    created = datetime(2025, 1, 1)
+    return [
+        {
+            "id": str(uuid4()),
+            "title": "Unilevel First Level Reward",
+            "reward_source_type": "Member Activation",
+            "description": "Reward for successfully activating a member",
+            "reward_points": 40.0,
+            "status": "success",
+            "reference_id": str(uuid4()),
+            "created_at": created + timedelta(minutes=n),
+            "updated_at": created + timedelta(minutes=n),
+            "reward_from": {"member_id": str(uuid4()), "full_name": "JUAN SANTOS DELA CRUZ"},
+            "receiver": {"member_id": str(uuid4()), "full_name": "MARIA REYES"},
+        }
+        for n in range(count)
+    ]
+
+
+def preconverted(rows: list[dict]) -> list[dict]:
+    """The old /member/all path: datetimes turned into strings before encoding."""
+    return [
+        {**row, "created_at": row["created_at"].isoformat(), "updated_at": row["updated_at"].isoformat()}
+        for row in rows
+    ]
+
+
+def timed(fn, repeat: int) -> float:
+    """Median wall time of `fn()` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(rows: int, repeat: int):
+    payloads = {
+        "/member/all": (member_rows(rows), lambda data: JSONResponse(preconverted(data))),
+        "/reward/": (reward_rows(rows), lambda data: JSONResponse(jsonable_encoder(data))),
+    }
+
+    print(f"{rows} rows, median of {repeat} runs")
+    for endpoint, (data, old_path) in payloads.items():
+        baseline = timed(lambda: old_path(data), repeat)
+        results = [("previous (stdlib JSONResponse)", baseline)]
+        results.append(("StdJSONResponse", timed(lambda: StdJSONResponse(data), repeat)))
+        if orjson is not None:
+            results.append(("ORJSONResponse", timed(lambda: ORJSONResponse(data), repeat)))
+
+        print(f"\n{endpoint}")
+        for name, ms in results:
+            print(f"  {name:<32} {ms:9.2f} ms   x{baseline / ms:5.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JSON response encoder benchmark")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.rows, args.repeat)
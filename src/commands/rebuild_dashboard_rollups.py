@@ -0,0 +1,121 @@
+"""
+Rebuild the dashboard rollups (`daily_rollups`, `monthly_rollups` and
+`activation_rollups`) from `members`, `merchants`, `communities` and
+`activation_history`.
+
+Run from the `src` directory after applying the migration, and whenever the
+rollups need repairing:
+
+    python -m commands.rebuild_dashboard_rollups
+
+Everything is recomputed from scratch inside a single transaction, so the
+command is safe to re-run. Activated members are counted on the day of their
+activation, or on their creation day if they have no activation record.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+
+from sqlalchemy import delete, insert, select, func, case
+
+from core.database import AsyncSessionLocal
+from models import (
+    community_models,
+    member_models,
+    hub_models,
+    investor_models,
+    admin_models,
+    wallet_models,
+    referral_models,
+    merchant_models,
+    activation_history_models,
+    reward_models,
+    rollup_models
+)
+from models.member_models import Member
+from models.merchant_models import Merchant
+from models.community_models import Community
+from models.activation_history_models import ActivationHistory
+from models.rollup_models import DailyRollup, MonthlyRollup, ActivationRollup
+from api.v1.repo.rollup_repo import ROLLUP_COUNTERS, ACTIVATION_REWARDS, ACTIVATOR_EARNING, ACTIVATOR_EARNING_AMOUNT
+
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def daily_counts(db) -> dict:
+    """{day: {counter: value}} for every day that has at least one event."""
+    activation_day = func.date(func.coalesce(ActivationHistory.created_at, Member.created_at))
+    net_amount = (
+        ActivationHistory.amount
+        - ACTIVATION_REWARDS
+        - case((ActivationHistory.amount == ACTIVATOR_EARNING_AMOUNT, ACTIVATOR_EARNING), else_=0)
+    )
+
+    queries = {
+        ("members_created",): select(func.date(Member.created_at), func.count()).group_by(func.date(Member.created_at)),
+        ("members_activated",): (
+            select(activation_day, func.count())
+            .select_from(Member)
+            .outerjoin(ActivationHistory, ActivationHistory.member_id == Member.member_id)
+            .where(Member.is_activated == True)
+            .group_by(activation_day)
+        ),
+        ("merchants_created",): select(func.date(Merchant.created_at), func.count()).group_by(func.date(Merchant.created_at)),
+        ("communities_created",): select(func.date(Community.created_at), func.count()).group_by(func.date(Community.created_at)),
+        ("activations", "activation_amount", "activation_net_amount"): (
+            select(
+                func.date(ActivationHistory.created_at),
+                func.count(),
+                func.sum(ActivationHistory.amount),
+                func.sum(net_amount)
+            )
+            .group_by(func.date(ActivationHistory.created_at))
+        ),
+    }
+
+    days = defaultdict(lambda: dict.fromkeys(ROLLUP_COUNTERS, 0))
+    for counters, query in queries.items():
+        for day, *values in (await db.execute(query)).all():
+            if day is None:
+                continue
+            for counter, value in zip(counters, values):
+                days[day][counter] += value or 0
+
+    return days
+
+
+async def rebuild_dashboard_rollups():
+    async with AsyncSessionLocal() as db:
+        for model in (DailyRollup, MonthlyRollup, ActivationRollup):
+            await db.execute(delete(model))
+
+        days = await daily_counts(db)
+
+        months = defaultdict(lambda: dict.fromkeys(ROLLUP_COUNTERS, 0))
+        for day, counts in days.items():
+            for counter, value in counts.items():
+                months[(day.year, day.month)][counter] += value
+
+        if days:
+            await db.execute(insert(DailyRollup), [{"day": day, **counts} for day, counts in days.items()])
+            await db.execute(
+                insert(MonthlyRollup),
+                [{"year": year, "month": month, **counts} for (year, month), counts in months.items()]
+            )
+
+        role = func.coalesce(ActivationHistory.activated_by_role, "CUSTOMER SUPPORT")
+        await db.execute(
+            insert(ActivationRollup).from_select(
+                ["activated_by_role", "amount", "count"],
+                select(role, ActivationHistory.amount, func.count()).group_by(role, ActivationHistory.amount)
+            )
+        )
+
+        await db.commit()
+        logger.info("Dashboard rollups rebuilt: %s days, %s months", len(days), len(months))
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_dashboard_rollups())
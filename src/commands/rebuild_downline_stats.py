@@ -0,0 +1,62 @@
+"""
+Rebuild `member_downline_stats` from `referral_closure` and `members`.
+
+Run from the `src` directory after the referral closure is populated:
+
+    python -m commands.rebuild_downline_stats
+
+The counters are recomputed from scratch inside a single transaction, so the
+command is safe to re-run (e.g. to repair drift).
+"""
+import asyncio
+import logging
+
+from sqlalchemy import delete, insert, select, func, case
+
+from core.database import AsyncSessionLocal
+from models import (
+    community_models,
+    member_models,
+    hub_models,
+    investor_models,
+    admin_models,
+    wallet_models,
+    referral_models,
+    merchant_models,
+    activation_history_models,
+    reward_models,
+    rollup_models
+)
+from models.member_models import Member
+from models.referral_models import ReferralClosure, MemberDownlineStats
+
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_downline_stats():
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(MemberDownlineStats))
+
+        result = await db.execute(
+            insert(MemberDownlineStats).from_select(
+                ["member_id", "level", "total_count", "activated_count"],
+                select(
+                    ReferralClosure.ancestor,
+                    ReferralClosure.depth,
+                    func.count(),
+                    func.sum(case((Member.is_activated == True, 1), else_=0))
+                )
+                .join(Member, Member.member_id == ReferralClosure.descendant)
+                .where(ReferralClosure.depth >= 1)
+                .group_by(ReferralClosure.ancestor, ReferralClosure.depth)
+            )
+        )
+
+        await db.commit()
+        logger.info("member_downline_stats rebuilt: %s rows", result.rowcount)
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_downline_stats())
@@ -0,0 +1,173 @@
+"""
+Maintenance for the append-only reward ledger.
+
+Run from the `src` directory:
+
+    python -m commands.reward_ledger backfill    # copy rewards rows missing from the ledger
+    python -m commands.reward_ledger compact     # write balance snapshots for long tails
+    python -m commands.reward_ledger reconcile   # compare ledger balances with Wallet.reward_points
+
+The migration that creates the ledger already copies existing rewards in;
+`backfill` picks up any written without a ledger entry since (e.g. by
+instances still on the old code during a rolling deploy). It skips rewards
+already in the ledger and `compact` only snapshots members whose tail has
+grown, so both are safe to re-run (e.g. nightly).
+`reconcile` exits with status 1 when any wallet disagrees with the ledger.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import timedelta
+
+from sqlalchemy import and_, func, insert, literal, select
+
+from core.config import settings
+from core.database import AsyncSessionLocal
+from models import (
+    community_models,
+    member_models,
+    hub_models,
+    investor_models,
+    admin_models,
+    wallet_models,
+    referral_models,
+    merchant_models,
+    activation_history_models,
+    reward_models,
+    rollup_models
+)
+from models.member_models import MemberWallet
+from models.reward_models import Reward, RewardLedger, RewardBalanceSnapshot
+from models.wallet_models import Wallet
+
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Differences below this are float noise, not drift
+RECONCILE_TOLERANCE = 0.005
+
+
+def latest_snapshots():
+    """Each member's most recent snapshot as (member_id, last_seq, balance, entry_count)."""
+    latest = (
+        select(RewardBalanceSnapshot.member_id, func.max(RewardBalanceSnapshot.last_seq).label("last_seq"))
+        .group_by(RewardBalanceSnapshot.member_id)
+        .subquery()
+    )
+    return (
+        select(
+            RewardBalanceSnapshot.member_id,
+            RewardBalanceSnapshot.last_seq,
+            RewardBalanceSnapshot.balance,
+            RewardBalanceSnapshot.entry_count
+        )
+        .join(latest, and_(
+            RewardBalanceSnapshot.member_id == latest.c.member_id,
+            RewardBalanceSnapshot.last_seq == latest.c.last_seq
+        ))
+        .subquery()
+    )
+
+
+def ledger_tails(snapshots, up_to_seq=None):
+    """Per-member sum and count of ledger entries after their latest snapshot."""
+    query = (
+        select(
+            RewardLedger.member_id,
+            func.sum(RewardLedger.points).label("points"),
+            func.count().label("entries")
+        )
+        .outerjoin(snapshots, snapshots.c.member_id == RewardLedger.member_id)
+        .where(RewardLedger.seq > func.coalesce(snapshots.c.last_seq, 0))
+        .group_by(RewardLedger.member_id)
+    )
+    if up_to_seq is not None:
+        query = query.where(RewardLedger.seq <= up_to_seq)
+    return query.subquery()
+
+
+async def backfill():
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            insert(RewardLedger).from_select(
+                ["member_id", "reward_id", "points"],
+                select(Reward.receiver, Reward.id, Reward.reward_points)
+                .where(~select(RewardLedger.seq).where(RewardLedger.reward_id == Reward.id).exists())
+                .order_by(Reward.created_at, Reward.id)
+            )
+        )
+        await db.commit()
+        logger.info("reward_ledger backfill: %s rewards appended", result.rowcount)
+
+
+async def compact():
+    async with AsyncSessionLocal() as db:
+        # Entries that may still belong to an open transaction (a lower seq
+        # committing after a higher one) are left for the next run.
+        now = (await db.execute(select(func.now()))).scalar()
+        horizon = now - timedelta(seconds=settings.REWARD_SNAPSHOT_LAG_SECONDS)
+        cutoff = (await db.execute(
+            select(func.max(RewardLedger.seq)).where(RewardLedger.created_at <= horizon)
+        )).scalar()
+        if cutoff is None:
+            logger.info("reward_ledger compact: nothing to snapshot")
+            return
+
+        snapshots = latest_snapshots()
+        tails = ledger_tails(snapshots, up_to_seq=cutoff)
+
+        result = await db.execute(
+            insert(RewardBalanceSnapshot).from_select(
+                ["member_id", "last_seq", "balance", "entry_count"],
+                select(
+                    tails.c.member_id,
+                    literal(cutoff),
+                    func.coalesce(snapshots.c.balance, 0) + tails.c.points,
+                    func.coalesce(snapshots.c.entry_count, 0) + tails.c.entries
+                )
+                .outerjoin(snapshots, snapshots.c.member_id == tails.c.member_id)
+                .where(tails.c.entries >= settings.REWARD_SNAPSHOT_MIN_TAIL)
+            )
+        )
+        await db.commit()
+        logger.info("reward_ledger compact: %s snapshots written at seq %s", result.rowcount, cutoff)
+
+
+async def reconcile() -> int:
+    async with AsyncSessionLocal() as db:
+        snapshots = latest_snapshots()
+        tails = ledger_tails(snapshots)
+        ledger_balance = func.coalesce(snapshots.c.balance, 0) + func.coalesce(tails.c.points, 0)
+
+        result = await db.execute(
+            select(MemberWallet.member_id, Wallet.reward_points, ledger_balance.label("ledger_balance"))
+            .join(Wallet, Wallet.wallet_id == MemberWallet.wallet_id)
+            .outerjoin(snapshots, snapshots.c.member_id == MemberWallet.member_id)
+            .outerjoin(tails, tails.c.member_id == MemberWallet.member_id)
+            .where(func.abs(Wallet.reward_points - ledger_balance) > RECONCILE_TOLERANCE)
+            .order_by(MemberWallet.member_id)
+        )
+        mismatches = result.all()
+
+    for row in mismatches:
+        logger.warning(
+            "member %s: wallet %.2f, ledger %.2f (diff %+.2f)",
+            row.member_id, row.reward_points, row.ledger_balance, row.reward_points - row.ledger_balance
+        )
+    logger.info("reward_ledger reconcile: %s mismatched wallets", len(mismatches))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reward ledger maintenance")
+    parser.add_argument("action", choices=["backfill", "compact", "reconcile"])
+    args = parser.parse_args()
+
+    if args.action == "backfill":
+        asyncio.run(backfill())
+    elif args.action == "compact":
+        asyncio.run(compact())
+    else:
+        sys.exit(asyncio.run(reconcile()))
@@ -0,0 +1,79 @@
+"""
+Nightly settlement of merchant purchase rewards.
+
+Run from the `src` directory:
+
+    python -m commands.settle_merchant_rewards
+
+Successful purchases without `rewards_settled_at` are processed in batches of
+MERCHANT_SETTLEMENT_BATCH_SIZE. Each batch distributes its reward pools
+(`discount` percent of the amount) and flags the purchases in one
+transaction, so a failed or interrupted run can simply be re-run. Concurrent
+runs skip each other's locked rows. Purchases that succeeded before this
+command existed were marked settled by the migration that added the column,
+so only purchases made since are paid out.
+
+Purchases carry no hub or investor, so those shares go to the admin staging
+account like any other unresolved share.
+"""
+import asyncio
+import logging
+
+from core.config import settings
+from core.database import AsyncSessionLocal
+from models import (
+    community_models,
+    member_models,
+    hub_models,
+    investor_models,
+    admin_models,
+    wallet_models,
+    referral_models,
+    merchant_models,
+    activation_history_models,
+    reward_models,
+    rollup_models
+)
+from api.v1.repo.merchant_repo import MerchantRepo
+from api.v1.schemas.reward_schemas import PurchaseRewardInput
+from api.v1.services.reward_distribution import distribute_purchase_rewards, reward_pool_for
+
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def settle_merchant_rewards():
+    settled = 0
+    distributed = 0.0
+
+    while True:
+        async with AsyncSessionLocal() as db:
+            rows = await MerchantRepo.get_unsettled_purchases(db, settings.MERCHANT_SETTLEMENT_BATCH_SIZE)
+            if not rows:
+                break
+
+            purchases = [
+                PurchaseRewardInput(
+                    reward_pool=reward_pool_for(purchase.amount, discount),
+                    member_id=purchase.member_id,
+                    merchant_id=purchase.merchant_id,
+                    reference_id=purchase.reference_id,
+                    purchase_id=purchase.purchase_id
+                )
+                for purchase, discount in rows
+            ]
+
+            summaries = await distribute_purchase_rewards(db, purchases)
+            await MerchantRepo.mark_purchases_settled(db, [p.purchase_id for p in purchases])
+            await db.commit()
+
+        settled += len(purchases)
+        distributed += sum(summary["reward_pool"] for summary in summaries)
+        logger.info("Settled %s purchases (%s so far)", len(purchases), settled)
+
+    logger.info("Merchant reward settlement complete: %s purchases, %.2f distributed", settled, distributed)
+
+
+if __name__ == "__main__":
+    asyncio.run(settle_merchant_rewards())
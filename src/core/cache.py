@@ -0,0 +1,108 @@
+import json
+import time
+import logging
+from collections import OrderedDict
+
+from redis.exceptions import RedisError
+
+from core.redis import redis_client
+
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Small in-process LRU with a per-entry TTL.
+
+    The TTL bounds how long a worker can serve an entry that another worker
+    has invalidated in Redis.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key, default=None):
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            return default
+
+        value, expires_at = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._data[key] = (value, time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, *keys):
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TwoTierCache:
+    """
+    In-process LRU in front of Redis for values that rarely change.
+
+    Reads check the LRU, then Redis (refilling the LRU), and return None on
+    a miss. Values must be JSON serializable. Redis errors are logged and
+    treated as a miss so the caller falls back to the database.
+    """
+
+    def __init__(self, namespace: str, maxsize: int, local_ttl: float, redis_ttl: int):
+        self.namespace = namespace
+        self.redis_ttl = redis_ttl
+        self.local = LRUCache(maxsize, local_ttl)
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str):
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        try:
+            raw = await redis_client.get(self._redis_key(key))
+        except RedisError as e:
+            logger.warning("Cache read failed for %s: %s", self._redis_key(key), e)
+            return None
+
+        if raw is None:
+            return None
+
+        value = json.loads(raw)
+        self.local.set(key, value)
+        return value
+
+    async def set(self, key: str, value):
+        self.local.set(key, value)
+        try:
+            await redis_client.set(self._redis_key(key), json.dumps(value), ex=self.redis_ttl)
+        except RedisError as e:
+            logger.warning("Cache write failed for %s: %s", self._redis_key(key), e)
+
+    async def delete(self, *keys: str):
+        self.local.delete(*keys)
+        if not keys:
+            return
+        try:
+            await redis_client.delete(*(self._redis_key(key) for key in keys))
+        except RedisError as e:
+            logger.warning("Cache invalidation failed for %s: %s", self.namespace, e)
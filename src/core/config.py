@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -12,6 +14,50 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str
 
+    # SQLAlchemy engine. DB_ECHO logs every statement; keep it off in production.
+    # Connections older than DB_POOL_RECYCLE seconds are replaced on checkout,
+    # and DB_POOL_PRE_PING tests each connection before handing it out.
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Optional read replica for read-only endpoints (core.database.get_read_db).
+    # Users who committed a write stay on the primary for READ_YOUR_WRITES_SECONDS
+    # (0 disables this), and an unreachable replica is skipped for
+    # REPLICA_RETRY_SECONDS before it is tried again.
+    DATABASE_REPLICA_URL: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: int = 5
+    REPLICA_RETRY_SECONDS: int = 30
+
+    # Logging (core.logging_config): level, "json" or "text" output, and the
+    # share of requests whose DEBUG records are kept
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_DEBUG_SAMPLE_RATE: float = 0.1
+
+    # Debug mode: adds X-DB-Query-Count / X-DB-Query-Time-Ms response headers
+    DEBUG: bool = False
+
+    # Statement shapes run this many times in one request are logged as a
+    # possible N+1 (core.query_stats)
+    QUERY_REPEAT_THRESHOLD: int = 5
+
+    # Bearer token required by GET /metrics; unset leaves it open (e.g. when
+    # only reachable from the Prometheus network)
+    METRICS_TOKEN: Optional[str] = None
+
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Independent read queries run at once by core.database.execute_concurrently,
+    # each holding its own pooled connection: at most DB_FANOUT_CONCURRENCY per
+    # call and DB_FANOUT_MAX_CONNECTIONS per engine across all requests (capped
+    # below DB_POOL_SIZE + DB_MAX_OVERFLOW, so other requests still get one)
+    DB_FANOUT_CONCURRENCY: int = 4
+    DB_FANOUT_MAX_CONNECTIONS: int = 15
+
     # ITEXMO API CONFIGURATION
     ITEXMO_API_ENDPOINT: str
     ITEXMO_API_EMAIL: str
@@ -24,6 +70,89 @@ class Settings(BaseSettings):
     TW_SECRET_KEY: str
     TW_MOTHERWALLET: str
 
+    # TOPWALLET HTTP CLIENT (shared connection pool per worker)
+    TW_CONNECTION_LIMIT: int = 100
+    TW_CONNECTION_LIMIT_PER_HOST: int = 50
+    TW_KEEPALIVE_TIMEOUT: float = 30.0
+    TW_DNS_CACHE_TTL: int = 300
+
+    # TOPWALLET TRANSPORT (deadlines, retries, circuit breaker)
+    TW_CONNECT_TIMEOUT: float = 3.0
+    TW_READ_TIMEOUT: float = 15.0
+    TW_MAX_RETRIES: int = 2
+    TW_RETRY_BASE_DELAY: float = 0.2
+    TW_RETRY_MAX_DELAY: float = 2.0
+    TW_BREAKER_WINDOW: int = 20
+    TW_BREAKER_MIN_CALLS: int = 10
+    TW_BREAKER_FAILURE_RATE: float = 0.5
+    TW_BREAKER_OPEN_SECONDS: float = 30.0
+
+    # Seconds a TopWallet peso balance may be served from Redis
+    TW_BALANCE_CACHE_TTL: int = 15
+
+    # Seconds an initiated P2P transfer's recipient is kept for the process step
+    TW_P2P_PENDING_TTL: int = 600
+
+    # member_id / mobile_number -> TopWallet external_id lookup cache
+    WALLET_ID_CACHE_SIZE: int = 10000
+    WALLET_ID_CACHE_LOCAL_TTL: int = 300
+    WALLET_ID_CACHE_REDIS_TTL: int = 86400
+
+    # OTP login: seconds a code stays valid, wrong guesses before it is
+    # burned, and seconds a verified OTP may be used for the MPIN step
+    OTP_TTL_SECONDS: int = 120
+    OTP_MAX_ATTEMPTS: int = 5
+    OTP_VERIFIED_TTL_SECONDS: int = 120
+
+    # Auth rate limits, "<requests>/<seconds>" sliding windows per mobile
+    # number and per client IP. OTP sends (login, resend) share one budget.
+    RATE_LIMIT_OTP_SEND: str = "3/600"
+    RATE_LIMIT_OTP_SEND_IP: str = "20/600"
+    RATE_LIMIT_VERIFY_OTP: str = "5/600"
+    RATE_LIMIT_VERIFY_OTP_IP: str = "30/600"
+    RATE_LIMIT_VERIFY_MPIN: str = "10/600"
+    RATE_LIMIT_VERIFY_MPIN_IP: str = "50/600"
+
+    # Progressive MPIN lockout: every THRESHOLD-th consecutive wrong MPIN locks
+    # the number for BASE seconds, doubling each time up to MAX. The failure
+    # count resets on success or after FAILURE_TTL seconds without failures.
+    MPIN_LOCKOUT_THRESHOLD: int = 5
+    MPIN_LOCKOUT_BASE_SECONDS: int = 300
+    MPIN_LOCKOUT_MAX_SECONDS: int = 86400
+    MPIN_FAILURE_TTL_SECONDS: int = 86400
+
+    # bcrypt worker threads, and how many hash/verify calls may be queued or
+    # running before new ones are refused with 503
+    BCRYPT_WORKERS: int = 4
+    BCRYPT_MAX_PENDING: int = 64
+
+    # Response encoder: "orjson" (falls back to "json" when not installed) or "json"
+    JSON_BACKEND: str = "orjson"
+
+    # Keyset-paginated list endpoints
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+
+    # Streaming CSV/NDJSON exports: rows fetched per server-side cursor
+    # round-trip, and rows per chunk written to the response
+    EXPORT_YIELD_PER: int = 1000
+    EXPORT_CHUNK_ROWS: int = 500
+
+    # Reward ledger compaction (python -m commands.reward_ledger compact).
+    # Members with at least MIN_TAIL unsnapshotted entries get a new snapshot;
+    # entries younger than LAG_SECONDS are left in the tail.
+    REWARD_SNAPSHOT_MIN_TAIL: int = 100
+    REWARD_SNAPSHOT_LAG_SECONDS: int = 300
+
+    # Purchases per transaction in python -m commands.settle_merchant_rewards
+    MERCHANT_SETTLEMENT_BATCH_SIZE: int = 500
+
+    # Activation SSE feed: events kept for Last-Event-ID replay, idle seconds
+    # between heartbeat comments, and the client reconnect delay
+    ACTIVATION_FEED_MAXLEN: int = 1000
+    ACTIVATION_FEED_HEARTBEAT_SECONDS: float = 15.0
+    ACTIVATION_FEED_RETRY_MS: int = 3000
+
     ADMIN_STAGING: str
 
     """
@@ -1,24 +1,343 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from typing import AsyncGenerator
-from sqlalchemy.orm import declarative_base
+import asyncio
+import logging
+import time
+import weakref
+
+from fastapi import Request
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.engine import Engine, Result
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql import Executable
+from typing import AsyncGenerator, Optional
+from sqlalchemy.orm import Session, declarative_base
 
 from core.config import settings
+from core.metrics import db_query_duration
+from core.redis import redis_client
+
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """
+    Counters for the engine's connection pool: how long checkouts wait for a
+    connection, how long connections are held, and how long they live.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+        self.checkins = 0
+        self.total_held = 0.0
+        self.max_held = 0.0
+
+        self.connects = 0
+        self.closes = 0
+        self.total_lifetime = 0.0
+        self.max_lifetime = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.checkouts += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+
+    def record_held(self, seconds: float):
+        self.checkins += 1
+        self.total_held += seconds
+        self.max_held = max(self.max_held, seconds)
+
+    def record_lifetime(self, seconds: float):
+        self.closes += 1
+        self.total_lifetime += seconds
+        self.max_lifetime = max(self.max_lifetime, seconds)
+
+    @staticmethod
+    def _avg_ms(total: float, count: int) -> float:
+        return round(total / count * 1000, 2) if count else 0.0
+
+    def stats(self, pool) -> dict:
+        return {
+            "pool": {
+                "size": pool.size(),
+                "max_overflow": settings.DB_MAX_OVERFLOW,
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+            },
+            "wait": {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_ms": self._avg_ms(self.total_wait, self.checkouts + self.timeouts),
+                "max_ms": round(self.max_wait * 1000, 2),
+            },
+            "held": {
+                "checkins": self.checkins,
+                "avg_ms": self._avg_ms(self.total_held, self.checkins),
+                "max_ms": round(self.max_held * 1000, 2),
+            },
+            "lifetime": {
+                "connects": self.connects,
+                "closes": self.closes,
+                "avg_s": round(self.total_lifetime / self.closes, 2) if self.closes else 0.0,
+                "max_s": round(self.max_lifetime, 2),
+            },
+        }
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that times how long each checkout waits for a connection.
+    Subclassed per engine by `create_engine_with_metrics` to bind `metrics`.
+    """
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    future=True,
-    echo=True
+
+def create_engine_with_metrics(name: str, url: str, metrics: PoolMetrics) -> AsyncEngine:
+    """
+    An async engine on the configured pool settings, reporting into `metrics`
+    and into db_query_duration_seconds under engine="<name>".
+    """
+    pool_class = type("InstrumentedPool", (InstrumentedPool,), {"metrics": metrics})
+
+    new_engine = create_async_engine(
+        url,
+        future=True,
+        echo=settings.DB_ECHO,
+        poolclass=pool_class,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING
+    )
+
+    @event.listens_for(new_engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+        connection_record.info["connected_at"] = time.monotonic()
+
+    @event.listens_for(new_engine.sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.monotonic()
+
+    @event.listens_for(new_engine.sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.record_held(time.monotonic() - checked_out_at)
+
+    @event.listens_for(new_engine.sync_engine, "close")
+    def on_close(dbapi_connection, connection_record):
+        connected_at = connection_record.info.pop("connected_at", None)
+        if connected_at is not None:
+            metrics.record_lifetime(time.monotonic() - connected_at)
+
+    # Timed on the execution context, so a statement that raises leaves no
+    # stale start time on the pooled connection
+    @event.listens_for(new_engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_start = time.perf_counter()
+
+    @event.listens_for(new_engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_start", None)
+        if started is not None:
+            db_query_duration.observe(time.perf_counter() - started, engine=name)
+
+    return new_engine
+
+
+pool_metrics = PoolMetrics()
+engine = create_engine_with_metrics("primary", settings.DATABASE_URL, pool_metrics)
+
+# Optional read replica for dashboards, lists and history (see get_read_db)
+replica_pool_metrics = PoolMetrics()
+replica_engine = (
+    create_engine_with_metrics("replica", settings.DATABASE_REPLICA_URL, replica_pool_metrics)
+    if settings.DATABASE_REPLICA_URL else None
 )
 
+
+def get_pool_stats() -> dict:
+    """Current pool occupancy plus the PoolMetrics counters, per engine."""
+    return {
+        "primary": pool_metrics.stats(engine.sync_engine.pool),
+        "replica": replica_pool_metrics.stats(replica_engine.sync_engine.pool) if replica_engine else None,
+    }
+
+
+class AppSession(Session):
+    """
+    Sync session behind the app's AsyncSessions. Session event hooks that
+    need the event loop listen on this class, so sync sessions elsewhere
+    (Alembic, ad-hoc scripts) do not trigger them.
+    """
+
+
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     expire_on_commit=False,
-    class_=AsyncSession
+    class_=AsyncSession,
+    sync_session_class=AppSession
 )
 
+ReplicaSessionLocal = async_sessionmaker(
+    bind=replica_engine,
+    expire_on_commit=False,
+    class_=AsyncSession,
+    sync_session_class=AppSession
+) if replica_engine else None
+
 Base = declarative_base()
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+@event.listens_for(AppSession, "after_commit")
+def _flag_commit(session: AppSession):
+    # Read by get_db to start the read-your-writes window
+    session.info["committed"] = True
+
+
+def _recent_writer_key(user_id: str) -> str:
+    return f"read_your_writes:{user_id}"
+
+
+def _request_user_id(request: Optional[Request]) -> Optional[str]:
+    """The caller's user_id, if JWTBearer has already decoded their token."""
+    claims = getattr(request.state, "auth_claims", None) if request else None
+    return claims.get("user_id") if claims else None
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+        # Keep this user's reads on the primary for a short while after they
+        # wrote, so they see their own changes despite replica lag
+        user_id = _request_user_id(request)
+        if replica_engine and settings.READ_YOUR_WRITES_SECONDS and user_id and session.info.get("committed"):
+            try:
+                await redis_client.set(_recent_writer_key(user_id), 1, ex=settings.READ_YOUR_WRITES_SECONDS)
+            except RedisError as e:
+                logger.warning("Could not record read-your-writes window: %s", e)
+
+
+# Monotonic time until which the replica is skipped after a failure
+_replica_down_until = 0.0
+
+
+async def open_read_session(user_id: Optional[str] = None) -> AsyncSession:
+    """
+    A session for read-only work: on the replica when one is configured and
+    reachable, otherwise on the primary. Users inside their read-your-writes
+    window stay on the primary. A replica that fails to connect is skipped
+    for REPLICA_RETRY_SECONDS. The caller closes the session.
+    """
+    global _replica_down_until
+
+    if ReplicaSessionLocal is None or time.monotonic() < _replica_down_until:
+        return AsyncSessionLocal()
+
+    if user_id and settings.READ_YOUR_WRITES_SECONDS:
+        try:
+            if await redis_client.exists(_recent_writer_key(user_id)):
+                return AsyncSessionLocal()
+        except RedisError as e:
+            logger.warning("Read-your-writes check failed, reading from primary: %s", e)
+            return AsyncSessionLocal()
+
+    session = ReplicaSessionLocal()
+    try:
+        # Connect now so a dead replica falls back before any query runs
+        await session.connection()
+    except (SQLAlchemyError, OSError, asyncio.TimeoutError) as e:
+        logger.warning("Read replica unavailable, using primary for %ss: %s", settings.REPLICA_RETRY_SECONDS, e)
+        _replica_down_until = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+        await session.close()
+        return AsyncSessionLocal()
+
+    # Hand the probe connection back until the first query, so the session
+    # does not hold one while execute_concurrently checks out others
+    await session.close()
+    return session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    `get_db` for read-only routes: the session is on the replica when
+    possible (see open_read_session). Do not write through it.
+
+    The read-your-writes check needs the caller's token decoded first, so
+    authenticated routes declare their JWTBearer (or `require_role` in
+    `dependencies=`) before this dependency.
+    """
+    async with await open_read_session(_request_user_id(request)) as session:
+        yield session
+
+
+# Fan-out connections allowed per engine across all requests
+_fanout_slots: "weakref.WeakKeyDictionary[Engine, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _fanout_semaphore(bind: AsyncEngine) -> asyncio.Semaphore:
+    semaphore = _fanout_slots.get(bind.sync_engine)
+    if semaphore is None:
+        pool = bind.sync_engine.pool
+        slots = settings.DB_FANOUT_MAX_CONNECTIONS
+        max_overflow = getattr(pool, "_max_overflow", -1)
+        if isinstance(pool, AsyncAdaptedQueuePool) and max_overflow >= 0:
+            slots = min(slots, pool.size() + max_overflow - 1)
+        semaphore = _fanout_slots[bind.sync_engine] = asyncio.Semaphore(max(1, slots))
+    return semaphore
+
+
+async def execute_concurrently(db: AsyncSession, *statements: Executable, limit: Optional[int] = None) -> list[Result]:
+    """
+    Run independent read-only statements at the same time, each on its own
+    short-lived session (and so its own pooled connection) on the same engine
+    as `db`, at most `limit` (default DB_FANOUT_CONCURRENCY) at once and at
+    most DB_FANOUT_MAX_CONNECTIONS across the process. Wall-clock time is
+    roughly that of the slowest statement instead of the sum.
+
+    Call it before `db` has run anything in its current transaction. A
+    session that already holds a connection runs the statements on it one
+    after another instead: waiting for more connections while holding one
+    lets a burst of requests exhaust the pool and stall each other until
+    DB_POOL_TIMEOUT.
+
+    Results are fully buffered and returned in the order given. The sessions
+    never commit, and they do not see uncommitted changes of `db`, so only
+    use this for reads.
+    """
+    if db.in_transaction():
+        return [await db.execute(statement) for statement in statements]
+
+    request_slots = asyncio.Semaphore(limit or settings.DB_FANOUT_CONCURRENCY)
+    engine_slots = _fanout_semaphore(db.bind)
+
+    async def execute(statement: Executable) -> Result:
+        async with request_slots, engine_slots:
+            async with AsyncSession(bind=db.bind, expire_on_commit=False) as session:
+                return await session.execute(statement)
+
+    return await asyncio.gather(*(execute(statement) for statement in statements))
@@ -0,0 +1,153 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+from uuid import uuid4
+
+from core.config import settings
+
+
+# Correlation id of the request being handled ("-" outside requests), and
+# whether its DEBUG records are kept (decided once per request)
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+debug_sampled_var: ContextVar[Optional[bool]] = ContextVar("debug_sampled", default=None)
+
+# LogRecord attributes that are not `extra` fields
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+_listener: Optional[QueueListener] = None
+
+
+def _debug_sampled() -> bool:
+    return random.random() < settings.LOG_DEBUG_SAMPLE_RATE
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Stamps records with the current request id and drops DEBUG records of
+    requests not picked by LOG_DEBUG_SAMPLE_RATE. Runs in the logging call's
+    own context, before the record is queued.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+
+        if record.levelno <= logging.DEBUG:
+            sampled = debug_sampled_var.get()
+            return _debug_sampled() if sampled is None else sampled
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line; `extra` fields are included as keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRS)
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _QueueHandler(QueueHandler):
+    """
+    Queues records with their message and traceback rendered but otherwise
+    intact, so the listener's formatter still sees `extra` fields.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.stack_info = None
+        return record
+
+
+def setup_logging():
+    """
+    Route all logging through one queue: callers only enqueue, and a
+    background thread writes to stdout as JSON (LOG_FORMAT="json") or text.
+    Safe to call more than once; the listener is stopped at exit.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        stream.setFormatter(JSONFormatter())
+    else:
+        stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """
+    Gives every HTTP request a correlation id (the incoming X-Request-ID, or a
+    new one) for its log records, returns it as X-Request-ID, and decides
+    whether the request's DEBUG records are sampled.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = dict(scope["headers"]).get(b"x-request-id", b"").decode("latin-1")[:64] or uuid4().hex
+        request_id_token = request_id_var.set(request_id)
+        sampled_token = debug_sampled_var.set(_debug_sampled())
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(request_id_token)
+            debug_sampled_var.reset(sampled_token)
@@ -0,0 +1,241 @@
+import bisect
+import time
+from collections import defaultdict
+from typing import Callable, Iterable, Optional
+
+from core.config import settings
+
+
+# Latency buckets in seconds, from cache hits up to TopWallet's read deadline
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """
+    One metric family in the Prometheus text format. Values are kept per
+    tuple of label values, in this worker's memory.
+    """
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(name, "") for name in self.labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        return "\n".join([
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self.samples(),
+        ])
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values = defaultdict(float)
+
+    def inc(self, amount: float = 1, **labels):
+        self.values[self._key(labels)] += amount
+
+    def samples(self) -> Iterable[str]:
+        for key, value in self.values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(Metric):
+    """
+    A value that goes up and down. With `collect`, the samples are read at
+    scrape time instead: it returns (labels, value) pairs.
+    """
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        collect: Optional[Callable[[], Iterable[tuple[dict, float]]]] = None
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.values = defaultdict(float)
+        self.collect = collect
+
+    def inc(self, amount: float = 1, **labels):
+        self.values[self._key(labels)] += amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.values[self._key(labels)] -= amount
+
+    def set(self, value: float, **labels):
+        self.values[self._key(labels)] = value
+
+    def samples(self) -> Iterable[str]:
+        values = self.values.items()
+        if self.collect is not None:
+            values = [(self._key(labels), value) for labels, value in self.collect()]
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (last is +Inf), sum]
+        self.values: dict[tuple, list] = {}
+
+    def observe(self, seconds: float, **labels):
+        key = self._key(labels)
+        entry = self.values.get(key)
+        if entry is None:
+            entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect.bisect_left(self.buckets, seconds)] += 1
+        entry[1] += seconds
+
+    def samples(self) -> Iterable[str]:
+        for key, (counts, total) in self.values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: list[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self.metrics) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route")
+))
+http_requests_in_progress = registry.register(Gauge(
+    "http_requests_in_progress", "HTTP requests currently being handled.", ("method",)
+))
+
+db_query_duration = registry.register(Histogram(
+    "db_query_duration_seconds", "Time spent executing SQL statements.", ("engine",)
+))
+
+redis_command_duration = registry.register(Histogram(
+    "redis_command_duration_seconds", "Redis command latency by command.", ("command",)
+))
+
+topwallet_request_duration = registry.register(Histogram(
+    "topwallet_request_duration_seconds",
+    "Latency of each TopWallet HTTP attempt by endpoint and outcome.",
+    ("endpoint", "outcome")
+))
+
+
+def _pool_collector(section: str, field: str):
+    def collect():
+        # Imported here: core.database imports this module through core.query_stats
+        from core.database import get_pool_stats
+
+        for engine_name, stats in get_pool_stats().items():
+            if stats is not None:
+                yield {"engine": engine_name}, stats[section][field]
+    return collect
+
+
+for _field, _doc in (
+    ("size", "Configured pool size."),
+    ("checked_out", "Connections currently checked out."),
+    ("checked_in", "Idle connections in the pool."),
+    ("overflow", "Connections open beyond the pool size (negative while below it)."),
+):
+    registry.register(Gauge(f"db_pool_{_field}", _doc, ("engine",), collect=_pool_collector("pool", _field)))
+
+for _field, _doc in (
+    ("checkouts", "Connections handed out by the pool since start."),
+    ("timeouts", "Checkouts that timed out waiting for a connection since start."),
+):
+    # Cumulative values read from PoolMetrics, so exposed as gauges
+    registry.register(Gauge(f"db_pool_{_field}", _doc, ("engine",), collect=_pool_collector("wait", _field)))
+
+
+class MetricsMiddleware:
+    """
+    Records request count, latency and in-flight requests. Routes are
+    labelled with their template (e.g. /api/v1/member/{member_id}), and
+    requests that match no route as "<unmatched>", to keep label sets small.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc(method=method)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_progress.dec(method=method)
+
+            route = scope.get("route")
+            route_path = getattr(route, "path", "<unmatched>")
+            http_request_duration.observe(time.perf_counter() - start, method=method, route=route_path)
+            http_requests.inc(method=method, route=route_path, status=status_code)
+
+
+def metrics_authorized(authorization: Optional[str]) -> bool:
+    """True when no METRICS_TOKEN is set or the header carries it as a bearer token."""
+    return not settings.METRICS_TOKEN or authorization == f"Bearer {settings.METRICS_TOKEN}"
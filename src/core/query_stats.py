@@ -0,0 +1,179 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|%\(\w+\)s))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    SQL with whitespace collapsed and IN lists of any length folded to one
+    placeholder, so the same query with different parameters compares equal.
+    """
+    return _IN_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """Statements executed, total time spent in the database, and their shapes."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.total_time += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    @property
+    def total_ms(self) -> float:
+        return round(self.total_time * 1000, 2)
+
+    def repeated(self, threshold: Optional[int] = None) -> list[tuple[str, int]]:
+        """Shapes run at least `threshold` (default QUERY_REPEAT_THRESHOLD) times, most first."""
+        threshold = threshold or settings.QUERY_REPEAT_THRESHOLD
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+# Stats of the request being handled. Tasks started by the request (e.g.
+# execute_concurrently) copy the context and so add to the same object.
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Collectors that see every statement on every engine while active (query_budget)
+_global_collectors: list[QueryStats] = []
+
+
+# Start times live on the statement's execution context rather than the
+# pooled connection, so a statement that raises leaves nothing behind
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_stats_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_stats_start", None)
+    if started is None:
+        return
+    seconds = time.perf_counter() - started
+
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+    for collector in _global_collectors:
+        collector.record(statement, seconds)
+
+
+def start_request_stats() -> QueryStats:
+    stats = QueryStats()
+    _current.set(stats)
+    return stats
+
+
+def log_query_stats(stats: QueryStats, method: str, path: str, status_code: Optional[int]):
+    """
+    One record per request with the query count and time as `extra` fields,
+    plus a warning for every statement shape repeated QUERY_REPEAT_THRESHOLD
+    or more times (likely an N+1 loop).
+    """
+    logger.info(
+        "%s %s -> %s: %d queries in %.2f ms",
+        method, path, status_code, stats.count, stats.total_ms,
+        extra={
+            "method": method,
+            "path": path,
+            "status_code": status_code,
+            "db_queries": stats.count,
+            "db_time_ms": stats.total_ms,
+        }
+    )
+
+    for shape, count in stats.repeated():
+        logger.warning(
+            "Possible N+1 on %s %s: statement ran %d times: %s",
+            method, path, count, shape,
+            extra={"method": method, "path": path, "db_repeats": count, "db_statement": shape}
+        )
+
+
+class QueryStatsMiddleware:
+    """
+    Counts the statements and database time of each HTTP request. Both are
+    logged when the request finishes and, with DEBUG on, returned as the
+    X-DB-Query-Count and X-DB-Query-Time-Ms headers. Queries run after the
+    headers are sent (streaming bodies) only show up in the log.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = start_request_stats()
+        status_code = None
+
+        async def send_with_stats(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.DEBUG:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-db-query-count", str(stats.count).encode()),
+                        (b"x-db-query-time-ms", str(stats.total_ms).encode()),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            log_query_stats(stats, scope["method"], scope["path"], status_code)
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: Optional[int] = None) -> Iterator[QueryStats]:
+    """
+    Fail with AssertionError if more than `max_queries` statements, or any
+    statement shape more than `max_repeats` times, run inside the block.
+    Counts every engine in the process, so it also works around a TestClient
+    call that runs the app on another thread:
+
+        with query_budget(4):
+            client.get("/api/v1/community/all", headers=auth)
+    """
+    stats = QueryStats()
+    _global_collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _global_collectors.remove(stats)
+
+    problems = []
+    if stats.count > max_queries:
+        problems.append(f"{stats.count} queries, budget is {max_queries}")
+    if max_repeats is not None:
+        problems.extend(
+            f"ran {count} times, limit is {max_repeats}: {shape}"
+            for shape, count in stats.repeated(max_repeats + 1)
+        )
+    if problems:
+        summary = "\n".join(f"  {count}x {shape}" for shape, count in stats.shapes.most_common())
+        raise AssertionError("Query budget exceeded: " + "; ".join(problems) + "\n" + summary)
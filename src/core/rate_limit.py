@@ -0,0 +1,160 @@
+import logging
+import math
+from typing import Optional
+from uuid import uuid4
+
+from fastapi import HTTPException, Request
+from redis.exceptions import RedisError
+
+from core.config import settings
+from core.redis import redis_client
+
+
+logger = logging.getLogger(__name__)
+
+
+# Sliding-window log over one or more sorted sets in a single round trip.
+# KEYS: one window per limit. ARGV: request id, then (limit, window_ms) per key.
+# The request is only recorded if every window has room; otherwise nothing is
+# written and the milliseconds until the fullest window frees a slot are
+# returned. Time comes from the Redis server so all workers share one clock.
+SLIDING_WINDOW_LUA = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local retry_after = 0
+
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[i * 2])
+    local window = tonumber(ARGV[i * 2 + 1])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    if redis.call('ZCARD', key) >= limit then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        retry_after = math.max(retry_after, tonumber(oldest[2]) + window - now)
+    end
+end
+
+if retry_after > 0 then
+    return retry_after
+end
+
+for i, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[1])
+    redis.call('PEXPIRE', key, tonumber(ARGV[i * 2 + 1]))
+end
+return 0
+"""
+
+# Count a failed MPIN and start a lockout on every MPIN_LOCKOUT_THRESHOLD-th
+# failure, doubling from the base duration up to the cap. Returns the lockout
+# in seconds, or 0. KEYS: failures, lockout. ARGV: threshold, base, max, ttl.
+MPIN_FAILURE_LUA = """
+local failures = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+
+local threshold = tonumber(ARGV[1])
+if failures % threshold ~= 0 then
+    return 0
+end
+
+local lockout = math.min(tonumber(ARGV[2]) * 2 ^ (failures / threshold - 1), tonumber(ARGV[3]))
+redis.call('SET', KEYS[2], failures, 'EX', lockout)
+return lockout
+"""
+
+sliding_window = redis_client.register_script(SLIDING_WINDOW_LUA)
+mpin_failure = redis_client.register_script(MPIN_FAILURE_LUA)
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """"<requests>/<seconds>" -> (requests, window in milliseconds)."""
+    requests, seconds = rate.split("/")
+    return int(requests), int(seconds) * 1000
+
+
+def too_many_requests(retry_after_seconds: float, detail: str = "Too many requests. Please try again later.") -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after_seconds)))}
+    )
+
+
+class RateLimit:
+    """
+    Dependency enforcing sliding-window limits per mobile number and per
+    client IP, e.g. `Depends(RateLimit("otp_send", "3/600", "20/600"))`.
+
+    Requests over either limit get a 429 with Retry-After. Endpoints sharing a
+    scope share their budget. If Redis is unavailable the request is allowed.
+    """
+
+    def __init__(self, scope: str, per_mobile: Optional[str] = None, per_ip: Optional[str] = None):
+        self.scope = scope
+        self.per_mobile = parse_rate(per_mobile) if per_mobile else None
+        self.per_ip = parse_rate(per_ip) if per_ip else None
+
+    async def __call__(self, request: Request, mobile_number: Optional[str] = None):
+        keys, args = [], []
+        if self.per_mobile and mobile_number:
+            keys.append(f"ratelimit:{self.scope}:mobile:{mobile_number}")
+            args.extend(self.per_mobile)
+        if self.per_ip and request.client:
+            keys.append(f"ratelimit:{self.scope}:ip:{request.client.host}")
+            args.extend(self.per_ip)
+
+        if not keys:
+            return
+
+        try:
+            retry_after_ms = await sliding_window(keys=keys, args=[uuid4().hex, *args])
+        except RedisError as e:
+            logger.warning("Rate limit check for %s failed, allowing request: %s", self.scope, e)
+            return
+
+        if retry_after_ms:
+            logger.warning("Rate limit exceeded for %s (mobile=%s)", self.scope, mobile_number)
+            raise too_many_requests(retry_after_ms / 1000)
+
+
+def _mpin_keys(mobile_number: str) -> list[str]:
+    return [f"mpin_failures:{mobile_number}", f"mpin_lockout:{mobile_number}"]
+
+
+async def check_mpin_lockout(mobile_number: str):
+    """Raise 429 with Retry-After while the mobile number is locked out."""
+    try:
+        ttl = await redis_client.ttl(_mpin_keys(mobile_number)[1])
+    except RedisError as e:
+        logger.warning("MPIN lockout check failed: %s", e)
+        return
+
+    if ttl > 0:
+        raise too_many_requests(ttl, "Too many incorrect MPIN attempts. Please try again later.")
+
+
+async def record_mpin_failure(mobile_number: str) -> int:
+    """Count a wrong MPIN; returns the lockout it started in seconds, or 0."""
+    try:
+        lockout = await mpin_failure(
+            keys=_mpin_keys(mobile_number),
+            args=[
+                settings.MPIN_LOCKOUT_THRESHOLD,
+                settings.MPIN_LOCKOUT_BASE_SECONDS,
+                settings.MPIN_LOCKOUT_MAX_SECONDS,
+                settings.MPIN_FAILURE_TTL_SECONDS
+            ]
+        )
+    except RedisError as e:
+        logger.warning("Recording MPIN failure failed: %s", e)
+        return 0
+
+    if lockout:
+        logger.warning("MPIN locked for %s seconds after repeated failures: %s", lockout, mobile_number)
+    return int(lockout)
+
+
+async def clear_mpin_failures(mobile_number: str):
+    try:
+        await redis_client.delete(_mpin_keys(mobile_number)[0])
+    except RedisError as e:
+        logger.warning("Clearing MPIN failures failed: %s", e)
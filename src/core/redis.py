@@ -0,0 +1,27 @@
+import time
+
+import redis.asyncio as redis
+
+from core.config import settings
+from core.metrics import redis_command_duration
+
+
+class InstrumentedRedis(redis.Redis):
+    """Redis client that records each command's latency in redis_command_duration_seconds."""
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            redis_command_duration.observe(time.perf_counter() - start, command=str(args[0]).upper())
+
+
+# Shared async Redis client. The underlying connection pool connects lazily,
+# so importing this module does not require Redis to be up.
+redis_client: redis.Redis = InstrumentedRedis.from_url(settings.REDIS_URL, decode_responses=True)
+
+
+async def close_redis():
+    """Close the shared client and release its pooled connections."""
+    await redis_client.aclose()
@@ -1,17 +1,21 @@
 import os
 import time
+import asyncio
 import logging
+import threading
 import jwt
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi import Request, HTTPException, Depends
 from passlib.context import CryptContext
 
+from core.config import settings
+
 # Load environment variables
 load_dotenv()
 
 # Logger setup
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 # Security settings
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -31,6 +35,96 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)  
 
 
+class HashingPool:
+    """
+    Bounded thread pool for bcrypt, which releases the GIL while hashing, so
+    logins and signups no longer stall the event loop. At most `max_pending`
+    calls may be queued or running; beyond that callers get a 503 instead of
+    piling up behind a login burst.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self.lock = threading.Lock()
+
+        # pending/completed/failed/rejected are only touched on the event
+        # loop, running and the wait times from the worker threads
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.started = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _timed(self, submitted_at: float, fn, *args):
+        waited = time.perf_counter() - submitted_at
+        with self.lock:
+            self.running += 1
+            self.started += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        try:
+            return fn(*args)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+    async def run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            logger.warning("Password hashing pool saturated (%s pending)", self.pending)
+            raise HTTPException(status_code=503, detail="Server busy. Please try again.", headers={"Retry-After": "1"})
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, self._timed, time.perf_counter(), fn, *args)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+
+        self.completed += 1
+        return result
+
+    def stats(self) -> dict:
+        """Pool size, queue depth and how long calls waited for a worker."""
+        with self.lock:
+            running, started = self.running, self.started
+            total_wait, max_wait = self.total_wait, self.max_wait
+
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "running": running,
+            "queued": max(0, self.pending - running),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            # Over every call that reached a worker, failed ones included
+            "avg_wait_ms": round(total_wait / started * 1000, 2) if started else 0.0,
+            "max_wait_ms": round(max_wait * 1000, 2),
+        }
+
+
+hashing_pool = HashingPool(settings.BCRYPT_WORKERS, settings.BCRYPT_MAX_PENDING)
+
+
+async def hash_password_async(password: str) -> str:
+    """`hash_password` on the hashing pool."""
+    return await hashing_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """`verify_password` on the hashing pool."""
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+
 ### 🔹 JWT Helper Functions ###
 def token_response(token: str):
     return {"access_token": token}
@@ -140,11 +234,21 @@ class JWTBearer2(HTTPBearer):
 
 
 class JWTBearer(HTTPBearer):
-    """Middleware that checks JWT from Cookies or Authorization Header"""
+    """
+    Middleware that checks JWT from Cookies or Authorization Header.
+
+    The token is decoded once per request and its claims are kept on
+    `request.state.auth_claims`; every other JWTBearer (e.g. the one behind
+    `require_role`) on the same request reuses them.
+    """
     def __init__(self, auto_error: bool = True):
         super().__init__(auto_error=auto_error)
 
     async def __call__(self, request: Request):
+        claims = getattr(request.state, "auth_claims", None)
+        if claims is not None:
+            return claims
+
         token = request.cookies.get("access_token")
 
         # If not found in cookies, check headers (for Swagger or API clients)
@@ -153,19 +257,19 @@ class JWTBearer(HTTPBearer):
             if auth_header and auth_header.startswith("Bearer "):
                 token = auth_header.split(" ")[1]
 
-        logger.debug(f"Extracted token: {token}")
-
         if not token:
             raise HTTPException(status_code=401, detail="Not authenticated")
 
-        if not self.verify_jwt(token):
+        claims = decode_jwt(token)
+        if claims is None:
             raise HTTPException(status_code=403, detail="Invalid or expired token.")
 
-        return decode_jwt(token)
+        request.state.auth_claims = claims
+        return claims
 
     def verify_jwt(self, jwtoken: str) -> bool:
         payload = decode_jwt(jwtoken)
-        logger.debug(f"Decoded payload: {payload}")
+        logger.debug("Decoded payload: %s", payload)
         return payload is not None
     
 
@@ -183,18 +287,21 @@ def require_role2(*allowed_roles: str):
 
     return role_dependency
 
+# Shared instance: FastAPI also caches its result per request
+jwt_bearer = JWTBearer()
+
 def require_role(*allowed_roles: str):
     """Dependency function to enforce role-based access control"""
-    def role_dependency(token_payload: dict = Depends(JWTBearer())):
+    def role_dependency(token_payload: dict = Depends(jwt_bearer)):
         if not token_payload:
             logger.warning("No token payload found")
             raise HTTPException(status_code=401, detail="Not authenticated")
         
         user_role = token_payload.get("account_type")
-        logger.debug(f"User role: {user_role}, Allowed roles: {allowed_roles}")
+        logger.debug("User role: %s, Allowed roles: %s", user_role, allowed_roles)
         
         if user_role not in allowed_roles:
-            logger.warning(f"Unauthorized access attempt by {user_role}")
+            logger.warning("Unauthorized access attempt by %s", user_role)
             raise HTTPException(status_code=403, detail="Unauthorized access")
         
         return token_payload
@@ -1,16 +1,27 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from utils.responses import json_response
+from utils.responses import json_response, JSONResponseClass
 
 from api import router
-import redis.asyncio as redis
+from api.v1.services.TopWallet import TopWallet
+from core.redis import redis_client, close_redis
+from core.security import hashing_pool
+from core.query_stats import QueryStatsMiddleware
+from core.metrics import MetricsMiddleware, CONTENT_TYPE, metrics_authorized, registry
+from core.logging_config import RequestIdMiddleware, setup_logging
+import logging
+
+# Before anything logs: one queued, non-blocking pipeline for every module
+setup_logging()
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="GoSend API",
     description="GoSend+ API Documentation",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=JSONResponseClass
 )
 
 
@@ -22,37 +33,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request query count and DB time (logs, and headers in DEBUG mode)
+app.add_middleware(QueryStatsMiddleware)
 
-app.include_router(router)
+# Request counts, latency and in-flight gauges for GET /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Outermost, so every log record of the request carries its X-Request-ID
+app.add_middleware(RequestIdMiddleware)
 
-# ✅ Initialize Redis globally
-redis_client: redis.Redis | None = None
+
+app.include_router(router)
 
 @app.on_event("startup")
 async def startup():
-    """Initialize Redis connection on startup."""
-    global redis_client
+    """Initialize Redis connection and the TopWallet HTTP session on startup."""
     try:
-        redis_client = redis.Redis(host="localhost", port=6379, decode_responses=True)
         await redis_client.ping()  # Test connection
-        print("✅ Connected to Redis successfully!")
+        logger.info("Connected to Redis")
     except Exception as e:
-        print(f"❌ Redis connection error: {e}")
+        logger.error("Redis connection error: %s", e)
+
+    # Shared, pooled HTTP session for all TopWallet calls on this worker
+    await TopWallet.start_session()
 
 @app.on_event("shutdown")
 async def shutdown():
-    """Close Redis connection on shutdown."""
-    global redis_client
-    if redis_client:
-        await redis_client.close()
-        print("🔌 Redis connection closed.")
+    """Close Redis connection and the TopWallet HTTP session on shutdown."""
+    await close_redis()
+    logger.info("Redis connection closed")
+
+    await TopWallet.close_session()
+
+    hashing_pool.executor.shutdown(wait=False)
 
 # ✅ Exception Handlers
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request, exc: StarletteHTTPException):
     return json_response(
         message=str(exc.detail),
-        status_code=exc.status_code
+        status_code=exc.status_code,
+        headers=getattr(exc, "headers", None)
     )
 
 @app.exception_handler(RequestValidationError)
@@ -63,6 +84,13 @@ async def validation_exception_handler(request, exc: RequestValidationError):
         status_code=400
     )
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(authorization: str | None = Header(None)):
+    """Prometheus text exposition of this worker's metrics."""
+    if not metrics_authorized(authorization):
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
 @app.get("/")
 async def root():
     return {"message": "Hello World"}
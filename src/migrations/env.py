@@ -33,7 +33,8 @@ from models import (
     referral_models,
     merchant_models,
     activation_history_models,
-    reward_models
+    reward_models,
+    rollup_models
 )
 
 
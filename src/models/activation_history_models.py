@@ -4,7 +4,8 @@ from sqlalchemy import (
     TIMESTAMP,
     Enum,
     ForeignKey,
-    Float
+    Float,
+    Index
 )
 
 from sqlalchemy.orm import relationship
@@ -41,4 +42,8 @@ class ActivationHistory(Base):
     # Relationship with Member
     member = relationship("Member", back_populates="activation_history")
 
+    __table_args__ = (
+        Index("ix_activation_history_created_at", "created_at"),
+    )
+
     
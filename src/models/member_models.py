@@ -4,7 +4,8 @@ from sqlalchemy import (
     ForeignKey,
     Enum,
     Boolean,
-    TIMESTAMP
+    TIMESTAMP,
+    Index
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -41,6 +42,12 @@ class Member(Base):
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
 
+    # Keyset pagination of the member list, overall and per community
+    __table_args__ = (
+        Index("ix_members_created_at_member_id", "created_at", "member_id"),
+        Index("ix_members_community_created_at", "community_id", "created_at", "member_id"),
+    )
+
 
     # Relationships to member details and address
     details = relationship("MemberDetails", back_populates="member", uselist=False, cascade="all, delete-orphan")
@@ -4,7 +4,8 @@ from sqlalchemy import (
     ForeignKey,
     TIMESTAMP,
     Enum,
-    Float
+    Float,
+    Index
 )
 
 from sqlalchemy.orm import relationship
@@ -111,9 +112,16 @@ class MerchantPurchaseHistory(Base):
 
     status = Column(Enum('pending', 'success', 'failed', 'refunded'), nullable=False, server_default='pending', default='pending')
 
+    # Set once the purchase's reward pool has been distributed
+    rewards_settled_at = Column(TIMESTAMP, nullable=True)
+
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_merchant_purchases_settlement", "status", "rewards_settled_at"),
+    )
+
     # Relationships
     merchant = relationship("Merchant", back_populates="merchant_purchases")
     member = relationship("Member", back_populates="member_purchases")
@@ -2,7 +2,9 @@ from sqlalchemy import (
     Column,
     String,
     ForeignKey,
-    TIMESTAMP
+    TIMESTAMP,
+    Integer,
+    Index
 )
 
 from sqlalchemy.orm import relationship
@@ -26,3 +28,36 @@ class Referral(Base):
     # Relationships (Fixed)
     referrer = relationship("Member", foreign_keys=[referred_by], back_populates="referrals_made")
     referred = relationship("Member", foreign_keys=[referred_member], back_populates="referred_by_member")
+
+
+class ReferralClosure(Base):
+    """
+    Transitive closure of the referral tree: one row per (ancestor, descendant)
+    pair, including each member's own depth-0 row. Upline and downline lookups
+    at any depth are a single indexed query instead of a recursive CTE.
+    """
+    __tablename__ = "referral_closure"
+
+    ancestor = Column(String(36), ForeignKey("members.member_id", ondelete="CASCADE"), primary_key=True)
+    descendant = Column(String(36), ForeignKey("members.member_id", ondelete="CASCADE"), primary_key=True)
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_referral_closure_descendant_depth", "descendant", "depth"),
+        Index("ix_referral_closure_ancestor_depth", "ancestor", "depth"),
+    )
+
+
+class MemberDownlineStats(Base):
+    """
+    Per-member downline counts at each referral depth (1 = direct referrals).
+    Maintained incrementally on member creation and activation.
+    """
+    __tablename__ = "member_downline_stats"
+
+    member_id = Column(String(36), ForeignKey("members.member_id", ondelete="CASCADE"), primary_key=True)
+    level = Column(Integer, primary_key=True)
+    total_count = Column(Integer, nullable=False, default=0)
+    activated_count = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
@@ -4,7 +4,10 @@ from sqlalchemy import (
     ForeignKey,
     TIMESTAMP,
     Float,
-    Enum
+    Enum,
+    BigInteger,
+    Integer,
+    Index
 )
 
 from sqlalchemy.orm import relationship
@@ -40,3 +43,37 @@ class Reward(Base):
     giver = relationship("Member", foreign_keys=[reward_from], back_populates="rewards_given")
     recipient = relationship("Member", foreign_keys=[receiver], back_populates="rewards_received")
 
+
+class RewardLedger(Base):
+    """
+    Append-only record of every reward point movement. `seq` orders entries
+    globally; rows are never updated or deleted.
+    """
+    __tablename__ = "reward_ledger"
+
+    seq = Column(BigInteger, primary_key=True, autoincrement=True)
+    member_id = Column(String(36), ForeignKey("members.member_id", ondelete="CASCADE"), nullable=False)
+    reward_id = Column(String(36), nullable=True, index=True)
+    points = Column(Float, nullable=False)
+
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_reward_ledger_member_seq", "member_id", "seq"),
+    )
+
+
+class RewardBalanceSnapshot(Base):
+    """
+    A member's reward balance folded up to (and including) ledger entry
+    `last_seq`. The current balance is the latest snapshot plus the ledger
+    entries after it.
+    """
+    __tablename__ = "reward_balance_snapshots"
+
+    member_id = Column(String(36), ForeignKey("members.member_id", ondelete="CASCADE"), primary_key=True)
+    last_seq = Column(BigInteger, primary_key=True)
+    balance = Column(Float, nullable=False)
+    entry_count = Column(Integer, nullable=False)
+
+    created_at = Column(TIMESTAMP, server_default=func.now())
@@ -0,0 +1,61 @@
+from sqlalchemy import (
+    Column,
+    String,
+    TIMESTAMP,
+    Integer,
+    Float,
+    Date
+)
+
+from sqlalchemy.sql import func
+
+from core.database import Base
+
+
+class RollupCountsMixin:
+    """Counters shared by the daily and monthly dashboard rollups."""
+    members_created = Column(Integer, nullable=False, default=0)
+    members_activated = Column(Integer, nullable=False, default=0)
+    merchants_created = Column(Integer, nullable=False, default=0)
+    communities_created = Column(Integer, nullable=False, default=0)
+
+    activations = Column(Integer, nullable=False, default=0)
+    activation_amount = Column(Float, nullable=False, default=0)
+    # Activation amount left after unilevel rewards and activator earnings
+    activation_net_amount = Column(Float, nullable=False, default=0)
+
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+
+class DailyRollup(RollupCountsMixin, Base):
+    """
+    Per-day dashboard counters, keyed by the database's CURRENT_DATE when the
+    event happened. Maintained incrementally on member, merchant and community
+    creation and on activation; rebuilt by `commands.rebuild_dashboard_rollups`.
+    """
+    __tablename__ = "daily_rollups"
+
+    day = Column(Date, primary_key=True)
+
+
+class MonthlyRollup(RollupCountsMixin, Base):
+    """
+    Per-month dashboard counters. All-time totals are the sum of these rows.
+    """
+    __tablename__ = "monthly_rollups"
+
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+
+
+class ActivationRollup(Base):
+    """
+    All-time activation counts per (activated_by_role, amount).
+    """
+    __tablename__ = "activation_rollups"
+
+    activated_by_role = Column(String(50), primary_key=True)
+    amount = Column(Float, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
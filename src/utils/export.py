@@ -0,0 +1,86 @@
+import csv
+import io
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import AsyncIterator, Literal
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.sql import Select
+
+from core.config import settings
+from core.database import open_read_session
+
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _export_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+async def stream_export(query: Select, fmt: ExportFormat) -> AsyncIterator[str]:
+    """
+    Runs `query` on a server-side cursor and yields it as NDJSON or CSV text,
+    EXPORT_CHUNK_ROWS rows per chunk, so memory use does not grow with the
+    size of the table.
+
+    The generator opens its own read session (on the replica when one is
+    available): dependency-managed sessions are closed before a streaming
+    response body is sent.
+    """
+    columns = list(query.selected_columns.keys())
+
+    async with await open_read_session() as session:
+        result = await session.stream(query.execution_options(yield_per=settings.EXPORT_YIELD_PER))
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+
+        try:
+            async for rows in result.partitions(settings.EXPORT_CHUNK_ROWS):
+                if fmt == "csv":
+                    writer.writerows([_export_value(value) for value in row] for row in rows)
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+                else:
+                    yield "".join(
+                        json.dumps({column: _export_value(value) for column, value in zip(columns, row)}) + "\n"
+                        for row in rows
+                    )
+
+            if fmt == "csv" and buffer.tell():
+                # Header only: the query returned no rows
+                yield buffer.getvalue()
+        except Exception as e:
+            logger.error("Export stream failed: %s", e, exc_info=True)
+            raise
+        finally:
+            await result.close()
+
+
+def export_response(query: Select, fmt: ExportFormat, filename: str) -> StreamingResponse:
+    """
+    Wraps `stream_export` in a downloadable StreamingResponse named
+    `<filename>.<ndjson|csv>`.
+    """
+    return StreamingResponse(
+        stream_export(query, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    )
@@ -1,4 +1,5 @@
 import jwt
+import logging
 import random
 import datetime
 import os
@@ -6,11 +7,68 @@ import os
 from dotenv import load_dotenv
 load_dotenv()
 
+from core.config import settings
+from core.redis import redis_client
+
+
+logger = logging.getLogger(__name__)
+
 SECRET_KEY = os.getenv("secret")
 ALGORITHM = os.getenv("algorithm")
 
 OTP_EXPIRY_MINUTES = 5
 
+# OTP state per mobile number, kept in Redis:
+#   otp:<mobile>           the pending code (OTP_TTL_SECONDS)
+#   otp_attempts:<mobile>  wrong guesses against the pending code
+#   otp_verified:<mobile>  set once the code is verified, consumed by MPIN login
+# Each transition is one script, so it is a single atomic round trip.
+
+# KEYS: otp, attempts. ARGV: code, ttl
+OTP_ISSUE_LUA = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', tonumber(ARGV[2]))
+redis.call('DEL', KEYS[2])
+return 1
+"""
+
+# KEYS: otp, attempts, verified. ARGV: input, max attempts, verified ttl.
+# Returns OTP_VERIFIED, OTP_INCORRECT, OTP_MISSING or OTP_LOCKED (the code was
+# burned after too many wrong guesses).
+OTP_VERIFY_LUA = """
+local stored = redis.call('GET', KEYS[1])
+if not stored then
+    return -1
+end
+
+if stored ~= ARGV[1] then
+    local attempts = redis.call('INCR', KEYS[2])
+    if attempts == 1 then
+        redis.call('EXPIRE', KEYS[2], math.max(redis.call('TTL', KEYS[1]), 1))
+    end
+    if attempts >= tonumber(ARGV[2]) then
+        redis.call('DEL', KEYS[1], KEYS[2])
+        return -2
+    end
+    return 0
+end
+
+redis.call('SET', KEYS[3], 'true', 'EX', tonumber(ARGV[3]))
+redis.call('DEL', KEYS[1], KEYS[2])
+return 1
+"""
+
+OTP_VERIFIED = 1
+OTP_INCORRECT = 0
+OTP_MISSING = -1
+OTP_LOCKED = -2
+
+_issue_otp = redis_client.register_script(OTP_ISSUE_LUA)
+_verify_otp = redis_client.register_script(OTP_VERIFY_LUA)
+
+
+def _otp_keys(mobile_number: str) -> list[str]:
+    return [f"otp:{mobile_number}", f"otp_attempts:{mobile_number}", f"otp_verified:{mobile_number}"]
+
 def generate_otp():
     """Generate a 6-digit OTP."""
     return str(random.randint(100000, 999999))
@@ -42,7 +100,7 @@ def verify_otp_token(token: str, input_otp: str):
 
 def send_otp(mobile_number: str, otp: str):
     """Simulate sending OTP via SMS or email. Replace this with actual SMS API."""
-    print(f"📩 Sending OTP {otp} to {mobile_number}")  # Replace with actual API call
+    logger.info("Sending OTP to %s", mobile_number)  # Replace with actual API call
 
 def resend_otp(mobile_number: str):
     """Resend a new OTP when the previous one expires."""
@@ -53,3 +111,32 @@ def resend_otp(mobile_number: str):
     send_otp(mobile_number, new_otp)
     
     return {"otp_token": new_token, "message": "New OTP has been sent."}
+
+
+async def issue_otp(mobile_number: str, otp: str):
+    """Store a new pending OTP, replacing any previous one and its attempts."""
+    await _issue_otp(keys=_otp_keys(mobile_number)[:2], args=[otp, settings.OTP_TTL_SECONDS])
+
+
+async def check_otp(mobile_number: str, input_otp: str) -> int:
+    """
+    Verify `input_otp` against the pending code. On success the code is
+    consumed and the number marked verified for OTP_VERIFIED_TTL_SECONDS.
+    Returns one of OTP_VERIFIED, OTP_INCORRECT, OTP_MISSING, OTP_LOCKED.
+    """
+    return await _verify_otp(
+        keys=_otp_keys(mobile_number),
+        args=[input_otp, settings.OTP_MAX_ATTEMPTS, settings.OTP_VERIFIED_TTL_SECONDS]
+    )
+
+
+async def is_otp_verified(mobile_number: str) -> bool:
+    return bool(await redis_client.exists(_otp_keys(mobile_number)[2]))
+
+
+async def consume_otp_verification(mobile_number: str) -> bool:
+    """
+    Use up the verified flag. Only one caller gets True, so a verified OTP
+    yields at most one login.
+    """
+    return bool(await redis_client.delete(_otp_keys(mobile_number)[2]))
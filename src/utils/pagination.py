@@ -0,0 +1,47 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+
+
+def encode_cursor(created_at: datetime, key: str) -> str:
+    """
+    Encodes a keyset position (created_at, primary key) as an opaque,
+    URL-safe cursor string.
+    """
+    raw = json.dumps([created_at.isoformat(), key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Decodes a cursor produced by `encode_cursor`.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(key)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def parse_fields(fields: str | None, allowed) -> set[str]:
+    """
+    Parses a comma-separated `fields` selector. Returns every allowed field
+    when no selector is given.
+
+    Raises:
+        HTTPException: 400 if an unknown field is requested.
+    """
+    if not fields:
+        return set(allowed)
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested
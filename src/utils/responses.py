@@ -1,12 +1,91 @@
-from typing import Optional, Union
+from typing import Any, Optional, Union
 from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.engine import Row
+from decimal import Decimal
+from uuid import UUID
 import datetime
+import json
+import logging
+
+from core.config import settings
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib backend is used without it
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+
+def json_default(obj: Any) -> Any:
+    """
+    Converts values the JSON encoders do not handle natively: Decimal,
+    SQLAlchemy Row, pydantic models, sets and (for the stdlib backend)
+    datetime/date/time and UUID.
+
+    Raises:
+        TypeError: If the value has no JSON representation.
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, Row):
+        return dict(obj._mapping)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, BaseException):
+        # e.g. the `ctx` of pydantic validation errors
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class StdJSONResponse(JSONResponse):
+    """Stdlib `json` encoder with `json_default` for extra types."""
+
+    def render(self, content: Any) -> bytes:
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+            default=json_default,
+        ).encode("utf-8")
+
+
+class ORJSONResponse(JSONResponse):
+    """orjson encoder; datetime, UUID and dataclasses are handled natively."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _select_response_class() -> type[JSONResponse]:
+    if settings.JSON_BACKEND == "orjson":
+        if orjson is not None:
+            return ORJSONResponse
+        logger.warning("JSON_BACKEND is 'orjson' but orjson is not installed; using the stdlib encoder.")
+    elif settings.JSON_BACKEND != "json":
+        logger.warning("Unknown JSON_BACKEND %r; using the stdlib encoder.", settings.JSON_BACKEND)
+    return StdJSONResponse
+
+
+# App-wide response class, chosen by settings.JSON_BACKEND
+JSONResponseClass = _select_response_class()
 
 
 def json_response(
         message: Optional[str] = None,
         data: Optional[Union[dict, list]] = None,
         status_code: int = 200,
+        headers: Optional[dict] = None,
 ) -> JSONResponse:
     """
     Generates a JSON response with a standardized format for success or error.
@@ -15,8 +94,10 @@ def json_response(
         message (Optional[str]): An optional message to include in the response. If not provided, 
                                   a default message will be used based on the status code.
         data (Optional[Union[dict, list]]): The data to be included in the response body, 
-                                            typically a dictionary or a list.
+                                            typically a dictionary or a list. Datetimes, Decimals,
+                                            UUIDs, Rows and pydantic models are encoded as-is.
         status_code (int): The HTTP status code to set for the response (default is 200).
+        headers (Optional[dict]): Extra response headers, e.g. Retry-After.
 
     Returns:
         JSONResponse: The FastAPI JSON response object with the status, message, and data.
@@ -24,11 +105,11 @@ def json_response(
     
     status = "success" if status_code == 200 else "error"
     
-    return JSONResponse({
+    return JSONResponseClass({
         "status": status,
         "data": data,
         "message": message or ("Request was successful" if status == "success" else "An error occurred")
-    }, status_code=status_code)
+    }, status_code=status_code, headers=headers)
 
 
 
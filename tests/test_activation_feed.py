@@ -0,0 +1,66 @@
+"""
+ActivationFeed.events delivers every stream entry once, in stream ID order,
+whatever order the live channel announces them in.
+"""
+import asyncio
+
+import pytest
+
+from api.v1.services import activation_feed
+from api.v1.services.activation_feed import ActivationFeed, CHANNEL, STREAM_KEY
+
+
+class FakeRequest:
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+@pytest.fixture
+def feed_redis(monkeypatch, fake_redis):
+    monkeypatch.setattr(activation_feed, "redis_client", fake_redis)
+    monkeypatch.setattr(activation_feed.settings, "ACTIVATION_FEED_HEARTBEAT_SECONDS", 0.05)
+    return fake_redis
+
+
+async def _next(stream) -> str:
+    return await asyncio.wait_for(stream.__anext__(), timeout=2)
+
+
+async def _events_until_heartbeat(stream) -> list[str]:
+    ids = []
+    while (chunk := await _next(stream)) != ": heartbeat\n\n":
+        ids.append(chunk.split("\n")[0].removeprefix("id: "))
+    return ids
+
+
+def test_out_of_order_publishes_are_delivered_in_stream_order(run, feed_redis):
+    async def scenario():
+        stream = ActivationFeed.events(FakeRequest())
+        assert (await _next(stream)).startswith("retry:")
+        assert await _events_until_heartbeat(stream) == []
+
+        # Worker A appends first, worker B second, but B announces first
+        first = await feed_redis.xadd(STREAM_KEY, {"data": "{}"})
+        second = await feed_redis.xadd(STREAM_KEY, {"data": "{}"})
+        await feed_redis.publish(CHANNEL, second)
+        await feed_redis.publish(CHANNEL, first)
+
+        assert await _events_until_heartbeat(stream) == [first, second]
+        await stream.aclose()
+
+    run(scenario())
+
+
+def test_reconnect_replays_events_after_last_event_id(run, feed_redis):
+    async def scenario():
+        ids = [await feed_redis.xadd(STREAM_KEY, {"data": "{}"}) for _ in range(3)]
+
+        stream = ActivationFeed.events(FakeRequest(), last_event_id=ids[0])
+        assert (await _next(stream)).startswith("retry:")
+        assert await _events_until_heartbeat(stream) == ids[1:]
+        await stream.aclose()
+
+    run(scenario())
@@ -0,0 +1,85 @@
+"""
+execute_concurrently under more concurrent callers than the pool holds: no
+caller may end up waiting for a connection that only another waiter frees.
+"""
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import event, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from core.database import execute_concurrently
+
+
+POOL_SIZE = 2
+MAX_OVERFLOW = 1
+CALLERS = 12
+
+
+@pytest.fixture
+def small_pool(tmp_path):
+    """An engine whose pool holds 3 connections, failing fast when exhausted."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'fanout.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=2
+    )
+    peak = {"checked_out": 0}
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def add_slow(dbapi_connection, connection_record):
+        # slow(x) holds its connection for a moment and records pool usage
+        def slow(value):
+            time.sleep(0.02)
+            peak["checked_out"] = max(peak["checked_out"], engine.sync_engine.pool.checkedout())
+            return value
+        dbapi_connection.create_function("slow", 1, slow)
+
+    return engine, peak
+
+
+def _statements(n: int):
+    return [select(func.slow(literal(n * 10 + i))) for i in range(4)]
+
+
+def test_fan_out_stays_below_pool_capacity(run, small_pool):
+    engine, peak = small_pool
+
+    async def caller(n: int):
+        async with AsyncSession(engine) as db:
+            results = await execute_concurrently(db, *_statements(n))
+            return [result.scalar() for result in results]
+
+    async def scenario():
+        results = await asyncio.gather(*(caller(n) for n in range(CALLERS)))
+        assert results == [[n * 10 + i for i in range(4)] for n in range(CALLERS)]
+
+        # One connection is always left for requests that are not fanning out
+        assert peak["checked_out"] <= POOL_SIZE + MAX_OVERFLOW - 1
+        await engine.dispose()
+
+    run(scenario())
+
+
+def test_session_holding_a_connection_does_not_check_out_more(run, small_pool):
+    engine, peak = small_pool
+
+    async def caller(n: int):
+        async with AsyncSession(engine) as db:
+            # The session now holds a connection, like a request that ran a
+            # query before fanning out
+            await db.execute(select(func.slow(literal(n))))
+            results = await execute_concurrently(db, *_statements(n))
+            return [result.scalar() for result in results]
+
+    async def scenario():
+        results = await asyncio.gather(*(caller(n) for n in range(CALLERS)))
+        assert results == [[n * 10 + i for i in range(4)] for n in range(CALLERS)]
+        assert peak["checked_out"] <= POOL_SIZE + MAX_OVERFLOW
+        await engine.dispose()
+
+    run(scenario())
@@ -0,0 +1,123 @@
+"""
+The OTP state machine behind login, run on fakeredis's Lua engine: verify
+outcomes, attempt counting, and single use of a verified OTP.
+"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.v1.repo.auth_repo import AuthRepo
+from core import rate_limit
+from core.security import hash_password
+from models.member_models import Member
+from utils import otp
+from utils.otp import (
+    OTP_INCORRECT,
+    OTP_LOCKED,
+    OTP_MISSING,
+    OTP_VERIFIED,
+    check_otp,
+    consume_otp_verification,
+    is_otp_verified,
+    issue_otp,
+)
+
+
+MOBILE = "9171234567"
+CODE = "123456"
+
+
+@pytest.fixture
+def otp_redis(monkeypatch, fake_redis):
+    monkeypatch.setattr(otp, "redis_client", fake_redis)
+    monkeypatch.setattr(otp, "_issue_otp", fake_redis.register_script(otp.OTP_ISSUE_LUA))
+    monkeypatch.setattr(otp, "_verify_otp", fake_redis.register_script(otp.OTP_VERIFY_LUA))
+    monkeypatch.setattr(rate_limit, "redis_client", fake_redis)
+    monkeypatch.setattr(rate_limit, "mpin_failure", fake_redis.register_script(rate_limit.MPIN_FAILURE_LUA))
+    monkeypatch.setattr(otp.settings, "OTP_TTL_SECONDS", 120)
+    monkeypatch.setattr(otp.settings, "OTP_MAX_ATTEMPTS", 5)
+    return fake_redis
+
+
+def test_verify_outcomes(run, otp_redis):
+    async def scenario():
+        assert await check_otp(MOBILE, CODE) == OTP_MISSING
+
+        await issue_otp(MOBILE, CODE)
+        assert await check_otp(MOBILE, "000000") == OTP_INCORRECT
+        assert not await is_otp_verified(MOBILE)
+
+        assert await check_otp(MOBILE, CODE) == OTP_VERIFIED
+        assert await is_otp_verified(MOBILE)
+
+        # The code is used up, along with its attempt count
+        assert await check_otp(MOBILE, CODE) == OTP_MISSING
+        assert not await otp_redis.exists(f"otp_attempts:{MOBILE}")
+
+    run(scenario())
+
+
+def test_too_many_wrong_guesses_burn_the_code(run, otp_redis):
+    async def scenario():
+        await issue_otp(MOBILE, CODE)
+        outcomes = [await check_otp(MOBILE, "000000") for _ in range(5)]
+        assert outcomes == [OTP_INCORRECT] * 4 + [OTP_LOCKED]
+
+        assert await check_otp(MOBILE, CODE) == OTP_MISSING
+        assert not await is_otp_verified(MOBILE)
+
+        # A new code starts with a clean attempt count
+        await issue_otp(MOBILE, CODE)
+        assert await check_otp(MOBILE, "000000") == OTP_INCORRECT
+        assert await check_otp(MOBILE, CODE) == OTP_VERIFIED
+
+    run(scenario())
+
+
+def test_attempts_expire_with_the_code(run, otp_redis):
+    async def scenario():
+        await issue_otp(MOBILE, CODE)
+        await otp_redis.expire(f"otp:{MOBILE}", 30)
+
+        assert await check_otp(MOBILE, "000000") == OTP_INCORRECT
+        assert await otp_redis.ttl(f"otp_attempts:{MOBILE}") == await otp_redis.ttl(f"otp:{MOBILE}") == 30
+
+        # Re-issuing drops the old attempts instead of carrying them over
+        await issue_otp(MOBILE, CODE)
+        assert not await otp_redis.exists(f"otp_attempts:{MOBILE}")
+
+    run(scenario())
+
+
+def test_verified_otp_is_consumed_once(run, otp_redis):
+    async def scenario():
+        await issue_otp(MOBILE, CODE)
+        await check_otp(MOBILE, CODE)
+        return await asyncio.gather(*(consume_otp_verification(MOBILE) for _ in range(10)))
+
+    assert sorted(run(scenario())) == [False] * 9 + [True]
+
+
+def test_concurrent_mpin_logins_share_one_verified_otp(run, otp_redis, db_session):
+    async def scenario():
+        async with await db_session() as db:
+            db.add(Member(member_id="member", mobile_number=MOBILE, mpin=hash_password("1234"), referral_id="REF000001"))
+            await db.commit()
+
+            await issue_otp(MOBILE, CODE)
+            assert await check_otp(MOBILE, CODE) == OTP_VERIFIED
+
+            async def login():
+                async with AsyncSession(db.bind) as session:
+                    return await AuthRepo.verify_mpin(session, MOBILE, "1234", "MEMBER")
+
+            return await asyncio.gather(*(login() for _ in range(5)), return_exceptions=True)
+
+    results = run(scenario())
+    logins = [r for r in results if isinstance(r, dict)]
+    refused = [r for r in results if isinstance(r, HTTPException)]
+
+    assert len(logins) == 1 and logins[0]["message"] == "Login successful"
+    assert len(refused) == 4 and all(error.status_code == 401 for error in refused)
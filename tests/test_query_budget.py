@@ -0,0 +1,81 @@
+"""
+Query-count budgets for hot read paths. A failure lists every statement
+shape run, so a new per-row or per-level query shows up directly.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from core.query_stats import query_budget
+from api.v1.repo.member_repo import MemberRepo, ADMIN_STAGING
+from api.v1.services.member_services import MemberService
+from models.member_models import Member
+from models.referral_models import ReferralClosure
+
+
+def _member(n: int) -> Member:
+    return Member(
+        member_id=f"member-{n:04d}",
+        mobile_number=f"9{n:09d}",
+        mpin="x",
+        referral_id=f"REF{n:06d}",
+        created_at=datetime(2025, 1, 1) + timedelta(minutes=n),
+    )
+
+
+def test_member_list_page_is_one_query(run, db_session):
+    async def scenario():
+        async with await db_session() as db:
+            db.add_all(_member(n) for n in range(60))
+            await db.commit()
+
+            for limit in (5, 50):
+                with query_budget(1):
+                    response = await MemberService.get_all_members(db, limit=limit)
+                assert response.status_code == 200
+
+    run(scenario())
+
+
+def test_unilevel_5_is_one_query(run, db_session):
+    async def scenario():
+        async with await db_session() as db:
+            # member-0000 <- member-0001 <- ... <- member-0003 (3 levels of upline)
+            db.add_all(_member(n) for n in range(4))
+            db.add_all(
+                ReferralClosure(ancestor=f"member-{a:04d}", descendant=f"member-{d:04d}", depth=d - a)
+                for d in range(4) for a in range(d + 1)
+            )
+            await db.commit()
+
+            with query_budget(1, max_repeats=1):
+                unilevel = await MemberRepo.get_member_unilevel_5_main(db, "member-0003")
+
+        assert unilevel == {
+            "first_level": "member-0002",
+            "second_level": "member-0001",
+            "third_level": "member-0000",
+            "forth_level": ADMIN_STAGING,
+            "fifth_level": ADMIN_STAGING,
+        }
+
+    run(scenario())
+
+
+def test_query_budget_reports_repeated_statements(run, db_session):
+    async def scenario():
+        async with await db_session() as db:
+            db.add_all(_member(n) for n in range(3))
+            await db.commit()
+
+            try:
+                with query_budget(5, max_repeats=1):
+                    # An N+1: one lookup per member
+                    for n in range(3):
+                        await db.execute(select(Member.mobile_number).where(Member.member_id == f"member-{n:04d}"))
+            except AssertionError as e:
+                assert "ran 3 times, limit is 1" in str(e)
+            else:
+                raise AssertionError("query_budget did not flag the repeated lookup")
+
+    run(scenario())
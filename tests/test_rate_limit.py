@@ -0,0 +1,118 @@
+"""
+Rate limiting and MPIN lockout Lua scripts, run on fakeredis's Lua engine.
+"""
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from core import rate_limit
+from core.rate_limit import (
+    MPIN_FAILURE_LUA,
+    SLIDING_WINDOW_LUA,
+    RateLimit,
+    check_mpin_lockout,
+    clear_mpin_failures,
+    record_mpin_failure,
+)
+
+
+MOBILE = "9171234567"
+
+
+@pytest.fixture
+def limiter_redis(monkeypatch, fake_redis):
+    monkeypatch.setattr(rate_limit, "redis_client", fake_redis)
+    monkeypatch.setattr(rate_limit, "sliding_window", fake_redis.register_script(SLIDING_WINDOW_LUA))
+    monkeypatch.setattr(rate_limit, "mpin_failure", fake_redis.register_script(MPIN_FAILURE_LUA))
+    monkeypatch.setattr(rate_limit.settings, "MPIN_LOCKOUT_THRESHOLD", 5)
+    monkeypatch.setattr(rate_limit.settings, "MPIN_LOCKOUT_BASE_SECONDS", 300)
+    monkeypatch.setattr(rate_limit.settings, "MPIN_LOCKOUT_MAX_SECONDS", 86400)
+    return fake_redis
+
+
+def _request(ip: str = "10.0.0.1") -> Request:
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": [], "client": (ip, 5000)})
+
+
+def test_nth_request_passes_and_next_gets_429(run, limiter_redis):
+    limit = RateLimit("otp_send", per_mobile="3/600")
+
+    async def scenario():
+        for _ in range(3):
+            await limit(_request(), MOBILE)
+
+        with pytest.raises(HTTPException) as error:
+            await limit(_request(), MOBILE)
+        return error.value
+
+    error = run(scenario())
+    assert error.status_code == 429
+    # The oldest request frees its slot when the 600 s window passes it
+    assert 599 <= int(error.headers["Retry-After"]) <= 600
+
+
+def test_rejected_requests_are_not_recorded(run, limiter_redis):
+    limit = RateLimit("otp_send", per_mobile="3/600", per_ip="2/600")
+    mobile_key = f"ratelimit:otp_send:mobile:{MOBILE}"
+    ip_key = "ratelimit:otp_send:ip:10.0.0.1"
+
+    async def scenario():
+        await limit(_request(), MOBILE)
+        await limit(_request(), MOBILE)
+
+        # The IP window is full: nothing is written to either window
+        for _ in range(3):
+            with pytest.raises(HTTPException):
+                await limit(_request(), MOBILE)
+        assert await limiter_redis.zcard(mobile_key) == 2
+        assert await limiter_redis.zcard(ip_key) == 2
+
+        # The mobile number still has one request left from another IP
+        await limit(_request("10.0.0.2"), MOBILE)
+        assert await limiter_redis.zcard(mobile_key) == 3
+
+    run(scenario())
+
+
+def test_lockout_doubles_per_threshold_and_is_capped(run, limiter_redis):
+    async def scenario():
+        lockouts = [await record_mpin_failure(MOBILE) for _ in range(55)]
+        return lockouts
+
+    lockouts = run(scenario())
+    started = [(failures, lockout) for failures, lockout in enumerate(lockouts, start=1) if lockout]
+    assert started == [
+        (5, 300), (10, 600), (15, 1200), (20, 2400), (25, 4800),
+        (30, 9600), (35, 19200), (40, 38400), (45, 76800), (50, 86400), (55, 86400),
+    ]
+
+
+def test_locked_out_mpin_gets_429_with_remaining_time(run, limiter_redis):
+    async def scenario():
+        await check_mpin_lockout(MOBILE)
+        for _ in range(5):
+            await record_mpin_failure(MOBILE)
+
+        with pytest.raises(HTTPException) as error:
+            await check_mpin_lockout(MOBILE)
+        return error.value
+
+    error = run(scenario())
+    assert error.status_code == 429
+    assert 299 <= int(error.headers["Retry-After"]) <= 300
+
+
+def test_successful_mpin_clears_the_failure_count(run, limiter_redis):
+    async def scenario():
+        for _ in range(4):
+            assert await record_mpin_failure(MOBILE) == 0
+        await clear_mpin_failures(MOBILE)
+
+        # Four more failures would have been the fifth through eighth
+        for _ in range(4):
+            assert await record_mpin_failure(MOBILE) == 0
+        await check_mpin_lockout(MOBILE)
+
+        assert await record_mpin_failure(MOBILE) == 300
+
+    run(scenario())
@@ -0,0 +1,156 @@
+"""
+Merchant purchase reward distribution: pools are split in whole centavos
+with nothing lost to rounding, unresolved recipients fall back to the admin
+staging account, and nightly settlement pays each purchase exactly once.
+"""
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.v1.repo.member_repo import ADMIN_STAGING
+from api.v1.schemas.reward_schemas import PurchaseRewardInput
+from api.v1.services.reward_distribution import (
+    SHARES,
+    distribute_purchase_rewards,
+    reward_pool_for,
+    split_pool,
+    to_centavos,
+)
+from commands import settle_merchant_rewards
+from models.admin_models import AdminAccount
+from models.hub_models import Hub
+from models.member_models import Member
+from models.merchant_models import Merchant, MerchantPurchaseHistory
+from models.referral_models import ReferralClosure
+from models.reward_models import Reward
+
+
+def _member(member_id: str, n: int) -> Member:
+    return Member(member_id=member_id, mobile_number=f"9{n:09d}", mpin="x", referral_id=f"REF{n:06d}")
+
+
+def _merchant() -> Merchant:
+    return Merchant(
+        merchant_id="merchant", mobile_number="9000000099", business_name="Store", business_type="Retail", discount=10
+    )
+
+
+@pytest.mark.parametrize("pool", ["0.01", "0.03", "0.99", "1.07", "999.99", "12345.67"])
+def test_split_pool_adds_up_to_the_pool(pool):
+    centavos = to_centavos(pool)
+    parts = split_pool(centavos)
+
+    assert set(parts) == set(SHARES)
+    assert all(isinstance(part, int) and part >= 0 for part in parts.values())
+    assert sum(parts.values()) == centavos
+
+
+def test_reward_pool_is_exact_in_centavos():
+    # 3% of 33.33 is 0.9999, which must round to one peso and not drift
+    assert to_centavos(reward_pool_for(33.33, 3)) == 100
+    assert to_centavos(reward_pool_for(999.99, 10)) == 10000
+    assert reward_pool_for(100, None) == 0
+
+
+def test_missing_recipients_fall_back_to_admin_staging(run, db_session):
+    async def scenario():
+        async with await db_session() as db:
+            db.add_all([
+                _member(ADMIN_STAGING, 0),
+                _member("buyer", 1),
+                _member("upline-1", 2),
+                _member("upline-2", 3),
+                _member("owner", 99),
+                ReferralClosure(ancestor="upline-1", descendant="buyer", depth=1),
+                ReferralClosure(ancestor="upline-2", descendant="buyer", depth=2),
+                Hub(id="hub", hub_name="Hub", hub_user="9000000001", region="R", province="P", municipality_city="M"),
+                AdminAccount(id="investor", username="investor", password="x", account_type="INVESTOR"),
+            ])
+            db.add(_merchant())
+            await db.commit()
+
+            resolved, unresolved = await distribute_purchase_rewards(db, [
+                PurchaseRewardInput(
+                    reward_pool=Decimal("10"), member_id="buyer", merchant_id="merchant",
+                    reference_id="ref-1", hub_id="hub", investor_id="investor"
+                ),
+                PurchaseRewardInput(
+                    reward_pool=Decimal("10"), member_id="buyer", merchant_id="merchant",
+                    reference_id="ref-2", hub_id="no-such-hub", investor_id="no-such-investor"
+                ),
+            ])
+
+            recipients = {a["share"]: (a["recipient_type"], a["recipient"]) for a in resolved["allocations"]}
+            assert recipients["hub"] == ("hub", "hub")
+            assert recipients["investor"] == ("investor", "investor")
+            assert recipients["user"] == ("member", "buyer")
+            assert recipients["unilevel_1"] == ("member", "upline-1")
+            assert recipients["unilevel_2"] == ("member", "upline-2")
+            for share in ("unilevel_3", "unilevel_4", "unilevel_5", "community",
+                          "merchant_direct_referrer", "referrer_of_merchant", "unilevel_remainder", "admin"):
+                assert recipients[share] == ("member", ADMIN_STAGING), share
+
+            recipients = {a["share"]: (a["recipient_type"], a["recipient"]) for a in unresolved["allocations"]}
+            assert recipients["hub"] == ("member", ADMIN_STAGING)
+            assert recipients["investor"] == ("member", ADMIN_STAGING)
+
+            for summary in (resolved, unresolved):
+                assert sum(to_centavos(a["amount"]) for a in summary["allocations"]) == 1000
+
+            hub_points = await db.scalar(select(Hub.reward_points).where(Hub.id == "hub"))
+            investor_points = await db.scalar(select(AdminAccount.reward_points).where(AdminAccount.id == "investor"))
+            assert (hub_points, investor_points) == (0.5, 0.5)
+
+    run(scenario())
+
+
+def test_settlement_marks_purchases_and_is_idempotent(run, db_session, monkeypatch):
+    purchases = [
+        # amount, status, pool in centavos (10% discount)
+        ("p-1", 100.00, "success", 1000),
+        ("p-2", 0.10, "success", 1),
+        ("p-3", 999.99, "success", 10000),
+        ("p-4", 50.00, "pending", 0),
+    ]
+
+    async def scenario():
+        db = await db_session()
+        db.add_all([_member(ADMIN_STAGING, 0), _member("buyer", 1), _member("owner", 99), _merchant()])
+        db.add_all(
+            MerchantPurchaseHistory(
+                purchase_id=purchase_id, merchant_id="merchant", member_id="buyer",
+                amount=amount, reference_id=f"ref-{purchase_id}", status=status
+            )
+            for purchase_id, amount, status, _ in purchases
+        )
+        await db.commit()
+        await db.close()
+
+        monkeypatch.setattr(settle_merchant_rewards, "AsyncSessionLocal", async_sessionmaker(db.bind, expire_on_commit=False))
+        monkeypatch.setattr(settle_merchant_rewards.settings, "MERCHANT_SETTLEMENT_BATCH_SIZE", 2)
+
+        await settle_merchant_rewards.settle_merchant_rewards()
+
+        async with async_sessionmaker(db.bind)() as check:
+            settled = dict((await check.execute(
+                select(MerchantPurchaseHistory.purchase_id, MerchantPurchaseHistory.rewards_settled_at)
+            )).all())
+            assert {pid for pid, at in settled.items() if at is not None} == {"p-1", "p-2", "p-3"}
+
+            paid = dict((await check.execute(
+                select(Reward.reference_id, func.sum(Reward.reward_points)).group_by(Reward.reference_id)
+            )).all())
+            assert {ref: to_centavos(points) for ref, points in paid.items()} == {
+                f"ref-{purchase_id}": pool for purchase_id, _, status, pool in purchases if status == "success"
+            }
+            reward_count = await check.scalar(select(func.count()).select_from(Reward))
+
+        # A re-run finds nothing left to settle
+        await settle_merchant_rewards.settle_merchant_rewards()
+
+        async with async_sessionmaker(db.bind)() as check:
+            assert await check.scalar(select(func.count()).select_from(Reward)) == reward_count
+
+    run(scenario())
@@ -0,0 +1,54 @@
+"""
+Pending P2P transfers remember their recipient per transaction, so a sender
+with two transfers in flight still drops the right cached balances.
+"""
+import pytest
+
+from api.v1.repo.member_repo import MemberRepo
+from api.v1.schemas.topwallet_schemas import P2PprocessRequest, TWP2PTransferRequest
+from api.v1.services import TopWallet as topwallet_module
+from api.v1.services.TopWallet import TopWallet
+
+
+@pytest.fixture
+def topwallet(monkeypatch, fake_redis):
+    transactions = iter(["tx-1", "tx-2"])
+    calls = []
+
+    async def call_topwallet_api(endpoint, payload, method="GET"):
+        calls.append((endpoint, payload))
+        if endpoint.endswith("initiate_p2ptransfer"):
+            return {"status": "success", "data": {"Transaction_id": next(transactions)}}
+        return {"status": "success"}
+
+    async def get_external_id(db, member_id):
+        return f"ext-{member_id}"
+
+    async def get_wallet_identity_by_mobile_number(db, mobile_number):
+        return "wallet", f"ext-{mobile_number}"
+
+    monkeypatch.setattr(topwallet_module, "redis_client", fake_redis)
+    monkeypatch.setattr(TopWallet, "call_topwallet_api", staticmethod(call_topwallet_api))
+    monkeypatch.setattr(MemberRepo, "get_external_id", staticmethod(get_external_id))
+    monkeypatch.setattr(MemberRepo, "get_wallet_identity_by_mobile_number", staticmethod(get_wallet_identity_by_mobile_number))
+    return fake_redis
+
+
+def test_second_pending_transfer_keeps_the_first_recipient(run, topwallet):
+    async def scenario():
+        await TopWallet.p2p_transfer(None, TWP2PTransferRequest(to_user="9000000001", amount="10"), "sender")
+        await TopWallet.p2p_transfer(None, TWP2PTransferRequest(to_user="9000000002", amount="20"), "sender")
+
+        for external_id in ("ext-sender", "ext-9000000001", "ext-9000000002"):
+            await TopWallet.cache_balance(external_id, "100.00")
+
+        recipient = await TopWallet.get_p2p_recipient("tx-1")
+        assert recipient == "ext-9000000001"
+
+        await TopWallet.process_transfer_p2p(P2PprocessRequest(Transaction_id="tx-1", otp="123456"), ["ext-sender", recipient])
+
+        assert await TopWallet.get_cached_balance("ext-9000000001") is None
+        assert await TopWallet.get_cached_balance("ext-9000000002") == "100.00"
+        assert await TopWallet.get_p2p_recipient("tx-2") == "ext-9000000002"
+
+    run(scenario())
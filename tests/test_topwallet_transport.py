@@ -0,0 +1,170 @@
+"""
+TopWallet transport against a fake aiohttp session: breaker transitions,
+which failures count against it, retries only for idempotent endpoints, and
+coalescing of identical concurrent reads.
+"""
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from api.v1.services import topwallet_transport
+from api.v1.services.topwallet_transport import CircuitBreaker, TopWalletTransport
+
+
+BALANCE = "b2bapi/get_balance_by_userid"
+TRANSFER = "b2bapi/p2p_transfer"
+
+
+class FakeResponse:
+    def __init__(self, status: int, body: str, delay: float):
+        self.status = status
+        self.body = body
+        self.delay = delay
+
+    async def __aenter__(self):
+        await asyncio.sleep(self.delay)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def text(self) -> str:
+        return self.body
+
+    async def json(self):
+        return json.loads(self.body)
+
+
+class FakeSession:
+    """Answers requests from a list of (status, body) in order; the last one repeats."""
+
+    def __init__(self, *responses, delay: float = 0.0):
+        self.responses = list(responses)
+        self.delay = delay
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs.get("json") or kwargs.get("params")))
+        status, body = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        return FakeResponse(status, body, self.delay)
+
+
+OK = (200, json.dumps({"peso": "10.00"}))
+DOWN = (503, "Service Unavailable")
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    monkeypatch.setattr(TopWalletTransport, "backoff", staticmethod(lambda attempt: 0))
+    monkeypatch.setattr(topwallet_transport.settings, "TW_MAX_RETRIES", 2)
+
+    transport = TopWalletTransport()
+    transport.breaker = CircuitBreaker(window=4, min_calls=2, failure_rate=0.5, open_seconds=30)
+    return transport
+
+
+def _call(transport, session, endpoint=BALANCE, method="get", payload=None):
+    return transport.send(session, method, endpoint, f"http://tw.invalid/{endpoint}", payload or {"user_id": "u1"}, {})
+
+
+def _status(run, coroutine) -> int:
+    with pytest.raises(HTTPException) as error:
+        run(coroutine)
+    return error.value.status_code
+
+
+def test_post_is_not_retried(run, transport):
+    session = FakeSession(DOWN)
+    assert _status(run, _call(transport, session, TRANSFER, "post")) == 503
+    assert len(session.requests) == 1
+
+
+def test_idempotent_get_is_retried(run, transport):
+    session = FakeSession(DOWN, DOWN, OK)
+    transport.breaker = CircuitBreaker(window=10, min_calls=10, failure_rate=0.5, open_seconds=30)
+
+    assert run(_call(transport, session)) == {"peso": "10.00"}
+    assert len(session.requests) == 3
+    assert transport.retries[BALANCE] == 2
+
+
+def test_breaker_opens_half_opens_and_closes(run, transport):
+    breaker = transport.breaker
+
+    assert _status(run, _call(transport, FakeSession(DOWN), TRANSFER, "post")) == 503
+    assert _status(run, _call(transport, FakeSession(DOWN), TRANSFER, "post")) == 503
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # Open: fails fast without reaching TopWallet
+    session = FakeSession(OK)
+    assert _status(run, _call(transport, session)) == 503
+    assert session.requests == []
+    assert transport.short_circuited[BALANCE] == 1
+
+    # After open_seconds a single probe goes through; its success closes the breaker
+    breaker.opened_at -= breaker.open_seconds
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()
+    breaker.release_probe()
+
+    assert run(_call(transport, session)) == {"peso": "10.00"}
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert len(session.requests) == 1
+
+
+def test_failed_probe_reopens_the_breaker(run, transport):
+    breaker = transport.breaker
+    breaker._open()
+    breaker.opened_at -= breaker.open_seconds
+
+    assert _status(run, _call(transport, FakeSession(DOWN), TRANSFER, "post")) == 503
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.times_opened == 2
+
+
+@pytest.mark.parametrize("response, status", [
+    ((200, "<html>Down for maintenance</html>"), 500),
+    ((429, "Too Many Requests"), 429),
+])
+def test_unreadable_200_and_429_count_as_failures(run, transport, response, status):
+    session = FakeSession(response)
+    assert _status(run, _call(transport, session, TRANSFER, "post")) == status
+    assert transport.breaker.error_rate() == 1.0
+    assert transport.failures[TRANSFER] == 1
+
+
+def test_business_errors_count_as_success(run, transport):
+    for _ in range(3):
+        assert _status(run, _call(transport, FakeSession((400, "Insufficient balance")), TRANSFER, "post")) == 400
+
+    assert transport.breaker.state == CircuitBreaker.CLOSED
+    assert transport.breaker.error_rate() == 0.0
+
+
+def test_identical_gets_are_coalesced(run, transport):
+    session = FakeSession(OK, delay=0.05)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(_call(transport, session) for _ in range(5)),
+            _call(transport, session, payload={"user_id": "u2"}),
+        )
+
+    results = run(scenario())
+    assert results == [{"peso": "10.00"}] * 6
+    # One upstream request per distinct payload
+    assert sorted(payload["user_id"] for _, _, payload in session.requests) == ["u1", "u2"]
+    assert transport.coalesced[BALANCE] == 4
+
+
+def test_posts_are_not_coalesced(run, transport):
+    session = FakeSession(OK, delay=0.05)
+
+    async def scenario():
+        return await asyncio.gather(*(_call(transport, session, TRANSFER, "post") for _ in range(3)))
+
+    run(scenario())
+    assert len(session.requests) == 3